@@ -0,0 +1,287 @@
+"""
+Benchmark of the game result repositories on synthetic draw histories.
+
+Usage:
+    python -m bit2_api.benchmarks.storage --sizes 10000 100000 1000000 \
+        --output benchmark.json
+
+The CSV repository is measured in its default mode, "csv", and in its
+log-structured mode, "csv-log". The Postgres repository is only measured
+when a database URL is given with --database-url or BENCHMARK_DATABASE_URL,
+its model relying on Postgres types. Its "game" schema is created if needed and its table emptied.
+"""
+import argparse
+import logging
+import os
+import platform
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.core.ports import IGameResultRepository
+from bit2_api.utils_main.reports import command_description, write_report
+
+logger = logging.getLogger(__name__)
+
+FIRST_DRAW_DATE = datetime(2000, 1, 1)
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# Number of calls timed for the operations on a single draw
+DEFAULT_SAMPLE = 200
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing of an operation on a repository"""
+
+    backend: str
+    size: int
+    operation: str
+    count: int
+    seconds: float
+
+    @property
+    def ops_per_second(self) -> float:
+        """Operations per second"""
+        return self.count / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON serializable dict"""
+        return {**asdict(self), "ops_per_second": self.ops_per_second}
+
+
+@dataclass
+class Backend:
+    """A repository and the way to open and commit its sessions"""
+
+    name: str
+    repository: IGameResultRepository
+    open_session: Callable[[], Any]
+    commit: Callable[[Any], None]
+    reset: Callable[[], None] = lambda: None
+    # Create of a batch of draws, the create_many of the repository if any
+    bulk_create: Optional[Callable[[List[ExtractGameResultCommand], Any], None]] = None
+
+
+def synthetic_history(size: int, seed: int = 0) -> List[ExtractGameResultCommand]:
+    """One draw of each game type per day, until size draws"""
+    rng = random.Random(seed)
+    game_types = list(GameTypeEnum)
+    return [
+        ExtractGameResultCommand(
+            draw_date=FIRST_DRAW_DATE + timedelta(days=index // len(game_types)),
+            numbers=rng.sample(range(1, 91), 5),
+            bonus=rng.randint(1, 90) if rng.random() < 0.5 else None,
+            type=game_types[index % len(game_types)],
+        )
+        for index in range(size)
+    ]
+
+
+def csv_backend(directory: str, log_structured: bool = False) -> Backend:
+    """CSV storage partitioned by month, log-structured or not"""
+    # pylint: disable=import-outside-toplevel
+    from bit2_api.right_adapters.csv import CSVEngine, CSVSession
+    from bit2_api.right_adapters.csv import GameResultRepository as CSVRepository
+
+    engine = CSVEngine(os.path.join(directory, "csv"), log_structured=log_structured)
+    return Backend(
+        "csv-log" if log_structured else "csv",
+        CSVRepository(),
+        lambda: CSVSession(engine),
+        lambda session: session.commit(),
+    )
+
+
+def columnar_backend(directory: str) -> Backend:
+    """Memory-mapped columnar storage"""
+    # pylint: disable=import-outside-toplevel
+    from bit2_api.right_adapters.columnar import ColumnarEngine, ColumnarSession
+    from bit2_api.right_adapters.columnar import (
+        GameResultRepository as ColumnarRepository,
+    )
+
+    engine = ColumnarEngine(os.path.join(directory, "columnar"))
+    return Backend(
+        "columnar",
+        ColumnarRepository(),
+        lambda: ColumnarSession(engine),
+        lambda session: None,
+    )
+
+
+def postgres_backend(database_url: str) -> Backend:
+    """Postgres storage, in the "game" schema of database_url"""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import sessionmaker
+
+    from bit2_api.right_adapters.postgres.models import BaseModel, GameResult
+    from bit2_api.right_adapters.postgres.repositories import (
+        GameResultRepository as PostgresRepository,
+    )
+    from bit2_api.right_adapters.postgres.repositories import upsert_rows
+
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE SCHEMA IF NOT EXISTS game"))
+    BaseModel.metadata.create_all(engine)
+
+    def reset():
+        with engine.begin() as connection:
+            connection.execute(GameResult.__table__.delete())
+
+    def bulk_create(commands: List[ExtractGameResultCommand], session):
+        # Rows are inserted in batches by the unit of work on commit
+        session.add_all([GameResult(**row) for row in upsert_rows(commands)])
+
+    return Backend(
+        "postgres",
+        PostgresRepository(),
+        sessionmaker(autocommit=False, autoflush=False, bind=engine),
+        lambda session: session.commit(),
+        reset,
+        bulk_create,
+    )
+
+
+def create_many(backend: Backend, commands: List[ExtractGameResultCommand], session):
+    """Create draws in bulk, one by one when the repository has no bulk create"""
+    bulk_create = backend.bulk_create or getattr(
+        backend.repository, "create_many", None
+    )
+    if bulk_create is not None:
+        bulk_create(commands, session)
+    else:
+        for command in commands:
+            backend.repository.create(command, session)
+    backend.commit(session)
+
+
+def run_backend(
+    backend: Backend, size: int, sample: int = DEFAULT_SAMPLE, seed: int = 0
+) -> List[BenchmarkResult]:
+    """Time the operations of a repository on a history of size draws"""
+    results = []
+    rng = random.Random(seed)
+    history = synthetic_history(size + sample, seed)
+    history, extra = history[:size], history[size:]
+    repository = backend.repository
+
+    def timed(operation: str, count: int, body: Callable[[], None]):
+        start = time.perf_counter()
+        body()
+        seconds = time.perf_counter() - start
+        result = BenchmarkResult(backend.name, size, operation, count, seconds)
+        logger.info(
+            "%s %d %s: %.0f ops/s",
+            backend.name,
+            size,
+            operation,
+            result.ops_per_second,
+        )
+        results.append(result)
+
+    backend.reset()
+    session = backend.open_session()
+    try:
+        timed("bulk_create", size, lambda: create_many(backend, history, session))
+
+        def create():
+            for command in extra:
+                repository.create(command, session)
+                backend.commit(session)
+
+        timed("create", len(extra), create)
+
+        draws = rng.sample(history, min(sample, size))
+        timed(
+            "get_by_draw_date",
+            len(draws),
+            lambda: [
+                repository.get_by_draw_date(draw.draw_date, session) for draw in draws
+            ],
+        )
+        timed(
+            "get_by_type",
+            len(GameTypeEnum),
+            lambda: [repository.get_by_type(type_, session) for type_ in GameTypeEnum],
+        )
+        timed("get_all", 1, lambda: repository.get_all(session))
+
+        def delete():
+            for draw in draws:
+                repository.delete(draw.draw_date, draw.type, session)
+                backend.commit(session)
+
+        timed("delete", len(draws), delete)
+    finally:
+        session.close()
+    return results
+
+
+def run(
+    sizes: List[int],
+    backends: List[str],
+    database_url: Optional[str] = None,
+    sample: int = DEFAULT_SAMPLE,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Run the benchmark and get its report"""
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "sample": sample,
+        "results": [],
+        "skipped": {},
+    }
+    for name in backends:
+        if name == "postgres" and not database_url:
+            report["skipped"][name] = "no database url"
+            continue
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as directory:
+                if name in ("csv", "csv-log"):
+                    backend = csv_backend(directory, name == "csv-log")
+                elif name == "columnar":
+                    backend = columnar_backend(directory)
+                else:
+                    backend = postgres_backend(database_url)
+                results = run_backend(backend, size, sample, seed)
+            report["results"].extend(result.to_dict() for result in results)
+    return report
+
+
+BACKENDS = ["csv", "csv-log", "columnar", "postgres"]
+
+
+def main(args: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=command_description(__doc__))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL"))
+    parser.add_argument("--sample", type=int, default=DEFAULT_SAMPLE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file, standard output by default")
+    options = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO)
+    report = run(
+        options.sizes,
+        options.backends,
+        options.database_url,
+        options.sample,
+        options.seed,
+    )
+    write_report(report, options.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,3 +31,11 @@ class CommandValidationError(ICoreException):
     message = "Command validation error."
     http_code = 422
     key = "commandValidationError"
+
+
+class ScraperUnavailableError(ICoreException):
+    """Error thrown when no browser session is available to scrape."""
+
+    message = "No browser session is available to scrape, try again later."
+    http_code = 503
+    key = "scraperUnavailable"
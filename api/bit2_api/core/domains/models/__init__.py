@@ -2,3 +2,4 @@
 This module is used to import all the models in the domain package.
 """
 from .game_result import *
+from .number_statistic import *
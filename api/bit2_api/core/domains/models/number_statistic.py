@@ -0,0 +1,43 @@
+"""This module contains the statistics of the numbers drawn in game results."""
+from dataclasses import dataclass
+from datetime import datetime
+
+from bit2_api.core.domains.utils import GameTypeEnum
+
+
+@dataclass
+class NumberStatistic:
+    """Represents how often, and when last, a number was drawn in a game."""
+
+    type: GameTypeEnum
+    number: int
+    draw_count: int
+    last_draw_date: datetime
+
+    def to_dict(self):
+        return {
+            "type": self.type,
+            "number": self.number,
+            "draw_count": self.draw_count,
+            "last_draw_date": (
+                self.last_draw_date.isoformat() if self.last_draw_date else None
+            ),
+        }
+
+
+@dataclass
+class NumberPairStatistic:
+    """Represents how often two numbers were drawn together in a game."""
+
+    type: GameTypeEnum
+    first_number: int
+    second_number: int
+    draw_count: int
+
+    def to_dict(self):
+        return {
+            "type": self.type,
+            "first_number": self.first_number,
+            "second_number": self.second_number,
+            "draw_count": self.draw_count,
+        }
@@ -2,3 +2,4 @@
 from .datetime import *
 from .enums import *
 from .env import *
+from .numbers import *
@@ -1,5 +1,6 @@
 """Enums for the application"""
 from enum import Enum
+from typing import Optional
 
 
 class GameTypeEnum(str, Enum):
@@ -13,3 +14,21 @@ class GameTypeEnum(str, Enum):
     FORTUNE_11H = "FORTUNE_11H"
     FORTUNE_14H = "FORTUNE_14H"
     FORTUNE_18H = "FORTUNE_18H"
+
+
+def normalize_type(raw_type: str) -> Optional[GameTypeEnum]:
+    """
+    The game type of a scraped draw name. Some pages repeat or append the
+    hour of the draw (FORTUNE_18H_18H), the longest known prefix is kept.
+    """
+    if isinstance(raw_type, GameTypeEnum):
+        return raw_type
+    name = str(raw_type).strip().upper().replace(" ", "_")
+    matches = [
+        game_type
+        for game_type in GameTypeEnum
+        if name == game_type.value or name.startswith(game_type.value + "_")
+    ]
+    if not matches:
+        return None
+    return max(matches, key=lambda game_type: len(game_type.value))
@@ -0,0 +1,27 @@
+"""
+This module provides the bitmask encoding of the numbers of a draw.
+Bit n of the mask is set when n was drawn, numbers go up to MAX_NUMBER.
+"""
+from typing import Iterable, Tuple
+
+MAX_NUMBER = 90
+# Bits of the low and high words of a mask stored as two 64 bits integers
+WORD_BITS = 64
+
+
+def numbers_mask(numbers: Iterable[int]) -> int:
+    """Converts numbers to their bitmask."""
+    mask = 0
+    for number in numbers:
+        mask |= 1 << int(number)
+    return mask
+
+
+def split_mask(mask: int) -> Tuple[int, int]:
+    """Splits a bitmask into its low and high 64 bits words."""
+    return mask & ((1 << WORD_BITS) - 1), mask >> WORD_BITS
+
+
+def contains_numbers(mask: int, wanted_mask: int) -> bool:
+    """Checks that a bitmask holds all the numbers of another one."""
+    return mask & wanted_mask == wanted_mask
@@ -1,6 +1,9 @@
 """
 This module is responsible for the ports of the application.
 """
+
+from .async_game_result_repository import *
+from .async_game_statistics_repository import *
 from .database_client_repository import *
 from .game_result_repository import *
 from .scraper_repository import *
@@ -0,0 +1,120 @@
+"""
+This module defines the interface for an asynchronous game result repository.
+Its methods are the ones of IGameResultRepository, awaited on an asynchronous
+session.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.models import GameResult
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.ports.session import IAsyncSession
+
+
+class IAsyncGameResultRepository(ABC):
+    """Interface for an asynchronous game result repository."""
+
+    @abstractmethod
+    async def get_by_draw_date(
+        self,
+        draw_date: datetime,
+        db_session: IAsyncSession,
+    ) -> GameResult:
+        """Method to get a game result by its draw date"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_type(
+        self,
+        game_type: GameTypeEnum,
+        db_session: IAsyncSession,
+    ) -> List[GameResult]:
+        """Method to get game results by game type"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all(
+        self,
+        db_session: IAsyncSession,
+    ) -> List[GameResult]:
+        """Method to get all game results"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: IAsyncSession,
+    ) -> List[GameResult]:
+        """
+        Method to get the game results of a game type drawn between start and
+        end (inclusive), in chronological order
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_latest(
+        self,
+        game_type: GameTypeEnum,
+        count: int,
+        db_session: IAsyncSession,
+    ) -> List[GameResult]:
+        """Method to get the last count game results of a game type, latest first"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: IAsyncSession,
+    ) -> List[GameResult]:
+        """
+        Method to get a page of game results ordered by (draw date, game type),
+        starting after the (draw date, game type) of after
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_containing(
+        self,
+        numbers: List[int],
+        db_session: IAsyncSession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ) -> List[GameResult]:
+        """
+        Method to get the game results whose draw contained all the numbers,
+        of a game type and drawn in an inclusive (start, end) range when given,
+        ordered by (draw date, game type)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(
+        self, command: ExtractGameResultCommand, db_session: IAsyncSession
+    ) -> GameResult:
+        """Creates a game result"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: IAsyncSession
+    ) -> List[GameResult]:
+        """
+        Creates game results, or updates the ones already stored for the same
+        draw date and game type
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(
+        self, draw_date: datetime, game_type: GameTypeEnum, db_session: IAsyncSession
+    ) -> None:
+        """Method to delete a game result"""
+        raise NotImplementedError
@@ -0,0 +1,41 @@
+"""
+This module defines the interface for an asynchronous repository of the
+statistics of the numbers drawn in the game results.
+"""
+from abc import ABC, abstractmethod
+from typing import List
+
+from bit2_api.core.domains.models import NumberPairStatistic, NumberStatistic
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.ports.session import IAsyncSession
+
+
+class IAsyncGameStatisticsRepository(ABC):
+    """Interface for an asynchronous game statistics repository."""
+
+    @abstractmethod
+    async def get_number_statistics(
+        self,
+        game_type: GameTypeEnum,
+        db_session: IAsyncSession,
+    ) -> List[NumberStatistic]:
+        """
+        Method to get the draw count and last draw date of the numbers drawn in
+        a game type, by number
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_pair_statistics(
+        self,
+        game_type: GameTypeEnum,
+        limit: int,
+        db_session: IAsyncSession,
+    ) -> List[NumberPairStatistic]:
+        """Method to get the limit pairs of numbers most often drawn together"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh(self, db_session: IAsyncSession) -> None:
+        """Method to compute the statistics again from all the game results"""
+        raise NotImplementedError
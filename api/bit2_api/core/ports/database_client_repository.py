@@ -2,9 +2,11 @@
 This module defines the interface for a database client repository.
 It provides methods for inserting, updating, deleting, and fetching data from the database.
 """
+
 from abc import ABC, abstractmethod
+from typing import Any, Dict
 
-from bit2_api.core.ports.session import ISession
+from bit2_api.core.ports.session import IAsyncSession, ISession
 
 
 class IDatabaseClientRepository(ABC):
@@ -14,3 +16,20 @@ class IDatabaseClientRepository(ABC):
     def get_db_session(self) -> ISession:
         """Method to get database session"""
         raise NotImplementedError
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Method to get the metrics of the database client, such as its pool"""
+        return {}
+
+
+class IAsyncDatabaseClientRepository(ABC):
+    """Interface for an asynchronous database client repository."""
+
+    @abstractmethod
+    def get_db_session(self) -> IAsyncSession:
+        """Method to get asynchronous database session"""
+        raise NotImplementedError
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Method to get the metrics of the database client, such as its pool"""
+        return {}
@@ -4,7 +4,7 @@ It provides methods for saving, retrieving, and deleting game results.
 """
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 
 from bit2_api.core.domains.commands import ExtractGameResultCommand
 from bit2_api.core.domains.models import GameResult
@@ -41,6 +41,69 @@ class IGameResultRepository(ABC):
         """Method to get all game results"""
         raise NotImplementedError
 
+    def iter_all(
+        self,
+        db_session: ISession,
+    ) -> Iterator[GameResult]:
+        """
+        Method to iterate over all game results. Adapters able to read them
+        lazily override it, so that they are walked in constant memory.
+        """
+        yield from self.get_all(db_session)
+
+    @abstractmethod
+    def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: ISession,
+    ) -> List[GameResult]:
+        """
+        Method to get the game results of a game type drawn between start and
+        end (inclusive), in chronological order
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_latest(
+        self,
+        game_type: GameTypeEnum,
+        count: int,
+        db_session: ISession,
+    ) -> List[GameResult]:
+        """Method to get the last count game results of a game type, latest first"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: ISession,
+    ) -> List[GameResult]:
+        """
+        Method to get a page of game results ordered by (draw date, game type).
+        The page starts after the (draw date, game type) of the last result of
+        the previous page, or at the first result when after is None.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_containing(
+        self,
+        numbers: List[int],
+        db_session: ISession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ) -> List[GameResult]:
+        """
+        Method to get the game results whose draw contained all the numbers,
+        of a game type and drawn in an inclusive (start, end) range when given,
+        ordered by (draw date, game type)
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def create(
         self, command: ExtractGameResultCommand, db_session: ISession
@@ -48,6 +111,16 @@ class IGameResultRepository(ABC):
         """Creates a game result"""
         raise NotImplementedError
 
+    @abstractmethod
+    def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: ISession
+    ) -> List[GameResult]:
+        """
+        Creates game results, or updates the ones already stored for the same
+        draw date and game type
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete(
         self, draw_date: datetime, game_type: GameTypeEnum, db_session: ISession
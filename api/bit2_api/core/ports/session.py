@@ -4,7 +4,26 @@ from abc import ABC, abstractmethod
 class ISession(ABC):
     """Session interface"""
 
+    @abstractmethod
+    def commit(self) -> None:
+        """Commits the writes of the session"""
+        raise NotImplementedError
+
     @abstractmethod
     def close(self) -> None:
         """Closes the session"""
         raise NotImplementedError
+
+
+class IAsyncSession(ABC):
+    """Asynchronous session interface"""
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Commits the writes of the session"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Closes the session"""
+        raise NotImplementedError
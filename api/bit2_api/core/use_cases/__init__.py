@@ -1 +1,3 @@
+from .async_game_result import *
+from .async_game_statistics import *
 from .extract_game_result import *
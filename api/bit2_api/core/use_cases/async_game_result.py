@@ -0,0 +1,133 @@
+"""Asynchronous use cases for storing and reading game results."""
+
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.models import GameResult
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.ports import (
+    IAsyncDatabaseClientRepository,
+    IAsyncGameResultRepository,
+    IAsyncSession,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUseCase:
+    """
+    Base of the asynchronous use cases.
+    Each execution opens its own session, commits it when it succeeds and
+    closes it once done, so that the requests awaiting the database share the
+    event loop instead of threads.
+    """
+
+    def __init__(self, database_client: IAsyncDatabaseClientRepository = None):
+        """
+        Initialize the use case.
+        :param database_client: The factory of the database sessions.
+        """
+        self.database_client = database_client
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Optional[IAsyncSession]]:
+        """Open a session for an execution, committed when it succeeds."""
+        if self.database_client is None:
+            yield None
+            return
+        session = self.database_client.get_db_session()
+        try:
+            yield session
+            await session.commit()
+        finally:
+            await session.close()
+
+
+class AsyncGameResultUseCase(AsyncUseCase):
+    """Base of the asynchronous game result use cases."""
+
+    def __init__(
+        self,
+        game_repository: IAsyncGameResultRepository,
+        database_client: IAsyncDatabaseClientRepository = None,
+    ):
+        """
+        Initialize the use case.
+        :param game_repository: The repository storing the game results.
+        :param database_client: The factory of the database sessions.
+        """
+        super().__init__(database_client)
+        self.game_repository = game_repository
+
+
+class AsyncExtractGameResult(AsyncGameResultUseCase):
+    """Asynchronous use case for extracting game results."""
+
+    async def execute(self, command: ExtractGameResultCommand) -> GameResult:
+        """
+        Execute the use case to extract a game result.
+        :param command: The command containing the draw date.
+        :return: The extracted game result.
+        """
+        async with self.session() as session:
+            return await self.game_repository.create(
+                command=command,
+                db_session=session,
+            )
+
+    async def execute_many(
+        self, commands: List[ExtractGameResultCommand]
+    ) -> List[GameResult]:
+        """
+        Execute the use case for a batch of game results, stored at once.
+        Results already stored for a draw date and game type are updated.
+        :param commands: The commands of the game results.
+        :return: The stored game results.
+        """
+        async with self.session() as session:
+            return await self.game_repository.upsert_many(
+                commands=commands,
+                db_session=session,
+            )
+
+
+class AsyncGetGameResults(AsyncGameResultUseCase):
+    """Asynchronous use case for reading the stored game results."""
+
+    async def get_range(
+        self, game_type: GameTypeEnum, start: datetime, end: datetime
+    ) -> List[GameResult]:
+        """Get the game results of a game type drawn between start and end."""
+        async with self.session() as session:
+            return await self.game_repository.get_range(
+                game_type, start, end, db_session=session
+            )
+
+    async def get_latest(self, game_type: GameTypeEnum, count: int) -> List[GameResult]:
+        """Get the last count game results of a game type, latest first."""
+        async with self.session() as session:
+            return await self.game_repository.get_latest(
+                game_type, count, db_session=session
+            )
+
+    async def get_page(
+        self, after: Optional[Tuple[datetime, GameTypeEnum]], limit: int
+    ) -> List[GameResult]:
+        """Get the page of game results following after in (draw date, type) order."""
+        async with self.session() as session:
+            return await self.game_repository.get_page(after, limit, db_session=session)
+
+    async def find_containing(
+        self,
+        numbers: List[int],
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ) -> List[GameResult]:
+        """Get the game results whose draw contained all the numbers."""
+        async with self.session() as session:
+            return await self.game_repository.find_containing(
+                numbers, session, game_type=game_type, date_range=date_range
+            )
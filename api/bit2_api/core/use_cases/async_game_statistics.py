@@ -0,0 +1,53 @@
+"""Asynchronous use case for reading the statistics of the drawn numbers."""
+from typing import List
+
+from bit2_api.core.domains.models import NumberPairStatistic, NumberStatistic
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.ports import (
+    IAsyncDatabaseClientRepository,
+    IAsyncGameStatisticsRepository,
+)
+from bit2_api.core.use_cases.async_game_result import AsyncUseCase
+
+
+class AsyncGetGameStatistics(AsyncUseCase):
+    """
+    Asynchronous use case for reading the statistics of the drawn numbers.
+    The statistics are kept up to date by the database as results are stored.
+    """
+
+    def __init__(
+        self,
+        statistics_repository: IAsyncGameStatisticsRepository,
+        database_client: IAsyncDatabaseClientRepository = None,
+    ):
+        """
+        Initialize the use case.
+        :param statistics_repository: The repository of the statistics.
+        :param database_client: The factory of the database sessions.
+        """
+        super().__init__(database_client)
+        self.statistics_repository = statistics_repository
+
+    async def get_number_statistics(
+        self, game_type: GameTypeEnum
+    ) -> List[NumberStatistic]:
+        """Get the draw count and last draw date of the numbers of a game type."""
+        async with self.session() as session:
+            return await self.statistics_repository.get_number_statistics(
+                game_type, db_session=session
+            )
+
+    async def get_pair_statistics(
+        self, game_type: GameTypeEnum, limit: int
+    ) -> List[NumberPairStatistic]:
+        """Get the limit pairs of numbers most often drawn together."""
+        async with self.session() as session:
+            return await self.statistics_repository.get_pair_statistics(
+                game_type, limit, db_session=session
+            )
+
+    async def refresh(self) -> None:
+        """Compute the statistics again from all the game results."""
+        async with self.session() as session:
+            await self.statistics_repository.refresh(db_session=session)
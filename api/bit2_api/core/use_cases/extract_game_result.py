@@ -1,6 +1,8 @@
 """Use case for extracting game results."""
 import logging
+from contextlib import contextmanager
 from dataclasses import replace
+from typing import Iterator, List, Optional
 
 from bit2_api.core.domains.commands import ExtractGameResultCommand
 from bit2_api.core.domains.models import GameResult
@@ -8,6 +10,7 @@ from bit2_api.core.ports import (
     IDatabaseClientRepository,
     IGameResultRepository,
     IScraperRepository,
+    ISession,
 )
 
 logger = logging.getLogger(__name__)
@@ -16,6 +19,8 @@ logger = logging.getLogger(__name__)
 class ExtractGameResult:
     """
     Use case for extracting game results.
+    The use case is shared by the requests: each execution opens its own
+    session, commits it when it succeeds and closes it once done.
     """
 
     def __init__(
@@ -25,13 +30,24 @@ class ExtractGameResult:
     ):
         """
         Initialize the ExtractGameResult use case.
-        :param scraper_repository: The scraper repository to fetch game results.
-        :param database_client: The database client to store game results.
+        :param game_repository: The repository storing the game results.
+        :param database_client: The factory of the database sessions.
         """
         self.game_repository = game_repository
-        self.session = (
-            database_client.get_db_session() if database_client is not None else None
-        )
+        self.database_client = database_client
+
+    @contextmanager
+    def session(self) -> Iterator[Optional[ISession]]:
+        """Open a session for an execution, committed when it succeeds."""
+        if self.database_client is None:
+            yield None
+            return
+        session = self.database_client.get_db_session()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
 
     def execute(self, command: ExtractGameResultCommand) -> GameResult:
         """
@@ -39,14 +55,25 @@ class ExtractGameResult:
         :param command: The command containing the draw date.
         :return: The extracted game result.
         """
-        try:
+        with self.session() as session:
             # Store the game result in the database
-            game_result = self.game_repository.create(
+            return self.game_repository.create(
                 command=command,
-                db_session=self.session,
+                db_session=session,
             )
 
-            return game_result
-        finally:
-            if self.session is not None:
-                self.session.close()
+    def execute_many(
+        self, commands: List[ExtractGameResultCommand]
+    ) -> List[GameResult]:
+        """
+        Execute the use case for a batch of game results, stored at once.
+        Results already stored for a draw date and game type are updated,
+        so extracting the same results again is idempotent.
+        :param commands: The commands of the game results.
+        :return: The stored game results.
+        """
+        with self.session() as session:
+            return self.game_repository.upsert_many(
+                commands=commands,
+                db_session=session,
+            )
@@ -1 +1,4 @@
+from .database_router import *
+from .game_result_router import *
+from .game_statistics_router import *
 from .scraper_router import *
@@ -0,0 +1,28 @@
+from http import HTTPStatus
+
+import inject
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from fastapi_versioning import version
+
+from bit2_api.core.ports import IDatabaseClientRepository
+
+router = APIRouter()
+
+
+@router.get(
+    "/database/metrics",
+    status_code=HTTPStatus.OK,
+    tags=["Database"],
+    summary="Database client metrics",
+)
+@version(1)
+def database_metrics():
+    """
+    Get the metrics of the database client, such as the checkouts of and the
+    waits for the connections of its pool."""
+    database_client = inject.instance(IDatabaseClientRepository)
+    return JSONResponse(
+        content=database_client.get_metrics(),
+        status_code=HTTPStatus.OK,
+    )
@@ -0,0 +1,127 @@
+from dataclasses import asdict
+from datetime import date
+from http import HTTPStatus
+from typing import List, Optional
+
+import inject
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+from fastapi_versioning import version
+
+from bit2_api.core.domains.errors import CommandValidationError
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.domains.utils.numbers import MAX_NUMBER
+from bit2_api.core.use_cases import AsyncGetGameResults
+from bit2_api.right_adapters.caching import ResultCache
+
+router = APIRouter()
+
+# Most results returned by a request
+MAX_RESULTS = 1000
+
+
+def results_response(results) -> JSONResponse:
+    """Response listing game results"""
+    return JSONResponse(
+        content={"results": [result.to_dict() for result in results]},
+        status_code=HTTPStatus.OK,
+    )
+
+
+@router.get(
+    "/game-results/latest",
+    status_code=HTTPStatus.OK,
+    tags=["Game Results"],
+    summary="Latest game results",
+)
+@version(1)
+async def latest_game_results(
+    game_type: GameTypeEnum,
+    count: int = Query(10, ge=1, le=MAX_RESULTS),
+):
+    """
+    Get the last count game results of a game type, latest first."""
+    uc_ = inject.instance(AsyncGetGameResults)
+    return results_response(await uc_.get_latest(game_type, count))
+
+
+@router.get(
+    "/game-results/range",
+    status_code=HTTPStatus.OK,
+    tags=["Game Results"],
+    summary="Game results between two dates",
+)
+@version(1)
+async def game_results_range(game_type: GameTypeEnum, start: date, end: date):
+    """
+    Get the game results of a game type drawn between start and end, in
+    chronological order."""
+    uc_ = inject.instance(AsyncGetGameResults)
+    return results_response(await uc_.get_range(game_type, start, end))
+
+
+@router.get(
+    "/game-results",
+    status_code=HTTPStatus.OK,
+    tags=["Game Results"],
+    summary="Page of game results",
+)
+@version(1)
+async def game_results_page(
+    after_date: Optional[date] = None,
+    after_type: Optional[GameTypeEnum] = None,
+    limit: int = Query(100, ge=1, le=MAX_RESULTS),
+):
+    """
+    Get a page of game results ordered by (draw date, game type). The next page
+    starts after the draw date and game type of the last result of a page."""
+    uc_ = inject.instance(AsyncGetGameResults)
+    after = None
+    if after_date is not None and after_type is not None:
+        after = (after_date, after_type)
+    return results_response(await uc_.get_page(after, limit))
+
+
+@router.get(
+    "/game-results/containing",
+    status_code=HTTPStatus.OK,
+    tags=["Game Results"],
+    summary="Game results containing numbers",
+)
+@version(1)
+async def game_results_containing(
+    numbers: List[int] = Query(...),
+    game_type: Optional[GameTypeEnum] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    """
+    Get the game results whose draw contained all the numbers, of a game type
+    and drawn between start and end when given, in chronological order."""
+    if not all(1 <= number <= MAX_NUMBER for number in numbers):
+        raise CommandValidationError
+    uc_ = inject.instance(AsyncGetGameResults)
+    date_range = None
+    if start is not None or end is not None:
+        date_range = (start or date.min, end or date.max)
+    return results_response(
+        await uc_.find_containing(numbers, game_type=game_type, date_range=date_range)
+    )
+
+
+@router.get(
+    "/game-results/cache/metrics",
+    status_code=HTTPStatus.OK,
+    tags=["Game Results"],
+    summary="Game result cache metrics",
+)
+@version(1)
+def game_result_cache_metrics():
+    """
+    Get the counters of the cache of the game result reads, such as its hits,
+    misses and evictions."""
+    stats = inject.instance(ResultCache).stats
+    return JSONResponse(
+        content={**asdict(stats), "hit_ratio": stats.hit_ratio},
+        status_code=HTTPStatus.OK,
+    )
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import inject
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+from fastapi_versioning import version
+
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.use_cases import AsyncGetGameStatistics
+
+router = APIRouter()
+
+
+@router.get(
+    "/game-statistics/numbers",
+    status_code=HTTPStatus.OK,
+    tags=["Game Statistics"],
+    summary="Statistics of the drawn numbers",
+)
+@version(1)
+async def number_statistics(game_type: GameTypeEnum):
+    """
+    Get how often, and when last, each number was drawn in a game type."""
+    uc_ = inject.instance(AsyncGetGameStatistics)
+    statistics = await uc_.get_number_statistics(game_type)
+    return JSONResponse(
+        content={"statistics": [statistic.to_dict() for statistic in statistics]},
+        status_code=HTTPStatus.OK,
+    )
+
+
+@router.get(
+    "/game-statistics/pairs",
+    status_code=HTTPStatus.OK,
+    tags=["Game Statistics"],
+    summary="Pairs of numbers most often drawn together",
+)
+@version(1)
+async def pair_statistics(
+    game_type: GameTypeEnum,
+    limit: int = Query(100, ge=1, le=5000),
+):
+    """
+    Get the pairs of numbers most often drawn together in a game type."""
+    uc_ = inject.instance(AsyncGetGameStatistics)
+    statistics = await uc_.get_pair_statistics(game_type, limit)
+    return JSONResponse(
+        content={"statistics": [statistic.to_dict() for statistic in statistics]},
+        status_code=HTTPStatus.OK,
+    )
+
+
+@router.post(
+    "/game-statistics/refresh",
+    status_code=HTTPStatus.NO_CONTENT,
+    tags=["Game Statistics"],
+    summary="Compute the statistics again",
+)
+@version(1)
+async def refresh_statistics():
+    """
+    Compute the statistics again from all the game results. They are kept up
+    to date as results are stored, this repairs them after manual changes."""
+    uc_ = inject.instance(AsyncGetGameStatistics)
+    await uc_.refresh()
@@ -1,4 +1,6 @@
+import threading
 from http import HTTPStatus
+from typing import Optional
 
 import inject
 from fastapi import APIRouter, Depends
@@ -8,10 +10,30 @@ from fastapi_versioning import version
 from bit2_api.core.domains.commands import ExtractGameResultCommand
 from bit2_api.core.domains.errors import InvalidGameResultError
 from bit2_api.core.use_cases import ExtractGameResult
-from bit2_api.right_adapters.web_scraper import ScraperRepository
+from bit2_api.right_adapters.web_scraper import (
+    NextDataScraperRepository,
+    get_driver_pool,
+)
 
 router = APIRouter()
 
+_scraper: Optional[NextDataScraperRepository] = None
+_scraper_lock = threading.Lock()
+
+
+def get_scraper() -> NextDataScraperRepository:
+    """
+    Scraper reading the page data over HTTP, which borrows a browser session
+    of the shared pool only when that fails. It is shared by the requests,
+    which reuse its connections. The fingerprints of the months are committed
+    by the route, once their results are stored.
+    """
+    global _scraper  # pylint: disable=global-statement
+    with _scraper_lock:
+        if _scraper is None:
+            _scraper = NextDataScraperRepository(commit_fingerprints=False)
+        return _scraper
+
 
 @router.get(
     "/scrape",
@@ -24,7 +46,7 @@ router = APIRouter()
 def scrape_results(
     month: str,
     year: str,
-    scraper: ScraperRepository = Depends(ScraperRepository),
+    scraper: NextDataScraperRepository = Depends(get_scraper),
 ):
     """
     Scrape lottery results from an external source and store them in the database."""
@@ -32,7 +54,11 @@ def scrape_results(
 
     # Fetch results using the scraper
     # current_day_scraper_results = scraper.fetch_current_results(month="", draw="")
-    scraped_results = scraper.fetch_results(month=f"{month} {year}", draw="")
+    scraped_month = f"{month} {year}"
+    scraped_results = scraper.fetch_results(month=scraped_month, draw="")
+    # Only the draws which changed since the last scrape of the month are stored
+    changes = scraper.last_changes
+    new_results = changes.new if changes is not None else scraped_results
 
     if not scraped_results:
         raise InvalidGameResultError
@@ -41,15 +67,22 @@ def scrape_results(
     # current_day_scraper_results.sort(key=lambda x: x.draw_date)
     scraped_results.sort(key=lambda x: x.draw_date)
 
-    for result in scraped_results:
-        # Assuming result contains draw_date, numbers, bonus, and type
-        command = ExtractGameResultCommand(
+    # Assuming result contains draw_date, numbers, bonus, and type
+    commands = [
+        ExtractGameResultCommand(
             draw_date=result.draw_date,
             numbers=result.numbers,
             bonus=result.bonus,
             type=result.type,
         )
-        uc_.execute(command)
+        for result in sorted(new_results, key=lambda x: x.draw_date)
+    ]
+    if commands:
+        uc_.execute_many(commands)
+    if changes is not None:
+        # A month whose results failed to be stored is compared with the
+        # results stored before, next time
+        scraper.fingerprints.commit(changes)
 
     # Convert results to JSON-serializable format
     serialized_results = [result.to_dict() for result in scraped_results]
@@ -60,6 +93,24 @@ def scrape_results(
         content={
             "message": "Scraping completed successfully.",
             "results": serialized_results,
+            "stored": len(commands),
         },
         status_code=HTTPStatus.OK,
     )
+
+
+@router.get(
+    "/scrape/driver-pool/metrics",
+    status_code=HTTPStatus.OK,
+    tags=["Game Results"],
+    summary="Scraper browser session metrics",
+)
+@version(1)
+def driver_pool_metrics():
+    """
+    Get the counters of the browser sessions of the scrapers, such as the
+    sessions opened, reused and recycled."""
+    return JSONResponse(
+        content=get_driver_pool().get_metrics(),
+        status_code=HTTPStatus.OK,
+    )
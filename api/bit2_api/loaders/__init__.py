@@ -0,0 +1,3 @@
+"""
+Bulk loaders of the game results
+"""
@@ -0,0 +1,314 @@
+"""
+Parallel backfill of the results of a range of months.
+
+Usage:
+    python -m bit2_api.loaders.backfill --start "janvier 2023" \
+        --end "mars 2025" --workers 4 --output backfill.json
+
+Months are scraped by parallel workers, each borrowing a browser session
+from a pool of the same size when the page data cannot be read over HTTP.
+Each month is saved as a snapshot as soon as it is scraped, and loaded into
+Postgres right away when a database url is given. Months whose snapshot was
+taken after their end are skipped, so an interrupted backfill resumes where
+it stopped. When loading into Postgres, the snapshot must also have been
+loaded successfully, otherwise the month is backfilled again.
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from bit2_api.core.ports import IScraperRepository
+from bit2_api.loaders.snapshots import is_loaded, latest_snapshots, load_month
+from bit2_api.right_adapters.web_scraper import (
+    FRENCH_MONTHS,
+    SCRAPER_DATA_DIR,
+    NextDataScraperRepository,
+    ScraperRepository,
+    WebDriverPool,
+)
+from bit2_api.utils_main.reports import command_description, write_report
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+# Attempts of a month whose scrape failed or found no results
+DEFAULT_ATTEMPTS = 3
+# Seconds before the first retry of a month, doubled on each retry
+RETRY_DELAY = 5.0
+
+
+@dataclass
+class MonthBackfill:
+    """Outcome and timing of the backfill of a month"""
+
+    month: str
+    results: int = 0
+    attempts: int = 0
+    seconds: float = 0.0
+    # "http" or "browser", the way the results were read
+    source: Optional[str] = None
+    merged: Optional[int] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON serializable dict"""
+        return asdict(self)
+
+
+def parse_month(month: str) -> datetime:
+    """The first day of a month named as on the results site, "mars 2025" """
+    name, year = month.lower().split()
+    return datetime(int(year), FRENCH_MONTHS.index(name) + 1, 1)
+
+
+def format_month(first_day: datetime) -> str:
+    """The name of a month on the results site"""
+    return f"{FRENCH_MONTHS[first_day.month - 1]} {first_day.year}"
+
+
+def next_month(first_day: datetime) -> datetime:
+    """The first day of the following month"""
+    if first_day.month == 12:
+        return datetime(first_day.year + 1, 1, 1)
+    return datetime(first_day.year, first_day.month + 1, 1)
+
+
+def month_range(start: str, end: str) -> List[str]:
+    """The months from start to end included, latest first"""
+    months = []
+    current, last = parse_month(start), parse_month(end)
+    while current <= last:
+        months.append(format_month(current))
+        current = next_month(current)
+    return months[::-1]
+
+
+def is_complete(month: str, snapshot: str) -> bool:
+    """
+    Whether a snapshot holds all the draws of its month, having been taken
+    after the month ended. Snapshots are named after their scrape time.
+    """
+    taken_at = os.path.basename(snapshot)[: -len(".pkl")]
+    try:
+        return datetime.fromisoformat(taken_at) >= next_month(parse_month(month))
+    except ValueError:
+        return False
+
+
+def pending_months(
+    months: List[str], data_dir: str, loading: bool = False
+) -> List[str]:
+    """
+    The months without a complete snapshot in data_dir, or, when loading
+    into Postgres, whose complete snapshot was not loaded successfully
+    """
+    snapshots = latest_snapshots(data_dir) if os.path.isdir(data_dir) else {}
+    return [
+        month
+        for month in months
+        if month not in snapshots
+        or not is_complete(month, snapshots[month])
+        or (loading and not is_loaded(snapshots[month]))
+    ]
+
+
+def backfill_month(
+    scraper: IScraperRepository,
+    month: str,
+    attempts: int,
+    retry_delay: float = RETRY_DELAY,
+    on_results: Optional[Callable[[MonthBackfill], None]] = None,
+) -> MonthBackfill:
+    """Scrape a month, retrying on failures and empty results"""
+    backfill = MonthBackfill(month=month)
+    start = time.perf_counter()
+    while backfill.attempts < attempts:
+        backfill.attempts += 1
+        try:
+            results = scraper.fetch_results(month, draw="")
+            backfill.error = None if results else "No results found"
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning("Failed to scrape %s: %s", month, error)
+            results = []
+            backfill.error = str(error) or type(error).__name__
+        if results:
+            backfill.results = len(results)
+            backfill.source = getattr(scraper, "last_source", None)
+            break
+        if backfill.attempts < attempts:
+            time.sleep(retry_delay * 2 ** (backfill.attempts - 1))
+    backfill.seconds = time.perf_counter() - start
+    if backfill.results and on_results is not None:
+        try:
+            on_results(backfill)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.exception("Failed to load the results of %s", month)
+            backfill.error = str(error) or type(error).__name__
+        changes = getattr(scraper, "last_changes", None)
+        if changes is not None and backfill.error is None:
+            # The month is only skipped as unchanged once loaded
+            scraper.fingerprints.commit(changes)
+    logger.info(
+        "Backfilled %s: %d results in %.2fs after %d attempts",
+        month,
+        backfill.results,
+        backfill.seconds,
+        backfill.attempts,
+    )
+    return backfill
+
+
+@dataclass
+class BackfillOptions:
+    """Settings of a backfill"""
+
+    workers: int = DEFAULT_WORKERS
+    attempts: int = DEFAULT_ATTEMPTS
+    # Database the months are loaded into once scraped, none by default
+    database_url: Optional[str] = None
+    retry_delay: float = RETRY_DELAY
+
+
+def month_loader(engine, attempts: int) -> Callable[[MonthBackfill], None]:
+    """The loader of the latest snapshot of a backfilled month into Postgres"""
+
+    def load_results(backfill: MonthBackfill):
+        snapshot = latest_snapshots(SCRAPER_DATA_DIR).get(backfill.month)
+        if snapshot is None:
+            backfill.error = "No snapshot saved"
+            return
+        load = load_month(engine, backfill.month, snapshot, attempts)
+        backfill.merged = load.merged
+        if load.error:
+            backfill.error = load.error
+
+    return load_results
+
+
+def backfill_scraper(
+    driver_pool: WebDriverPool, loading: bool
+) -> NextDataScraperRepository:
+    """
+    The scraper shared by the workers, which reuse its connections and the
+    build of the site it read. Months loaded into Postgres have their
+    fingerprints committed once loaded, instead of once their snapshot is saved.
+    """
+    return NextDataScraperRepository(
+        fallback=ScraperRepository(driver_pool, commit_fingerprints=not loading),
+        commit_fingerprints=not loading,
+    )
+
+
+def backfill_report(
+    backfills: List[MonthBackfill], workers: int, seconds: float
+) -> Dict[str, Any]:
+    """The report of the backfill of months"""
+    return {
+        "created_at": datetime.now().isoformat(),
+        "workers": workers,
+        "months": len(backfills),
+        "failed": [backfill.month for backfill in backfills if backfill.error],
+        "results": sum(backfill.results for backfill in backfills),
+        "seconds": seconds,
+        "months_per_minute": 60 * len(backfills) / seconds if seconds else 0.0,
+        "backfills": [backfill.to_dict() for backfill in backfills],
+    }
+
+
+def run(
+    months: List[str],
+    options: Optional[BackfillOptions] = None,
+    scraper_factory: Optional[Callable[[], IScraperRepository]] = None,
+) -> Dict[str, Any]:
+    """Backfill months with parallel workers and get the report"""
+    options = options or BackfillOptions()
+    driver_pool = None
+    shared_scraper = None
+    if scraper_factory is None:
+        # A browser session per worker, opened when a month needs one
+        driver_pool = WebDriverPool(size=options.workers)
+        shared_scraper = backfill_scraper(driver_pool, bool(options.database_url))
+
+    on_results = None
+    engine = None
+    if options.database_url:
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import create_engine
+
+        engine = create_engine(
+            options.database_url, pool_size=options.workers, max_overflow=0
+        )
+        on_results = month_loader(engine, options.attempts)
+
+    def backfill_worker(month: str) -> MonthBackfill:
+        return backfill_month(
+            shared_scraper or scraper_factory(),
+            month,
+            options.attempts,
+            options.retry_delay,
+            on_results,
+        )
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=options.workers) as executor:
+            futures = [executor.submit(backfill_worker, month) for month in months]
+            backfills = [future.result() for future in as_completed(futures)]
+    finally:
+        if shared_scraper is not None:
+            shared_scraper.close()
+        if driver_pool is not None:
+            driver_pool.close()
+        if engine is not None:
+            engine.dispose()
+    seconds = time.perf_counter() - start
+
+    backfills.sort(key=lambda backfill: months.index(backfill.month))
+    return backfill_report(backfills, options.workers, seconds)
+
+
+def main(args: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=command_description(__doc__))
+    parser.add_argument("--start", required=True, help='First month, "janvier 2023"')
+    parser.add_argument("--end", required=True, help='Last month, "mars 2025"')
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS)
+    parser.add_argument(
+        "--database-url", help="Load each month into Postgres once scraped"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Scrape months already complete"
+    )
+    parser.add_argument("--output", help="JSON file, standard output by default")
+    options = parser.parse_args(args)
+    try:
+        months = month_range(options.start, options.end)
+    except ValueError:
+        parser.error('months are named as on the results site, e.g. "mars 2025"')
+
+    logging.basicConfig(level=logging.INFO)
+    if not options.force:
+        months = pending_months(
+            months, SCRAPER_DATA_DIR, loading=bool(options.database_url)
+        )
+    report = run(
+        months,
+        BackfillOptions(options.workers, options.attempts, options.database_url),
+    )
+    logger.info(
+        "Backfilled %d results of %d months in %.2fs",
+        report["results"],
+        report["months"],
+        report["seconds"],
+    )
+    write_report(report, options.output)
+
+
+if __name__ == "__main__":
+    main()
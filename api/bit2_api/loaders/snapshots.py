@@ -0,0 +1,323 @@
+"""
+Bulk load of the scraped snapshots into Postgres.
+
+Usage:
+    python -m bit2_api.loaders.snapshots --data-dir ./data --workers 4 \
+        --output load.json
+
+The scraper pickles the results of a month to <data dir>/<mois année>/
+<timestamp>.pkl on each scrape. The latest snapshot of each month is read,
+its results are normalized and deduplicated, then streamed with COPY FROM
+STDIN into a temporary staging table and merged into game.game_result.
+Results already stored for a game type and draw date are updated, so loading
+the same snapshots again is idempotent. Months are loaded by parallel
+workers, each on its own connection and transaction. A snapshot loaded
+successfully is marked by an empty <timestamp>.pkl.loaded file.
+"""
+import argparse
+import io
+import logging
+import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from bit2_api.core.domains.utils import normalize_type
+from bit2_api.utils_main.reports import command_description, write_report
+
+logger = logging.getLogger(__name__)
+
+# Directories of the data directory which do not hold month snapshots
+IGNORED_DIRECTORIES = {"outputs"}
+DEFAULT_WORKERS = 4
+# Attempts of a month failing on a deadlock, which concurrent months can hit
+# while the statistics trigger updates the counts of the same numbers
+DEFAULT_ATTEMPTS = 3
+# Suffix of the marker of a snapshot loaded successfully
+LOADED_SUFFIX = ".loaded"
+
+CREATE_STAGING_TABLE = """
+CREATE TEMPORARY TABLE game_result_staging (
+    id uuid NOT NULL,
+    draw_date date NOT NULL,
+    numbers integer[] NOT NULL,
+    bonus integer,
+    type text NOT NULL
+) ON COMMIT DROP
+"""
+COPY_STAGING_TABLE = (
+    "COPY game_result_staging (id, draw_date, numbers, bonus, type) FROM STDIN"
+)
+# Unchanged results are not rewritten
+MERGE_STAGING_TABLE = """
+INSERT INTO game.game_result AS result (id, draw_date, numbers, bonus, type)
+SELECT id, draw_date, numbers, bonus, type FROM game_result_staging
+ON CONFLICT (type, draw_date) DO UPDATE
+SET numbers = excluded.numbers, bonus = excluded.bonus, updated_at = now()
+WHERE (result.numbers, result.bonus) IS DISTINCT FROM
+      (excluded.numbers, excluded.bonus)
+"""
+
+
+@dataclass
+class SnapshotCounts:
+    """Counts of the results of a snapshot"""
+
+    read: int = 0
+    rejected: int = 0
+    duplicates: int = 0
+
+
+@dataclass
+class MonthLoad:
+    """Counts and timing of the load of the snapshot of a month"""
+
+    month: str
+    path: str
+    counts: SnapshotCounts = field(default_factory=SnapshotCounts)
+    # Rows inserted or updated, unchanged results being skipped
+    merged: int = 0
+    seconds: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows of the snapshot loaded per second"""
+        return self.counts.read / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON serializable dict, the counts flattened"""
+        load = asdict(self)
+        counts = load.pop("counts")
+        return {**load, **counts, "rows_per_second": self.rows_per_second}
+
+
+def latest_snapshots(data_dir: str) -> Dict[str, str]:
+    """
+    The path of the latest snapshot of each month of data_dir, by month.
+    Snapshots are named after the ISO timestamp of their scrape.
+    """
+    snapshots = {}
+    for month in sorted(os.listdir(data_dir)):
+        month_dir = os.path.join(data_dir, month)
+        if month in IGNORED_DIRECTORIES or not os.path.isdir(month_dir):
+            continue
+        names = [name for name in os.listdir(month_dir) if name.endswith(".pkl")]
+        if names:
+            snapshots[month] = os.path.join(month_dir, max(names))
+    return snapshots
+
+
+def is_loaded(path: str) -> bool:
+    """Whether a snapshot was loaded successfully"""
+    return os.path.exists(path + LOADED_SUFFIX)
+
+
+def mark_loaded(path: str):
+    """Record that a snapshot was loaded successfully"""
+    with open(path + LOADED_SUFFIX, "wb"):
+        pass
+
+
+def normalize_row(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """A snapshot result as a game result row, or None when it is invalid"""
+    game_type = normalize_type(raw.get("type", ""))
+    draw_date = raw.get("draw_date")
+    try:
+        if isinstance(draw_date, str):
+            draw_date = date.fromisoformat(draw_date[:10])
+        elif isinstance(draw_date, datetime):
+            draw_date = draw_date.date()
+        numbers = [int(number) for number in raw.get("numbers") or []]
+        bonus = raw.get("bonus")
+        bonus = int(bonus) if bonus is not None else None
+    except (TypeError, ValueError):
+        return None
+    if game_type is None or not isinstance(draw_date, date) or not numbers:
+        return None
+    return {
+        "draw_date": draw_date,
+        "numbers": numbers,
+        "bonus": bonus,
+        "type": game_type.value,
+    }
+
+
+def read_snapshot(path: str) -> Tuple[List[Dict[str, Any]], SnapshotCounts]:
+    """
+    The game result rows of a snapshot, a single one per game type and draw
+    date, along with the counts of results read, rejected and duplicated
+    """
+    with open(path, "rb") as snapshot_file:
+        results = pickle.load(snapshot_file)
+    rows = {}
+    rejected = 0
+    for raw in results:
+        row = normalize_row(raw) if isinstance(raw, dict) else None
+        if row is None:
+            rejected += 1
+            continue
+        # The last result of a draw wins, as for the upserts of the API
+        rows[(row["type"], row["draw_date"])] = row
+    duplicates = len(results) - rejected - len(rows)
+    return list(rows.values()), SnapshotCounts(len(results), rejected, duplicates)
+
+
+def copy_buffer(rows: List[Dict[str, Any]]) -> io.StringIO:
+    """The rows in the text format of COPY, each with a new id"""
+    buffer = io.StringIO()
+    for row in rows:
+        numbers = "{" + ",".join(str(number) for number in row["numbers"]) + "}"
+        bonus = r"\N" if row["bonus"] is None else str(row["bonus"])
+        buffer.write(
+            "\t".join(
+                [
+                    str(uuid4()),
+                    row["draw_date"].isoformat(),
+                    numbers,
+                    bonus,
+                    row["type"],
+                ]
+            )
+            + "\n"
+        )
+    buffer.seek(0)
+    return buffer
+
+
+def merge_rows(connection, rows: List[Dict[str, Any]]) -> int:
+    """
+    Copy rows into a staging table and merge them into the game results, in
+    a single transaction of a DBAPI connection. Returns the rows merged.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_STAGING_TABLE)
+        cursor.copy_expert(COPY_STAGING_TABLE, copy_buffer(rows))
+        cursor.execute(MERGE_STAGING_TABLE)
+        merged = cursor.rowcount
+    connection.commit()
+    return merged
+
+
+def is_deadlock(error: Exception) -> bool:
+    """Whether an error is a deadlock or serialization failure of Postgres"""
+    return getattr(error, "pgcode", None) in ("40P01", "40001")
+
+
+def load_month(engine, month: str, path: str, attempts: int) -> MonthLoad:
+    """Load the snapshot of a month, retrying on deadlocks"""
+    load = MonthLoad(month=month, path=path)
+    start = time.perf_counter()
+    try:
+        rows, load.counts = read_snapshot(path)
+        while True:
+            load.attempts += 1
+            connection = engine.raw_connection()
+            try:
+                load.merged = merge_rows(connection, rows)
+                break
+            except Exception as error:  # pylint: disable=broad-except
+                connection.rollback()
+                if not is_deadlock(error) or load.attempts >= attempts:
+                    raise
+                logger.warning("Deadlock loading %s, retrying", month)
+                time.sleep(0.1 * load.attempts)
+            finally:
+                connection.close()
+        mark_loaded(path)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Failed to load %s from %s", month, path)
+        load.error = str(error)
+    load.seconds = time.perf_counter() - start
+    logger.info(
+        "Loaded %s: %d rows read, %d merged in %.2fs",
+        month,
+        load.counts.read,
+        load.merged,
+        load.seconds,
+    )
+    return load
+
+
+def run(
+    data_dir: str,
+    database_url: str,
+    workers: int = DEFAULT_WORKERS,
+    months: Optional[List[str]] = None,
+    attempts: int = DEFAULT_ATTEMPTS,
+) -> Dict[str, Any]:
+    """Load the latest snapshot of the months of data_dir and get the report"""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+
+    snapshots = latest_snapshots(data_dir)
+    if months:
+        snapshots = {month: snapshots[month] for month in months if month in snapshots}
+    engine = create_engine(database_url, pool_size=workers, max_overflow=0)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        loads = list(
+            executor.map(
+                lambda snapshot: load_month(engine, *snapshot, attempts),
+                snapshots.items(),
+            )
+        )
+    seconds = time.perf_counter() - start
+    engine.dispose()
+
+    read = sum(load.counts.read for load in loads)
+    return {
+        "created_at": datetime.now().isoformat(),
+        "data_dir": data_dir,
+        "workers": workers,
+        "months": len(loads),
+        "failed": [load.month for load in loads if load.error],
+        "read": read,
+        "rejected": sum(load.counts.rejected for load in loads),
+        "duplicates": sum(load.counts.duplicates for load in loads),
+        "merged": sum(load.merged for load in loads),
+        "seconds": seconds,
+        "rows_per_second": read / seconds if seconds else 0.0,
+        "loads": [load.to_dict() for load in loads],
+    }
+
+
+def main(args: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=command_description(__doc__))
+    parser.add_argument("--data-dir", default="./data")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--months", nargs="+", help="All the months by default")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS)
+    parser.add_argument("--output", help="JSON file, standard output by default")
+    options = parser.parse_args(args)
+    if not options.database_url:
+        parser.error("a database url is needed, with --database-url or DATABASE_URL")
+
+    logging.basicConfig(level=logging.INFO)
+    report = run(
+        options.data_dir,
+        options.database_url,
+        options.workers,
+        options.months,
+        options.attempts,
+    )
+    logger.info(
+        "Loaded %d rows of %d months in %.2fs (%.0f rows/s)",
+        report["read"],
+        report["months"],
+        report["seconds"],
+        report["rows_per_second"],
+    )
+    write_report(report, options.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+from .cache import *
+from .game_result_repository import *
@@ -0,0 +1,122 @@
+"""
+Cache of the results of the repository reads, shared by the requests of a
+process
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from bit2_api.core.domains.utils import get_env_variable
+
+# Entries kept, the least recently used ones being evicted past it
+GAME_RESULT_CACHE_SIZE = int(get_env_variable("GAME_RESULT_CACHE_SIZE", default="1024"))
+# Seconds an entry is served for, as results may be written by other processes
+GAME_RESULT_CACHE_TTL = float(get_env_variable("GAME_RESULT_CACHE_TTL", default="300"))
+
+# Marker of a lookup that found no entry, None being a valid result
+MISSING = object()
+
+
+@dataclass
+class ResultCacheStats:
+    """Counters of a result cache"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of the lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """
+    Least recently used cache of read results, bounded by its entry count.
+    Entries expire ttl_seconds after they were stored, and are all dropped
+    when results are written. Each drop starts a new generation: the results
+    read during an older one are not stored, as they may predate the write.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = GAME_RESULT_CACHE_SIZE,
+        ttl_seconds: float = GAME_RESULT_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Parameters:
+        * max_entries: The number of results the cache may hold
+        * ttl_seconds: The seconds a result is served for
+        * clock: The source of the time of the entries
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._stats = ResultCacheStats()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Number of the drops of the results, to be read before a read"""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable) -> Any:
+        """Get the result stored for key, MISSING if none is fresh"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """
+        Store a result, evicting the least recently used ones past the bound.
+        A result read during the given generation is only stored if no
+        results were written since.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self):
+        """Drop every result, after results were written"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._stats.invalidations += 1
+
+    @property
+    def stats(self) -> ResultCacheStats:
+        """Snapshot of the counters"""
+        with self._lock:
+            return ResultCacheStats(
+                self._stats.hits,
+                self._stats.misses,
+                self._stats.evictions,
+                self._stats.expirations,
+                self._stats.invalidations,
+                len(self._entries),
+            )
@@ -0,0 +1,288 @@
+"""
+Repositories caching the reads of the game result repositories
+"""
+from datetime import datetime
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.ports import IAsyncGameResultRepository, IGameResultRepository
+from bit2_api.core.ports.session import IAsyncSession, ISession
+
+from .cache import MISSING, ResultCache
+
+# pylint: disable=arguments-differ
+
+
+def cache_key(method: str, *args) -> Hashable:
+    """Key of the result of a read, lists of numbers being made hashable"""
+    return (method,) + tuple(
+        tuple(arg) if isinstance(arg, list) else arg for arg in args
+    )
+
+
+def repository_namespace(repository: Any) -> str:
+    """Namespace of the keys of the results of a repository, named by its class"""
+    return f"{type(repository).__module__}.{type(repository).__qualname__}"
+
+
+def copy_result(result: Any) -> Any:
+    """Copy of a cached list, so that callers sorting it leave the cache intact"""
+    return list(result) if isinstance(result, list) else result
+
+
+class CachingGameResultRepository(IGameResultRepository):
+    """
+    Repository caching the reads of another game result repository.
+    The writes made through it drop the cached results. Full history reads,
+    which the cache could not hold, go straight to the repository.
+    """
+
+    def __init__(
+        self,
+        repository: IGameResultRepository,
+        cache: ResultCache,
+        namespace: Optional[str] = None,
+    ):
+        """
+        Parameters:
+        * repository: The repository whose reads are cached
+        * cache: The cache of the results, which may be shared
+        * namespace: The prefix of the keys, the repository class by default,
+          so that repositories of different backends sharing the cache do not
+          serve each other's results
+        """
+        self.repository = repository
+        self.cache = cache
+        self.namespace = namespace or repository_namespace(repository)
+
+    def cached(self, key: Hashable, read: Callable[[], Any]) -> Any:
+        """Get the result of a read from the cache, or read and store it"""
+        key = (self.namespace,) + key
+        generation = self.cache.generation
+        result = self.cache.get(key)
+        if result is MISSING:
+            result = read()
+            self.cache.put(key, result, generation)
+        return copy_result(result)
+
+    def get_by_draw_date(self, draw_date: datetime, db_session: ISession):
+        """Get a game result by its draw date"""
+        return self.cached(
+            cache_key("get_by_draw_date", draw_date),
+            lambda: self.repository.get_by_draw_date(draw_date, db_session),
+        )
+
+    def get_by_type(self, game_type: GameTypeEnum, db_session: ISession):
+        """Get game results by game type"""
+        return self.cached(
+            cache_key("get_by_type", game_type),
+            lambda: self.repository.get_by_type(game_type, db_session),
+        )
+
+    def get_all(self, db_session: ISession):
+        """Get all game results"""
+        return self.repository.get_all(db_session)
+
+    def iter_all(self, db_session: ISession):
+        """Iterate over all game results"""
+        return self.repository.iter_all(db_session)
+
+    def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: ISession,
+    ):
+        """Get the game results of a game type drawn between start and end"""
+        return self.cached(
+            cache_key("get_range", game_type, start, end),
+            lambda: self.repository.get_range(game_type, start, end, db_session),
+        )
+
+    def get_latest(self, game_type: GameTypeEnum, count: int, db_session: ISession):
+        """Get the last count game results of a game type, latest first"""
+        return self.cached(
+            cache_key("get_latest", game_type, count),
+            lambda: self.repository.get_latest(game_type, count, db_session),
+        )
+
+    def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: ISession,
+    ):
+        """Get the game results following after in (draw date, type) order"""
+        return self.cached(
+            cache_key("get_page", after, limit),
+            lambda: self.repository.get_page(after, limit, db_session),
+        )
+
+    def find_containing(
+        self,
+        numbers: List[int],
+        db_session: ISession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ):
+        """Get the game results whose draw contained all the numbers"""
+        return self.cached(
+            cache_key("find_containing", numbers, game_type, date_range),
+            lambda: self.repository.find_containing(
+                numbers, db_session, game_type=game_type, date_range=date_range
+            ),
+        )
+
+    def create(self, command: ExtractGameResultCommand, db_session: ISession):
+        """Create a game result and drop the cached results"""
+        try:
+            return self.repository.create(command, db_session)
+        finally:
+            self.cache.clear()
+
+    def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: ISession
+    ):
+        """Create or update game results and drop the cached results"""
+        try:
+            return self.repository.upsert_many(commands, db_session)
+        finally:
+            self.cache.clear()
+
+    def delete(
+        self, draw_date: datetime, game_type: GameTypeEnum, db_session: ISession
+    ):
+        """Delete a game result and drop the cached results"""
+        try:
+            return self.repository.delete(draw_date, game_type, db_session)
+        finally:
+            self.cache.clear()
+
+
+class AsyncCachingGameResultRepository(IAsyncGameResultRepository):
+    """
+    Asynchronous repository caching the reads of another one, as
+    CachingGameResultRepository does.
+    """
+
+    def __init__(
+        self,
+        repository: IAsyncGameResultRepository,
+        cache: ResultCache,
+        namespace: Optional[str] = None,
+    ):
+        """
+        Parameters:
+        * repository: The repository whose reads are cached
+        * cache: The cache of the results, which may be shared
+        * namespace: The prefix of the keys, the repository class by default
+        """
+        self.repository = repository
+        self.cache = cache
+        self.namespace = namespace or repository_namespace(repository)
+
+    async def cached(self, key: Hashable, read: Callable[[], Any]) -> Any:
+        """Get the result of a read from the cache, or await it and store it"""
+        key = (self.namespace,) + key
+        generation = self.cache.generation
+        result = self.cache.get(key)
+        if result is MISSING:
+            result = await read()
+            self.cache.put(key, result, generation)
+        return copy_result(result)
+
+    async def get_by_draw_date(self, draw_date: datetime, db_session: IAsyncSession):
+        """Get a game result by its draw date"""
+        return await self.cached(
+            cache_key("get_by_draw_date", draw_date),
+            lambda: self.repository.get_by_draw_date(draw_date, db_session),
+        )
+
+    async def get_by_type(self, game_type: GameTypeEnum, db_session: IAsyncSession):
+        """Get game results by game type"""
+        return await self.cached(
+            cache_key("get_by_type", game_type),
+            lambda: self.repository.get_by_type(game_type, db_session),
+        )
+
+    async def get_all(self, db_session: IAsyncSession):
+        """Get all game results"""
+        return await self.repository.get_all(db_session)
+
+    async def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: IAsyncSession,
+    ):
+        """Get the game results of a game type drawn between start and end"""
+        return await self.cached(
+            cache_key("get_range", game_type, start, end),
+            lambda: self.repository.get_range(game_type, start, end, db_session),
+        )
+
+    async def get_latest(
+        self, game_type: GameTypeEnum, count: int, db_session: IAsyncSession
+    ):
+        """Get the last count game results of a game type, latest first"""
+        return await self.cached(
+            cache_key("get_latest", game_type, count),
+            lambda: self.repository.get_latest(game_type, count, db_session),
+        )
+
+    async def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: IAsyncSession,
+    ):
+        """Get the game results following after in (draw date, type) order"""
+        return await self.cached(
+            cache_key("get_page", after, limit),
+            lambda: self.repository.get_page(after, limit, db_session),
+        )
+
+    async def find_containing(
+        self,
+        numbers: List[int],
+        db_session: IAsyncSession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ):
+        """Get the game results whose draw contained all the numbers"""
+        return await self.cached(
+            cache_key("find_containing", numbers, game_type, date_range),
+            lambda: self.repository.find_containing(
+                numbers, db_session, game_type=game_type, date_range=date_range
+            ),
+        )
+
+    async def create(
+        self, command: ExtractGameResultCommand, db_session: IAsyncSession
+    ):
+        """Create a game result and drop the cached results"""
+        try:
+            return await self.repository.create(command, db_session)
+        finally:
+            self.cache.clear()
+
+    async def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: IAsyncSession
+    ):
+        """Create or update game results and drop the cached results"""
+        try:
+            return await self.repository.upsert_many(commands, db_session)
+        finally:
+            self.cache.clear()
+
+    async def delete(
+        self, draw_date: datetime, game_type: GameTypeEnum, db_session: IAsyncSession
+    ):
+        """Delete a game result and drop the cached results"""
+        try:
+            return await self.repository.delete(draw_date, game_type, db_session)
+        finally:
+            self.cache.clear()
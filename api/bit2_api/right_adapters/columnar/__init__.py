@@ -0,0 +1,4 @@
+from .db import *
+from .repositories import *
+from .session import *
+from .store import *
@@ -0,0 +1,18 @@
+"""
+Module used to get columnar db session
+"""
+from bit2_api.core.ports.database_client_repository import IDatabaseClientRepository
+
+from .session import ColumnarSession, SessionLocal
+
+
+class DatabaseClient(IDatabaseClientRepository):
+    """
+    Class used to get columnar db session
+    """
+
+    def get_db_session(self) -> ColumnarSession:
+        """
+        Main function to get columnar session
+        """
+        return SessionLocal()
@@ -0,0 +1 @@
+from .game_result_repository import *
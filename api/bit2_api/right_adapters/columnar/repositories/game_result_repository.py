@@ -0,0 +1,239 @@
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.models import GameResult as GameResultModel
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.domains.utils.numbers import numbers_mask, split_mask
+from bit2_api.core.ports import IGameResultRepository
+from bit2_api.right_adapters.columnar.session import ColumnarSession
+from bit2_api.right_adapters.columnar.store import (
+    GAME_TYPES,
+    NO_BONUS,
+    NO_NUMBER,
+    NUMBERS_PER_DRAW,
+    ColumnarStore,
+    GameResultColumns,
+    type_code,
+)
+
+
+def to_day(draw_date: date) -> np.datetime64:
+    """Convert a draw date to the day stored in the draw_dates column"""
+    if isinstance(draw_date, datetime):
+        draw_date = draw_date.date()
+    return np.datetime64(draw_date, "D")
+
+
+def type_ranks() -> np.ndarray:
+    """Rank of the type codes in the order of the type names"""
+    ranks = np.full(256, -1, dtype=np.int16)
+    for rank, game_type in enumerate(sorted(GAME_TYPES, key=lambda t: t.value)):
+        ranks[type_code(game_type)] = rank
+    return ranks
+
+
+class GameResultRepository(IGameResultRepository):
+    """
+    Repository for game results in memory-mapped columns.
+    Analytics can read the whole history through arrays() without
+    building GameResult objects.
+    """
+
+    def __init__(self):
+        self.table_name = "game_results"
+
+    def store(self, db_session: ColumnarSession) -> ColumnarStore:
+        """Get the store of the game results"""
+        return db_session.engine.store(self.table_name)
+
+    def arrays(self, db_session: ColumnarSession) -> GameResultColumns:
+        """Get the raw columns of the game results, deleted rows included"""
+        return self.store(db_session).columns()
+
+    @staticmethod
+    def to_model(columns: GameResultColumns, row: int) -> GameResultModel:
+        """Convert a row of the columns to domain model"""
+        bonus = int(columns.bonus[row])
+        return GameResultModel(
+            draw_date=datetime.combine(
+                columns.draw_dates[row].astype(date), datetime.min.time()
+            ),
+            numbers=[int(number) for number in columns.numbers[row] if number],
+            bonus=bonus if bonus != NO_BONUS else None,
+            type=GAME_TYPES[columns.types[row]],
+        )
+
+    def to_models(
+        self, columns: GameResultColumns, mask: np.ndarray
+    ) -> List[GameResultModel]:
+        """Convert the rows selected by a mask to domain models"""
+        return [self.to_model(columns, row) for row in np.flatnonzero(mask)]
+
+    def get_by_draw_date(
+        self, draw_date: datetime, db_session: ColumnarSession
+    ) -> Optional[GameResultModel]:
+        """Get a game result by its draw date"""
+        columns = self.arrays(db_session)
+        rows = np.flatnonzero((columns.draw_dates == to_day(draw_date)) & columns.live)
+        if len(rows):
+            return self.to_model(columns, rows[0])
+        return None
+
+    def get_by_type(
+        self, game_type: GameTypeEnum, db_session: ColumnarSession
+    ) -> List[GameResultModel]:
+        """Get game results by game type"""
+        columns = self.arrays(db_session)
+        return self.to_models(columns, columns.types == type_code(game_type))
+
+    def get_all(self, db_session: ColumnarSession) -> List[GameResultModel]:
+        """Get all game results"""
+        columns = self.arrays(db_session)
+        return self.to_models(columns, columns.live)
+
+    def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: ColumnarSession,
+    ) -> List[GameResultModel]:
+        """Get the game results of a game type drawn between start and end"""
+        columns = self.arrays(db_session)
+        rows = np.flatnonzero(
+            (columns.types == type_code(game_type))
+            & (columns.draw_dates >= to_day(start))
+            & (columns.draw_dates <= to_day(end))
+        )
+        rows = rows[np.argsort(columns.draw_dates[rows], kind="stable")]
+        return [self.to_model(columns, row) for row in rows]
+
+    def get_latest(
+        self, game_type: GameTypeEnum, count: int, db_session: ColumnarSession
+    ) -> List[GameResultModel]:
+        """Get the last count game results of a game type, latest first"""
+        columns = self.arrays(db_session)
+        rows = np.flatnonzero(columns.types == type_code(game_type))
+        rows = rows[np.argsort(columns.draw_dates[rows], kind="stable")]
+        return [self.to_model(columns, row) for row in rows[::-1][:count]]
+
+    def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: ColumnarSession,
+    ) -> List[GameResultModel]:
+        """Get the game results following after in (draw date, type) order"""
+        columns = self.arrays(db_session)
+        ranks = type_ranks()
+        row_ranks = ranks[columns.types]
+
+        selected = columns.live
+        if after is not None:
+            day, rank = to_day(after[0]), ranks[type_code(after[1])]
+            selected &= (columns.draw_dates > day) | (
+                (columns.draw_dates == day) & (row_ranks > rank)
+            )
+        rows = np.flatnonzero(selected)
+        rows = rows[np.lexsort((row_ranks[rows], columns.draw_dates[rows]))]
+        return [self.to_model(columns, row) for row in rows[:limit]]
+
+    def find_containing(
+        self,
+        numbers: List[int],
+        db_session: ColumnarSession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ) -> List[GameResultModel]:
+        """
+        Get the game results whose draw contained all the numbers, comparing
+        the bitmasks of the draws with the one of the numbers
+        """
+        columns = self.arrays(db_session)
+        low, high = (np.uint64(word) for word in split_mask(numbers_mask(numbers)))
+        masks_low, masks_high = columns.masks
+        selected = (
+            columns.live & ((masks_low & low) == low) & ((masks_high & high) == high)
+        )
+        if game_type is not None:
+            selected &= columns.types == type_code(game_type)
+        if date_range is not None:
+            selected &= (columns.draw_dates >= to_day(date_range[0])) & (
+                columns.draw_dates <= to_day(date_range[1])
+            )
+        rows = np.flatnonzero(selected)
+        ranks = type_ranks()[columns.types[rows]]
+        rows = rows[np.lexsort((ranks, columns.draw_dates[rows]))]
+        return [self.to_model(columns, row) for row in rows]
+
+    def create(
+        self, command: ExtractGameResultCommand, db_session: ColumnarSession
+    ) -> GameResultModel:
+        """Create a game result"""
+        return self.create_many([command], db_session)[0]
+
+    def create_many(
+        self, commands: List[ExtractGameResultCommand], db_session: ColumnarSession
+    ) -> List[GameResultModel]:
+        """Create game results with a single append"""
+        numbers = np.full((len(commands), NUMBERS_PER_DRAW), NO_NUMBER, np.uint8)
+        for row, command in enumerate(commands):
+            numbers[row, : len(command.numbers)] = command.numbers
+        self.store(db_session).append(
+            draw_dates=[to_day(command.draw_date) for command in commands],
+            numbers=numbers,
+            bonus=[
+                command.bonus if command.bonus is not None else NO_BONUS
+                for command in commands
+            ],
+            types=[type_code(command.type) for command in commands],
+        )
+        return [
+            GameResultModel(
+                draw_date=command.draw_date,
+                numbers=command.numbers,
+                bonus=command.bonus,
+                type=GameTypeEnum(command.type),
+            )
+            for command in commands
+        ]
+
+    def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: ColumnarSession
+    ) -> List[GameResultModel]:
+        """
+        Create game results, replacing the ones already stored for the same
+        draw date and game type
+        """
+        # The last result of a draw date and game type wins
+        latest = {
+            (to_day(command.draw_date), type_code(command.type)): command
+            for command in commands
+        }
+        if not latest:
+            return []
+        columns = self.arrays(db_session)
+        days = np.array([day for day, _ in latest], dtype=columns.draw_dates.dtype)
+        codes = np.array([code for _, code in latest], dtype=columns.types.dtype)
+        # Rows of the stored results matching a (draw date, game type) pair
+        matches = np.zeros(len(columns.types), dtype=bool)
+        for code in np.unique(codes):
+            matches |= (columns.types == code) & np.isin(
+                columns.draw_dates, days[codes == code]
+            )
+        self.store(db_session).mark_deleted(np.flatnonzero(matches))
+        return self.create_many(list(latest.values()), db_session)
+
+    def delete(
+        self, draw_date: datetime, game_type: GameTypeEnum, db_session: ColumnarSession
+    ) -> None:
+        """Delete a game result"""
+        columns = self.arrays(db_session)
+        rows = np.flatnonzero(
+            (columns.draw_dates == to_day(draw_date))
+            & (columns.types == type_code(game_type))
+        )
+        self.store(db_session).mark_deleted(rows)
@@ -0,0 +1,53 @@
+"""
+Engine and session for the memory-mapped columnar storage
+"""
+import os
+from typing import Dict
+
+from bit2_api.core.domains.utils import get_env_variable
+from bit2_api.core.ports.session import ISession
+
+from .store import ColumnarStore
+
+# Get the base directory for the column files
+COLUMNAR_BASE_DIR = get_env_variable("COLUMNAR_BASE_DIR", default="./data/columnar")
+
+
+class ColumnarEngine:
+    """Engine giving access to the columnar tables of a directory"""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._stores: Dict[str, ColumnarStore] = {}
+
+    def store(self, table_name: str) -> ColumnarStore:
+        """Get the store of a table, shared by all sessions"""
+        if table_name not in self._stores:
+            self._stores[table_name] = ColumnarStore(
+                os.path.join(self.base_dir, table_name)
+            )
+        return self._stores[table_name]
+
+
+class ColumnarSession(ISession):
+    """
+    Session for columnar operations.
+    Writes are applied to the column files immediately.
+    """
+
+    def __init__(self, engine: ColumnarEngine):
+        self.engine = engine
+
+    def commit(self) -> None:
+        """Nothing to commit, the writes are already applied"""
+
+    def close(self) -> None:
+        """Close the session"""
+
+
+engine = ColumnarEngine(COLUMNAR_BASE_DIR)
+
+
+def SessionLocal() -> ColumnarSession:  # pylint: disable=invalid-name
+    """Create a session similar to the PostgreSQL version"""
+    return ColumnarSession(engine)
@@ -0,0 +1,177 @@
+"""
+Memory-mapped columnar storage for game results.
+
+Every table is a directory holding one binary file per column:
+* draw_dates.i8: int64 days since the epoch
+* numbers.u1: uint8 matrix of NUMBERS_PER_DRAW numbers, 0 padded
+* bonus.u1: uint8 bonus, NO_BONUS when the draw has none
+* types.u1: uint8 index of the game type in GameTypeEnum, DELETED_TYPE
+  once the row is deleted
+
+The bitmasks of the numbers, which answer "which draws contained these
+numbers", are derived from the numbers column once per mapping.
+
+Rows are appended to the end of the files, the types column last, so the
+length of the types file is the number of complete rows.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.domains.utils.numbers import WORD_BITS
+
+NUMBERS_PER_DRAW = 5
+NO_NUMBER = 0
+NO_BONUS = 0
+DELETED_TYPE = 255
+GAME_TYPES = list(GameTypeEnum)
+
+DRAW_DATES_FILE = "draw_dates.i8"
+NUMBERS_FILE = "numbers.u1"
+BONUS_FILE = "bonus.u1"
+TYPES_FILE = "types.u1"
+
+
+def type_code(game_type: GameTypeEnum) -> int:
+    """Code of a game type in the types column"""
+    return GAME_TYPES.index(GameTypeEnum(game_type))
+
+
+@dataclass
+class GameResultColumns:
+    """
+    Columns of a game result table.
+    The arrays are read-only views on the memory-mapped files, deleted rows
+    included: use live to filter them out.
+    """
+
+    draw_dates: np.ndarray
+    numbers: np.ndarray
+    bonus: np.ndarray
+    types: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @property
+    def live(self) -> np.ndarray:
+        """Mask of the rows that are not deleted"""
+        return self.types != DELETED_TYPE
+
+    @cached_property
+    def masks(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Low and high 64 bits words of the bitmasks of the numbers of the rows,
+        bit n being set when n was drawn
+        """
+        numbers = self.numbers.astype(np.uint64)
+        bits = np.left_shift(np.uint64(1), numbers % np.uint64(WORD_BITS))
+        drawn = self.numbers != NO_NUMBER
+        high_word = numbers >= np.uint64(WORD_BITS)
+        zero = np.uint64(0)
+        low = np.bitwise_or.reduce(np.where(drawn & ~high_word, bits, zero), axis=1)
+        high = np.bitwise_or.reduce(np.where(high_word, bits, zero), axis=1)
+        return low, high
+
+
+class ColumnarStore:
+    """Memory-mapped columns of a game result table"""
+
+    def __init__(self, directory: str):
+        """
+        Parameters:
+        * directory: The directory holding the column files
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._columns: Optional[GameResultColumns] = None
+        self._lock = threading.Lock()
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self.directory, file_name)
+
+    def __len__(self) -> int:
+        try:
+            return os.path.getsize(self._path(TYPES_FILE))
+        except FileNotFoundError:
+            return 0
+
+    def columns(self) -> GameResultColumns:
+        """
+        Get the columns, mapped again only when rows were appended
+        """
+        row_count = len(self)
+        columns = self._columns
+        if columns is not None and len(columns) == row_count:
+            return columns
+
+        if row_count == 0:
+            columns = GameResultColumns(
+                draw_dates=np.empty(0, dtype="datetime64[D]"),
+                numbers=np.empty((0, NUMBERS_PER_DRAW), dtype=np.uint8),
+                bonus=np.empty(0, dtype=np.uint8),
+                types=np.empty(0, dtype=np.uint8),
+            )
+        else:
+            columns = GameResultColumns(
+                draw_dates=self._map(DRAW_DATES_FILE, np.int64, (row_count,)).view(
+                    "datetime64[D]"
+                ),
+                numbers=self._map(
+                    NUMBERS_FILE, np.uint8, (row_count, NUMBERS_PER_DRAW)
+                ),
+                bonus=self._map(BONUS_FILE, np.uint8, (row_count,)),
+                types=self._map(TYPES_FILE, np.uint8, (row_count,)),
+            )
+        self._columns = columns
+        return columns
+
+    def _map(self, file_name: str, dtype, shape, mode: str = "r") -> np.memmap:
+        return np.memmap(self._path(file_name), dtype=dtype, mode=mode, shape=shape)
+
+    def append(
+        self,
+        draw_dates: np.ndarray,
+        numbers: np.ndarray,
+        bonus: np.ndarray,
+        types: np.ndarray,
+    ) -> int:
+        """
+        Append rows to the columns.
+        Returns the index of the first appended row.
+        """
+        arrays: Dict[str, np.ndarray] = {
+            DRAW_DATES_FILE: np.asarray(draw_dates, dtype="datetime64[D]").astype(
+                np.int64
+            ),
+            NUMBERS_FILE: np.asarray(numbers, dtype=np.uint8).reshape(
+                -1, NUMBERS_PER_DRAW
+            ),
+            BONUS_FILE: np.asarray(bonus, dtype=np.uint8),
+            TYPES_FILE: np.asarray(types, dtype=np.uint8),
+        }
+        with self._lock:
+            if not len(arrays[TYPES_FILE]):
+                return len(self)
+            first_row = len(self)
+            for file_name, array in arrays.items():
+                path = self._path(file_name)
+                with open(path, "ab") as column_file:
+                    # Drop the tail of a previously interrupted append
+                    column_file.truncate(first_row * array[:1].nbytes)
+                    column_file.write(array.tobytes())
+            return first_row
+
+    def mark_deleted(self, rows: np.ndarray) -> None:
+        """Mark rows as deleted, in place"""
+        if len(rows) == 0:
+            return
+        with self._lock:
+            types = self._map(TYPES_FILE, np.uint8, (len(self),), mode="r+")
+            types[rows] = DELETED_TYPE
+            types.flush()
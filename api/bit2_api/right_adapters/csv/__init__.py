@@ -1,3 +1,7 @@
+from .cache import *
 from .db import *
+from .locks import *
+from .partitions import *
 from .repositories import *
+from .schema import *
 from .session import *
@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+"""
+Cache of the parsed CSV tables shared by the sessions of a process
+"""
+
+
+@dataclass
+class CacheStats:
+    """Counters of a table cache"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    tables: int = 0
+    rows: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of the lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TableCache:
+    """
+    Least recently used cache of parsed tables, bounded by their total
+    record count. An entry is only served while the signature of its file
+    is unchanged. The most recently used table is kept even when it alone
+    exceeds the bound.
+    """
+
+    def __init__(self, max_rows: int):
+        """
+        Parameters:
+        * max_rows: The total number of records the cached tables may hold
+        """
+        self.max_rows = max_rows
+        self._tables: "OrderedDict[str, Any]" = OrderedDict()
+        self._rows = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, table_name: str, signature: Optional[Tuple[int, ...]]) -> Any:
+        """Get a table parsed from the file with signature, None if not cached"""
+        with self._lock:
+            table = self._tables.get(table_name)
+            if table is None or table.signature != signature:
+                self._stats.misses += 1
+                return None
+            self._tables.move_to_end(table_name)
+            self._stats.hits += 1
+            return table
+
+    def put(self, table_name: str, table: Any):
+        """Cache a table, evicting the least recently used ones past the bound"""
+        with self._lock:
+            self._discard(table_name)
+            self._tables[table_name] = table
+            self._rows += table.record_count
+            while self._rows > self.max_rows and len(self._tables) > 1:
+                self._discard(next(iter(self._tables)))
+                self._stats.evictions += 1
+
+    def invalidate(self, table_name: str):
+        """Drop a table, after it was written"""
+        with self._lock:
+            self._discard(table_name)
+
+    def clear(self):
+        """Drop every table"""
+        with self._lock:
+            self._tables.clear()
+            self._rows = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the counters"""
+        with self._lock:
+            return CacheStats(
+                self._stats.hits,
+                self._stats.misses,
+                self._stats.evictions,
+                len(self._tables),
+                self._rows,
+            )
+
+    def _discard(self, table_name: str):
+        """Drop a table, the lock being held"""
+        table = self._tables.pop(table_name, None)
+        if table is not None:
+            self._rows -= table.record_count
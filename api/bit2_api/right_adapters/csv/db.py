@@ -1,6 +1,9 @@
+from dataclasses import asdict
+from typing import Any, Dict
+
 from bit2_api.core.ports.database_client_repository import IDatabaseClientRepository
 
-from .session import SessionLocal
+from .session import SessionLocal, engine
 
 """
 Module used to get CSV db session
@@ -20,3 +23,8 @@ class DatabaseClient(IDatabaseClientRepository):
         csv_session.current_user_id = None
         if csv_session:
             return csv_session
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get the metrics of the cache of parsed tables"""
+        stats = engine.cache_stats
+        return {**asdict(stats), "hit_ratio": stats.hit_ratio}
@@ -0,0 +1,25 @@
+import fcntl
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+"""
+Advisory file locks shared by the processes using the CSV storage
+"""
+
+
+@contextmanager
+def file_lock(path: str, exclusive: bool = True) -> Iterator[None]:
+    """
+    Hold an advisory lock on path, created if needed.
+    Exclusive locks are taken by writers, shared ones by readers.
+    Every call opens its own descriptor, so the lock also excludes other
+    threads of the process.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
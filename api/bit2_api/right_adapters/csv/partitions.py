@@ -0,0 +1,176 @@
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from bit2_api.right_adapters.csv.locks import file_lock
+
+"""
+Manifest of CSV tables partitioned by month of draw date
+"""
+
+MANIFEST_FILE = "_manifest.json"
+
+
+@dataclass
+class PartitionStats:
+    """Row count, draw date bounds and game types of a partition"""
+
+    row_count: int = 0
+    min_draw_date: Optional[str] = None
+    max_draw_date: Optional[str] = None
+    types: List[str] = field(default_factory=list)
+
+    def add_rows(self, rows: List[Dict[str, Any]]):
+        """Account for rows added to the partition"""
+        for row in rows:
+            draw_date = str(row["draw_date"])[:10]
+            if self.min_draw_date is None or draw_date < self.min_draw_date:
+                self.min_draw_date = draw_date
+            if self.max_draw_date is None or draw_date > self.max_draw_date:
+                self.max_draw_date = draw_date
+            if row["type"] not in self.types:
+                self.types.append(row["type"])
+        self.row_count += len(rows)
+
+    def matches(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        game_type: Optional[str] = None,
+    ) -> bool:
+        """Whether the partition may hold rows in [start, end] of game_type"""
+        if not self.row_count:
+            return False
+        if start is not None and self.max_draw_date < start:
+            return False
+        if end is not None and self.min_draw_date > end:
+            return False
+        return game_type is None or game_type in self.types
+
+
+class PartitionManifest:
+    """
+    Manifest of a table split in one CSV file per (year, month),
+    stored next to the partitions. Queries use it to only open the
+    partitions that can hold matching rows.
+    """
+
+    def __init__(self, engine, table_name: str):
+        """
+        Parameters:
+        * engine: The CSV engine holding the partitions
+        * table_name: The name of the partitioned table
+        """
+        self.engine = engine
+        self.table_name = table_name
+        self.path = os.path.join(engine.base_dir, table_name, MANIFEST_FILE)
+        self._partitions: Optional[Dict[str, PartitionStats]] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+
+    def partition_name(self, draw_date: Any) -> str:
+        """Name of the partition table holding rows of a draw date"""
+        return f"{self.table_name}/{str(draw_date)[:7]}"
+
+    def partitions(self) -> Dict[str, PartitionStats]:
+        """Stats of the partitions, by partition table name"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                if self._partitions is None:
+                    self._partitions = self._scan()
+                return self._partitions
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._partitions is None or signature != self._signature:
+                with open(self.path, "r") as manifest_file:
+                    content = json.load(manifest_file)
+                self._partitions = {
+                    self.partition_name(key): PartitionStats(**stats)
+                    for key, stats in content["partitions"].items()
+                }
+                self._signature = signature
+            return self._partitions
+
+    def select(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        game_type: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Names of the partition tables that may hold rows drawn between
+        start and end (inclusive) of game_type, in chronological order
+        """
+        start_key = start.isoformat()[:10] if start is not None else None
+        end_key = end.isoformat()[:10] if end is not None else None
+        return sorted(
+            name
+            for name, stats in self.partitions().items()
+            if stats.matches(start_key, end_key, game_type)
+        )
+
+    def add_rows(self, partition: str, rows: List[Dict[str, Any]]):
+        """Account for rows appended to a partition"""
+        with self._lock, file_lock(self.path + ".lock"):
+            # Other processes may have updated the manifest
+            self._signature = None
+            if not os.path.exists(self.path):
+                # The stats are rebuilt from the files, which may already
+                # hold some of the rows
+                self._partitions = None
+                written = {row.get("id") for row in self.engine.read_all(partition)}
+                rows = [row for row in rows if row.get("id") not in written]
+            partitions = self.partitions()
+            partitions.setdefault(partition, PartitionStats()).add_rows(rows)
+            self._save(partitions)
+
+    def refresh(self, partition: str):
+        """Recompute the stats of a partition from its content"""
+        with self._lock, file_lock(self.path + ".lock"):
+            self._signature = None
+            partitions = self.partitions()
+            partitions[partition] = self._stats(partition)
+            self._save(partitions)
+
+    def _stats(self, partition: str) -> PartitionStats:
+        """Compute the stats of a partition from its content"""
+        stats = PartitionStats()
+        stats.add_rows(self.engine.read_all(partition))
+        return stats
+
+    def _scan(self) -> Dict[str, PartitionStats]:
+        """Rebuild the stats from the partition files, when no manifest exists"""
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            return {}
+        partitions = {}
+        for file_name in os.listdir(directory):
+            if file_name.endswith(".csv"):
+                partition = f"{self.table_name}/{file_name[:-len('.csv')]}"
+                partitions[partition] = self._stats(partition)
+        return partitions
+
+    def _save(self, partitions: Dict[str, PartitionStats]):
+        """Atomically write the manifest"""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        content = {
+            "partitions": {
+                name.rsplit("/", 1)[-1]: asdict(stats)
+                for name, stats in sorted(partitions.items())
+            }
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+        with os.fdopen(fd, "w") as manifest_file:
+            json.dump(content, manifest_file, indent=2)
+        os.replace(tmp_path, self.path)
+
+        stat = os.stat(self.path)
+        self._partitions = partitions
+        self._signature = (stat.st_mtime_ns, stat.st_size)
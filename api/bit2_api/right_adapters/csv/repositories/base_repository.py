@@ -1,8 +1,9 @@
 from abc import ABC
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Type, TypeVar
 from uuid import UUID, uuid4
 
-from bit2_api.right_adapters.csv.session import CSVSession
+from bit2_api.right_adapters.csv.session import CSVSession, QueryFilter
 
 """
 Generic abstract CRUD for CSV repositories
@@ -15,11 +16,19 @@ ModelType = TypeVar("ModelType")
 DictType = TypeVar("DictType", bound=Dict[str, Any])
 
 
+def id_key(row: Dict[str, Any]) -> Optional[str]:
+    """Index key of a row on its id"""
+    return row.get("id")
+
+
 class BaseRepository(Generic[ModelType], ABC):
     """
     Base repository for CSV storage with CRUD operations
     """
 
+    # Hash indexes maintained by the CSV engine, by name
+    indexes: Dict[str, Callable[[Dict[str, Any]], Any]] = {"id": id_key}
+
     def __init__(self, table_name: str):
         """
         Initialize the repository with a table name
@@ -29,6 +38,66 @@ class BaseRepository(Generic[ModelType], ABC):
         """
         self.table_name = table_name
 
+    def tables(self, db_session: CSVSession) -> List[str]:
+        """
+        Names of the CSV files holding the records
+        """
+        return [self.table_name]
+
+    def table_for(self, obj: Dict[str, Any]) -> str:
+        """
+        Name of the CSV file a record is written to
+        """
+        return self.table_name
+
+    def on_rows_written(
+        self, table_name: str, rows: List[Dict[str, Any]], db_session: CSVSession
+    ) -> None:
+        """
+        Hook called once new rows are written to a CSV file, which may be
+        after their commit when the session groups its commits
+        """
+
+    def lookup(
+        self,
+        index_name: str,
+        value: Any,
+        db_session: CSVSession,
+        table_names: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the rows matching value on one of the repository indexes,
+        in the given CSV files or in all of them
+        """
+        if table_names is None:
+            table_names = self.tables(db_session)
+        rows = []
+        for table_name in table_names:
+            rows.extend(
+                db_session.lookup(
+                    table_name, index_name, self.indexes[index_name], value
+                )
+            )
+        return rows
+
+    def scan(
+        self,
+        query_filter: Optional[QueryFilter],
+        db_session: CSVSession,
+        table_names: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily get the rows matching a filter, in the given CSV files or in
+        all of them. Files are only opened once the previous ones are
+        exhausted, and not at all once the limit of the filter is reached.
+        """
+        if table_names is None:
+            table_names = self.tables(db_session)
+        rows = chain.from_iterable(
+            db_session.query(table_name, query_filter) for table_name in table_names
+        )
+        return islice(rows, query_filter.limit if query_filter else None)
+
     @staticmethod
     def to_model(item: Dict[str, Any]) -> ModelType:
         """Method to convert from CSV dictionary to domain model"""
@@ -41,19 +110,23 @@ class BaseRepository(Generic[ModelType], ABC):
 
     def get_all(self, db_session: CSVSession) -> List[ModelType]:
         """
-        Get all records from the CSV file
+        Get all records from the CSV files
         """
-        rows = db_session.query(self.table_name)
-        return [self.to_model(row) for row in rows]
+        return list(self.iter_all(db_session))
+
+    def iter_all(self, db_session: CSVSession) -> Iterator[ModelType]:
+        """
+        Lazily get all records from the CSV files, one file after the other
+        """
+        return (self.to_model(row) for row in self.scan(None, db_session))
 
     def get_by_id(self, item_id: UUID, db_session: CSVSession) -> Optional[ModelType]:
         """
         Get a record by ID
         """
-        rows = db_session.query(self.table_name)
-        for row in rows:
-            if row.get("id") == str(item_id):
-                return self.to_model(row)
+        rows = self.lookup("id", str(item_id), db_session)
+        if rows:
+            return self.to_model(rows[0])
         return None
 
     def get_attribute_by_id(
@@ -62,21 +135,16 @@ class BaseRepository(Generic[ModelType], ABC):
         """
         Get a specific attribute value for a record by ID
         """
-        rows = db_session.query(self.table_name)
-        for row in rows:
-            if row.get("id") == str(item_id):
-                return row.get(attribute_name)
+        rows = self.lookup("id", str(item_id), db_session)
+        if rows:
+            return rows[0].get(attribute_name)
         return None
 
     def exists(self, item_id: UUID, db_session: CSVSession) -> bool:
         """
         Check if a record with the given ID exists
         """
-        rows = db_session.query(self.table_name)
-        for row in rows:
-            if row.get("id") == str(item_id):
-                return True
-        return False
+        return bool(self.lookup("id", str(item_id), db_session))
 
     def create(self, obj: Dict[str, Any], db_session: CSVSession) -> ModelType:
         """
@@ -89,35 +157,44 @@ class BaseRepository(Generic[ModelType], ABC):
             data["id"] = str(uuid4())
 
         # Add to the session
-        db_session.add(self.table_name, data)
+        table_name = self.table_for(data)
+        db_session.add(table_name, data, on_written=self.on_rows_written)
         db_session.commit()
 
         return self.to_model(data)
 
+    def create_many(
+        self, objs: List[Dict[str, Any]], db_session: CSVSession
+    ) -> List[ModelType]:
+        """
+        Create new records with a single commit
+        """
+        rows = [obj.copy() for obj in objs]
+        rows_by_table: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            if "id" not in row:
+                row["id"] = str(uuid4())
+            rows_by_table.setdefault(self.table_for(row), []).append(row)
+
+        for table_name, table_rows in rows_by_table.items():
+            db_session.add_all(table_name, table_rows, on_written=self.on_rows_written)
+        db_session.commit()
+
+        return [self.to_model(row) for row in rows]
+
     def update(
         self, id_: UUID, obj: Dict[str, Any], db_session: CSVSession
     ) -> Optional[ModelType]:
         """
         Update a record
         """
-        rows = db_session.query(self.table_name)
-        updated_rows = []
-        updated_item = None
-
-        for row in rows:
-            if row.get("id") == str(id_):
-                # Update the row with new values
-                updated_row = row.copy()
+        for table_name in self.tables(db_session):
+            rows = self.lookup("id", str(id_), db_session, [table_name])
+            if rows:
+                # Update the row with new values, in the file holding it
+                updated_row = rows[0].copy()
                 for key, value in obj.items():
                     updated_row[key] = value
-                updated_rows.append(updated_row)
-                updated_item = updated_row
-            else:
-                updated_rows.append(row)
-
-        # Write all rows back to the file
-        db_session.engine.write_rows(self.table_name, updated_rows, mode="w")
-
-        if updated_item:
-            return self.to_model(updated_item)
+                db_session.upsert_rows(table_name, [updated_row])
+                return self.to_model(updated_row)
         return None
@@ -1,29 +1,99 @@
-from datetime import datetime
-from typing import Any, Dict
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from bit2_api.core.domains.commands import ExtractGameResultCommand
 from bit2_api.core.domains.models import GameResult as GameResultModel
-from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.domains.utils.enums import GameTypeEnum, normalize_type
+from bit2_api.core.domains.utils.numbers import contains_numbers, numbers_mask
 from bit2_api.core.ports import IGameResultRepository
-from bit2_api.right_adapters.csv.session import CSVSession
+from bit2_api.right_adapters.csv.schema import (
+    Codec,
+    EpochDayCodec,
+    IntCodec,
+    IntListCodec,
+    TableSchema,
+    register_schema,
+)
+from bit2_api.right_adapters.csv.session import CSVSession, QueryFilter
 
 from .base_repository import BaseRepository
 
 # pylint: disable=arguments-renamed
 
+logger = logging.getLogger(__name__)
+
+GAME_RESULTS_TABLE = "game_results"
+
+register_schema(
+    GAME_RESULTS_TABLE,
+    TableSchema(
+        {
+            "id": Codec(),
+            "draw_date": EpochDayCodec(),
+            "numbers": IntListCodec(),
+            "bonus": IntCodec(),
+            "type": Codec(),
+        }
+    ),
+)
+
+
+def to_datetime(draw_date: date) -> datetime:
+    """Convert a draw date to the datetime stored in the rows"""
+    if isinstance(draw_date, datetime):
+        return draw_date
+    return datetime.combine(draw_date, datetime.min.time())
+
+
+def draw_date_type_key(row: Dict[str, Any]) -> Tuple[datetime, str]:
+    """Index key of a row on its draw date and game type"""
+    return row["draw_date"], row["type"]
+
 
 class GameResultRepository(BaseRepository[GameResultModel], IGameResultRepository):
-    """Repository for game results in CSV"""
+    """
+    Repository for game results in CSV.
+    Results are stored in one file per month of draw date, listed with their
+    row count, draw date bounds and game types in a partition manifest.
+    """
+
+    indexes = {
+        **BaseRepository.indexes,
+        "draw_date_type": draw_date_type_key,
+    }
 
     def __init__(self):
-        super().__init__(f"{datetime.now()}-game_results")
+        super().__init__(GAME_RESULTS_TABLE)
+
+    def tables(
+        self,
+        db_session: CSVSession,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        game_type: Optional[GameTypeEnum] = None,
+    ) -> List[str]:
+        """Names of the partitions that may hold results matching the filters"""
+        return db_session.engine.manifest(self.table_name).select(
+            start, end, game_type.value if game_type is not None else None
+        )
+
+    def table_for(self, obj: Dict[str, Any]) -> str:
+        """Name of the partition holding the month of the draw date"""
+        return f"{self.table_name}/{obj['draw_date']:%Y-%m}"
+
+    def on_rows_written(
+        self, table_name: str, rows: List[Dict[str, Any]], db_session: CSVSession
+    ) -> None:
+        """Account for the new rows in the partition manifest"""
+        db_session.engine.manifest(self.table_name).add_rows(table_name, rows)
 
     @staticmethod
     def to_model(item: Dict[str, Any]) -> GameResultModel:
         """Convert from CSV dictionary to domain model"""
         return GameResultModel(
-            draw_date=datetime.fromisoformat(item["draw_date"]),
+            draw_date=item["draw_date"],
             numbers=item["numbers"],
             bonus=item["bonus"],
             type=GameTypeEnum(item["type"]),
@@ -33,7 +103,7 @@ class GameResultRepository(BaseRepository[GameResultModel], IGameResultRepositor
     def to_dict(model: GameResultModel) -> Dict[str, Any]:
         """Convert from domain model to CSV dictionary"""
         return {
-            "draw_date": model.draw_date.isoformat(),
+            "draw_date": to_datetime(model.draw_date),
             "numbers": model.numbers,
             "bonus": model.bonus,
             "type": model.type.value,
@@ -41,49 +111,204 @@ class GameResultRepository(BaseRepository[GameResultModel], IGameResultRepositor
 
     def get_by_draw_date(self, draw_date: datetime, db_session: CSVSession):
         """Get a game result by its draw date"""
-        rows = db_session.query(self.table_name)
-        for row in rows:
-            if datetime.fromisoformat(row["draw_date"]) == draw_date:
-                return self.to_model(row)
+        draw_date = to_datetime(draw_date)
+        rows = self.scan(
+            QueryFilter(equals={"draw_date": draw_date}, limit=1),
+            db_session,
+            self.tables(db_session, start=draw_date, end=draw_date),
+        )
+        row = next(rows, None)
+        if row is not None:
+            return self.to_model(row)
         return None
 
     def get_by_type(self, game_type: GameTypeEnum, db_session: CSVSession):
         """Get game results by game type"""
-        rows = db_session.query(self.table_name)
-        results = [row for row in rows if row["type"] == game_type.value]
-        return [self.to_model(result) for result in results]
-
-    def get_all(self, db_session: CSVSession):
-        """Get all game results"""
-        rows = db_session.query(self.table_name)
+        rows = self.scan(
+            QueryFilter(equals={"type": game_type.value}),
+            db_session,
+            self.tables(db_session, game_type=game_type),
+        )
         return [self.to_model(row) for row in rows]
 
+    def sorted_rows(
+        self,
+        table_name: str,
+        query_filter: QueryFilter,
+        db_session: CSVSession,
+        reverse: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rows of a partition matching a filter, ordered by (draw date, type).
+        Partitions hold a month of draws, so they are sorted one at a time.
+        """
+        return sorted(
+            db_session.query(table_name, query_filter),
+            key=draw_date_type_key,
+            reverse=reverse,
+        )
+
+    def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: CSVSession,
+    ):
+        """
+        Get the game results of a game type drawn between start and end,
+        reading the partitions of the months in the range only
+        """
+        start, end = to_datetime(start), to_datetime(end)
+        query_filter = QueryFilter(
+            equals={"type": game_type.value}, between={"draw_date": (start, end)}
+        )
+        return [
+            self.to_model(row)
+            for table_name in self.tables(db_session, start, end, game_type)
+            for row in self.sorted_rows(table_name, query_filter, db_session)
+        ]
+
+    def get_latest(self, game_type: GameTypeEnum, count: int, db_session: CSVSession):
+        """
+        Get the last count game results of a game type, latest first,
+        reading the partitions from the latest one until count results are found
+        """
+        query_filter = QueryFilter(equals={"type": game_type.value})
+        rows = []
+        for table_name in reversed(self.tables(db_session, game_type=game_type)):
+            if len(rows) >= count:
+                break
+            rows.extend(
+                self.sorted_rows(table_name, query_filter, db_session, reverse=True)
+            )
+        return [self.to_model(row) for row in rows[:count]]
+
+    def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: CSVSession,
+    ):
+        """
+        Get the game results following after in (draw date, type) order,
+        reading the partitions from the month of after until the page is full
+        """
+        start = None
+        query_filter = QueryFilter()
+        if after is not None:
+            start = to_datetime(after[0])
+            after_key = (start, GameTypeEnum(after[1]).value)
+            query_filter = QueryFilter(
+                between={"draw_date": (start, None)},
+                predicate=lambda row: draw_date_type_key(row) > after_key,
+            )
+        rows = []
+        for table_name in self.tables(db_session, start=start):
+            if len(rows) >= limit:
+                break
+            rows.extend(self.sorted_rows(table_name, query_filter, db_session))
+        return [self.to_model(row) for row in rows[:limit]]
+
+    def find_containing(
+        self,
+        numbers: List[int],
+        db_session: CSVSession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ):
+        """
+        Get the game results whose draw contained all the numbers, reading
+        the partitions of the game type and months of the range only
+        """
+        wanted_mask = numbers_mask(numbers)
+        start, end = (None, None)
+        if date_range is not None:
+            start, end = (to_datetime(draw_date) for draw_date in date_range)
+        query_filter = QueryFilter(
+            equals={"type": game_type.value} if game_type is not None else {},
+            between={"draw_date": (start, end)} if date_range is not None else {},
+            predicate=lambda row: contains_numbers(
+                numbers_mask(row["numbers"]), wanted_mask
+            ),
+        )
+        return [
+            self.to_model(row)
+            for table_name in self.tables(db_session, start, end, game_type)
+            for row in self.sorted_rows(table_name, query_filter, db_session)
+        ]
+
     def create(self, command: ExtractGameResultCommand, db_session: CSVSession):
         """Create a game result"""
-        game_result_dict = {
+        return super().create(self.command_to_dict(command), db_session)
+
+    def create_many(
+        self, commands: List[ExtractGameResultCommand], db_session: CSVSession
+    ):
+        """Create game results with a single commit"""
+        return super().create_many(
+            [self.command_to_dict(command) for command in commands], db_session
+        )
+
+    def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: CSVSession
+    ):
+        """
+        Create game results, or update the ones already stored for the same
+        draw date and game type. Results of unknown game types are skipped.
+        """
+        # The last result of a draw date and game type wins
+        rows = {}
+        for command in commands:
+            if normalize_type(command.type) is None:
+                logger.warning(
+                    "Skipping a result of unknown game type %s", command.type
+                )
+                continue
+            row = self.command_to_dict(command)
+            rows[draw_date_type_key(row)] = row
+
+        new_rows = []
+        updates: Dict[str, List[Dict[str, Any]]] = {}
+        for key, row in rows.items():
+            table_name = self.table_for(row)
+            stored = self.lookup("draw_date_type", key, db_session, [table_name])
+            if stored:
+                row["id"] = stored[0]["id"]
+                updates.setdefault(table_name, []).append(row)
+            else:
+                new_rows.append(row)
+
+        # Updates keep the draw dates and game types of the partitions
+        for table_name, table_rows in updates.items():
+            db_session.upsert_rows(table_name, table_rows)
+        if new_rows:
+            super().create_many(new_rows, db_session)
+        return [self.to_model(row) for row in rows.values()]
+
+    @staticmethod
+    def command_to_dict(command: ExtractGameResultCommand) -> Dict[str, Any]:
+        """Convert from command to CSV dictionary"""
+        game_type = normalize_type(command.type)
+        if game_type is None:
+            raise ValueError(f"Unknown game type: {command.type}")
+        return {
             "id": str(uuid4()),
-            "draw_date": command.draw_date.isoformat(),
+            "draw_date": to_datetime(command.draw_date),
             "numbers": command.numbers,
             "bonus": command.bonus,
-            "type": str(command.type),
+            "type": game_type.value,
         }
-        return super().create(game_result_dict, db_session)
 
     def delete(
         self, draw_date: datetime, game_type: GameTypeEnum, db_session: CSVSession
     ):
         """Delete a game result"""
-        rows = db_session.query(self.table_name)
-        updated_rows = []
-
-        for row in rows:
-            # Keep rows that don't match the criteria for deletion
-            if (
-                datetime.fromisoformat(row["draw_date"]) != draw_date
-                or row["type"] != game_type.value
-            ):
-                updated_rows.append(row)
-
-        # Write all remaining rows back to the file (effectively deleting the matching ones)
-        if len(updated_rows) < len(rows):
-            db_session.engine.write_rows(self.table_name, updated_rows, mode="w")
+        draw_date = to_datetime(draw_date)
+        table_name = self.table_for({"draw_date": draw_date})
+        rows = self.lookup(
+            "draw_date_type", (draw_date, game_type.value), db_session, [table_name]
+        )
+        if rows:
+            db_session.delete_rows(table_name, [row["id"] for row in rows])
+            db_session.engine.manifest(self.table_name).refresh(table_name)
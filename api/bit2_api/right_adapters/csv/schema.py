@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+"""
+Typed schemas and compact encodings for CSV tables
+"""
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class Codec:
+    """Encoding of a column, kept as text when no typed codec is given"""
+
+    def encode(self, value: Any) -> str:
+        """Encode a value to its CSV field"""
+        return "" if value is None else str(value)
+
+    def decode(self, field: str) -> Any:
+        """Decode a CSV field to its value"""
+        return field
+
+    def decode_column(self, fields: Iterable[str]) -> List[Any]:
+        """Decode all the fields of a column"""
+        return list(map(self.decode, fields))
+
+
+class IntCodec(Codec):
+    """Integers, None encoded as an empty field"""
+
+    def decode(self, field: str) -> Optional[int]:
+        return int(field) if field else None
+
+
+class IntListCodec(Codec):
+    """Lists of integers, joined with a dash: [1, 20, 33] <-> 1-20-33"""
+
+    def encode(self, value: Optional[List[int]]) -> str:
+        if value is None:
+            return ""
+        return "-".join(str(int(number)) for number in value)
+
+    def decode(self, field: str) -> Optional[List[int]]:
+        if not field:
+            return None
+        if field[0] == "[":
+            # Python list literal written by earlier versions
+            return [int(number) for number in field[1:-1].split(",") if number]
+        return [int(number) for number in field.split("-")]
+
+
+@lru_cache(maxsize=16384)
+def _epoch_day_to_datetime(field: str) -> datetime:
+    """Decode a date field, memoized as draws share their dates"""
+    if "-" in field:
+        # ISO date written by earlier versions
+        return datetime.fromisoformat(field)
+    return EPOCH + timedelta(days=int(field))
+
+
+class EpochDayCodec(Codec):
+    """Dates, as a number of days since 1970-01-01: 2025-03-01 <-> 20148"""
+
+    def encode(self, value: Optional[datetime]) -> str:
+        if value is None:
+            return ""
+        return str(value.toordinal() - EPOCH.toordinal())
+
+    def decode(self, field: str) -> Optional[datetime]:
+        return _epoch_day_to_datetime(field) if field else None
+
+
+TEXT = Codec()
+
+
+class TableSchema:
+    """Codecs of the columns of a CSV table, untyped columns are kept as text"""
+
+    def __init__(self, codecs: Optional[Dict[str, Codec]] = None):
+        self.codecs = codecs or {}
+
+    def encode_row(self, row: Dict[str, Any]) -> Dict[str, str]:
+        """Encode a row to CSV fields"""
+        return {
+            name: self.codecs.get(name, TEXT).encode(value)
+            for name, value in row.items()
+        }
+
+    def decode_columns(
+        self, fieldnames: List[str], records: Iterable[List[str]]
+    ) -> Dict[str, List[Any]]:
+        """
+        Decode the records of a file to typed columns, in one pass over the
+        records followed by one decoder call per field
+        """
+        records = [record for record in records if record]
+        width = len(fieldnames)
+        if any(len(record) != width for record in records):
+            records = [(record + [""] * width)[:width] for record in records]
+        if not records:
+            return {name: [] for name in fieldnames}
+        return {
+            name: self.codecs.get(name, TEXT).decode_column(fields)
+            for name, fields in zip(fieldnames, zip(*records))
+        }
+
+
+# Schemas of the CSV tables, by table name
+TABLE_SCHEMAS: Dict[str, TableSchema] = {}
+
+
+def register_schema(table_name: str, schema: TableSchema):
+    """
+    Register the schema of a table.
+    It also applies to the partitions of the table, named "<table_name>/<key>".
+    """
+    TABLE_SCHEMAS[table_name] = schema
+
+
+def get_schema(table_name: str) -> TableSchema:
+    """Get the schema of a table or of the table it is a partition of"""
+    schema = TABLE_SCHEMAS.get(table_name)
+    if schema is None:
+        schema = TABLE_SCHEMAS.get(table_name.split("/", 1)[0])
+    return schema or TableSchema()
@@ -1,66 +1,700 @@
 import csv
+import io
+import json
+import logging
 import os
-from typing import Any, Dict, List
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from bit2_api.core.domains.utils import get_env_variable
+from bit2_api.right_adapters.csv.cache import CacheStats, TableCache
+from bit2_api.right_adapters.csv.locks import file_lock
+from bit2_api.right_adapters.csv.partitions import PartitionManifest
+from bit2_api.right_adapters.csv.schema import get_schema
 
 """
 Engine and session for CSV storage
 """
 
+logger = logging.getLogger(__name__)
 
 # Get the base directory for CSV files
 CSV_BASE_DIR = get_env_variable("CSV_BASE_DIR", default="./data")
+# Append updates and deletes as new records instead of rewriting the files
+CSV_LOG_STRUCTURED = get_env_variable("CSV_LOG_STRUCTURED", default="false") == "true"
+# Compact a table once this share of its records is dead...
+CSV_COMPACTION_RATIO = float(get_env_variable("CSV_COMPACTION_RATIO", default="0.5"))
+# ...and it holds at least this many dead records
+CSV_COMPACTION_MIN_DEAD = int(
+    get_env_variable("CSV_COMPACTION_MIN_DEAD", default="100")
+)
+# Buffer committed rows and write them in batches
+CSV_GROUP_COMMIT = get_env_variable("CSV_GROUP_COMMIT", default="false") == "true"
+CSV_GROUP_COMMIT_SIZE = int(get_env_variable("CSV_GROUP_COMMIT_SIZE", default="500"))
+CSV_GROUP_COMMIT_INTERVAL = float(
+    get_env_variable("CSV_GROUP_COMMIT_INTERVAL", default="1.0")
+)
+# Sync the files to disk after every write
+CSV_FSYNC = get_env_variable("CSV_FSYNC", default="false") == "true"
+# Records kept in the cache of parsed tables
+CSV_CACHE_MAX_ROWS = int(get_env_variable("CSV_CACHE_MAX_ROWS", default="1000000"))
+
+# Suffixes of the lock file and write-ahead file of a table
+LOCK_SUFFIX = ".lock"
+WAL_SUFFIX = ".wal"
+
+# Column holding the operation of a record in log-structured tables
+OP_COLUMN = "_op"
+OP_PUT = "put"
+OP_DELETE = "delete"
+
+
+@dataclass
+class QueryFilter:
+    """
+    Filter pushed down to the scans of a table:
+    * equals: Values that columns must be equal to
+    * between: Inclusive (low, high) bounds of columns, None for no bound
+    * predicate: Any other condition on the rows
+    * limit: Maximum number of rows to return
+    """
+
+    equals: Dict[str, Any] = field(default_factory=dict)
+    between: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    predicate: Optional[Callable[[Dict[str, Any]], bool]] = None
+    limit: Optional[int] = None
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        """Whether a row satisfies the filter, limit aside"""
+        for name, value in self.equals.items():
+            if row.get(name) != value:
+                return False
+        for name, (low, high) in self.between.items():
+            value = row.get(name)
+            if value is None:
+                return False
+            if low is not None and value < low:
+                return False
+            if high is not None and value > high:
+                return False
+        return self.predicate is None or self.predicate(row)
+
+
+def column_key(name: str) -> Callable[[Dict[str, Any]], Any]:
+    """Index key of rows on one of their columns"""
+
+    def key(row: Dict[str, Any]) -> Any:
+        return row.get(name)
+
+    return key
+
+
+class CSVTable:
+    """Parsed copy of a CSV file, with hash indexes built on demand"""
+
+    def __init__(
+        self,
+        signature: Optional[Tuple[int, int, int]],
+        rows: List[Dict[str, Any]],
+        fieldnames: Optional[List[str]] = None,
+        record_count: int = 0,
+        columns: Optional[Dict[str, List[Any]]] = None,
+    ):
+        """
+        Parameters:
+        * signature: (inode, mtime_ns, size) of the file the rows were read from,
+          or None when the file does not exist
+        * rows: The live rows, in file order
+        * fieldnames: The header of the file
+        * record_count: The number of records in the file, live or dead
+        * columns: The live rows as typed columns, when already decoded
+        """
+        self.signature = signature
+        self.rows = rows
+        self.fieldnames = fieldnames
+        self.record_count = record_count
+        self._indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
+        self._columns = columns
+
+    @property
+    def dead_count(self) -> int:
+        """Number of superseded versions and tombstones in the file"""
+        return self.record_count - len(self.rows)
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Get the live rows as columns"""
+        if self._columns is None:
+            self._columns = {
+                name: [row.get(name) for row in self.rows]
+                for name in self.fieldnames or []
+                if name != OP_COLUMN
+            }
+        return self._columns
+
+    def index(
+        self, index_name: str, key: Callable[[Dict[str, Any]], Any]
+    ) -> Dict[Any, List[Dict[str, Any]]]:
+        """Get the index named index_name, building it with key on first use"""
+        index = self._indexes.get(index_name)
+        if index is None:
+            index = {}
+            for row in self.rows:
+                index.setdefault(key(row), []).append(row)
+            self._indexes[index_name] = index
+        return index
+
+
+def resolve_records(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Resolve the records of a log-structured file to its live rows.
+    The last version of an id wins, at the position of its first version,
+    and a tombstone removes the id. Records without id are always live.
+    """
+    live: Dict[Any, Dict[str, Any]] = {}
+    for position, record in enumerate(records):
+        operation = record.pop(OP_COLUMN, None)
+        key = record.get("id") or position
+        if operation == OP_DELETE:
+            live.pop(key, None)
+        else:
+            live[key] = record
+    return list(live.values())
 
 
 class CSVEngine:
     """Engine for CSV operations"""
 
-    def __init__(self, base_dir: str):
+    def __init__(
+        self,
+        base_dir: str,
+        log_structured: bool = False,
+        compaction_ratio: float = CSV_COMPACTION_RATIO,
+        compaction_min_dead: int = CSV_COMPACTION_MIN_DEAD,
+        background_compaction: bool = True,
+        cache_max_rows: int = CSV_CACHE_MAX_ROWS,
+    ):
+        """
+        Parameters:
+        * base_dir: The directory holding the CSV files
+        * log_structured: Append updates and deletes as new versions and
+          tombstones instead of rewriting the whole file
+        * compaction_ratio, compaction_min_dead: Thresholds on dead records
+          above which a log-structured table is compacted
+        * background_compaction: Run compactions in a background thread
+        * cache_max_rows: The number of records the parsed tables kept in
+          memory may hold, across tables
+        """
         self.base_dir = base_dir
+        self.log_structured = log_structured
+        self.compaction_ratio = compaction_ratio
+        self.compaction_min_dead = compaction_min_dead
+        self.background_compaction = background_compaction
         os.makedirs(base_dir, exist_ok=True)
+        self._tables = TableCache(cache_max_rows)
+        # Records written and dead records, by log-structured table
+        self._log_stats: Dict[str, List[int]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        # Threads holding the write locks, by table
+        self._lock_owners: Dict[str, int] = {}
+        self._compacting = set()
+        self._manifests: Dict[str, PartitionManifest] = {}
+        self.recover()
 
     def get_file_path(self, table_name: str) -> str:
         """Get the full path for a CSV file"""
         return os.path.join(self.base_dir, f"{table_name}.csv")
 
+    @property
+    def cache_stats(self) -> CacheStats:
+        """Hit, miss and eviction counters of the cache of parsed tables"""
+        return self._tables.stats
+
+    def manifest(self, table_name: str) -> PartitionManifest:
+        """Get the manifest of a table partitioned by month"""
+        if table_name not in self._manifests:
+            self._manifests[table_name] = PartitionManifest(self, table_name)
+        return self._manifests[table_name]
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+        """
+        Signature used to detect that a file changed since it was parsed.
+        The inode tells apart a file renamed over the old one.
+        """
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @contextmanager
+    def _lock(self, table_name: str) -> Iterator[None]:
+        """
+        Lock serializing the writes on a table, across threads and processes.
+        It is reentrant: only the outermost holder takes the locks.
+        """
+        if self._lock_owners.get(table_name) == threading.get_ident():
+            yield
+            return
+
+        with self._locks.setdefault(table_name, threading.Lock()):
+            with file_lock(self.get_file_path(table_name) + LOCK_SUFFIX):
+                self._lock_owners[table_name] = threading.get_ident()
+                try:
+                    self._replay(table_name)
+                    yield
+                finally:
+                    del self._lock_owners[table_name]
+
+    def _open_snapshot(
+        self, table_name: str
+    ) -> Optional[Tuple[io.BufferedReader, os.stat_result]]:
+        """
+        Open a table for reading, with the size of its committed content.
+        The size is taken under a shared lock, so no append is in progress.
+        Appends only write past it and rewrites replace the file, so the
+        first size bytes of the open file stay consistent without holding
+        the lock while reading.
+        """
+        file_path = self.get_file_path(table_name)
+        try:
+            binary_file = open(file_path, "rb")
+        except FileNotFoundError:
+            return None
+        if self._lock_owners.get(table_name) == threading.get_ident():
+            # Read by the writer itself
+            return binary_file, os.fstat(binary_file.fileno())
+        try:
+            with file_lock(file_path + LOCK_SUFFIX, exclusive=False):
+                stat = os.fstat(binary_file.fileno())
+                interrupted = os.path.exists(file_path + WAL_SUFFIX)
+        except BaseException:
+            binary_file.close()
+            raise
+        if interrupted:
+            # A writer died while appending: replay its write-ahead file first
+            binary_file.close()
+            with self._lock(table_name):
+                pass  # Taking the write lock replays the write-ahead file
+            return self._open_snapshot(table_name)
+        return binary_file, stat
+
+    def _file_signature(self, table_name: str) -> Optional[Tuple[int, int, int]]:
+        """Signature of the file of a table, None if it does not exist"""
+        try:
+            return self._signature(os.stat(self.get_file_path(table_name)))
+        except FileNotFoundError:
+            return None
+
+    def _cached_table(self, table_name: str) -> Optional[CSVTable]:
+        """Get the parsed copy of a table if it is up to date, None otherwise"""
+        return self._tables.get(table_name, self._file_signature(table_name))
+
+    def load_table(self, table_name: str) -> CSVTable:
+        """
+        Get the parsed copy of a table.
+        The file is only read again when it was replaced or changed, or
+        after the table was evicted from the cache.
+        """
+        signature = self._file_signature(table_name)
+        table = self._tables.get(table_name, signature)
+        if table is not None:
+            return table
+        if signature is None:
+            table = CSVTable(None, [])
+            self._tables.put(table_name, table)
+            return table
+
+        snapshot = self._open_snapshot(table_name)
+        if snapshot is None:
+            return self.load_table(table_name)
+        binary_file, stat = snapshot
+        with binary_file:
+            # The signature comes from the snapshot, so it is never newer
+            # than the rows
+            signature = self._signature(stat)
+            content = binary_file.read(stat.st_size).decode("utf-8")
+        reader = csv.reader(io.StringIO(content, newline=""))
+        fieldnames = next(reader, None) or []
+        columns = get_schema(table_name).decode_columns(fieldnames, reader)
+
+        records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        if OP_COLUMN in fieldnames:
+            rows = resolve_records(records)
+            columns = None
+        else:
+            rows = records
+        table = CSVTable(signature, rows, fieldnames, len(records), columns)
+        self._tables.put(table_name, table)
+        if self.log_structured:
+            self._log_stats[table_name] = [table.record_count, table.dead_count]
+        return table
+
     def read_all(self, table_name: str) -> List[Dict[str, Any]]:
         """Read all rows from a CSV file"""
+        return list(self.load_table(table_name).rows)
+
+    def read_columns(self, table_name: str) -> Dict[str, List[Any]]:
+        """Read the typed columns of a CSV file"""
+        return self.load_table(table_name).columns()
+
+    def lookup(
+        self,
+        table_name: str,
+        index_name: str,
+        key: Callable[[Dict[str, Any]], Any],
+        value: Any,
+    ) -> List[Dict[str, Any]]:
+        """Get the rows whose key is equal to value, using a hash index"""
+        return self.load_table(table_name).index(index_name, key).get(value, [])
+
+    def scan(
+        self, table_name: str, query_filter: Optional[QueryFilter] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over the rows of a table matching a filter.
+        The parsed copy of the table is scanned, narrowed by a column index
+        on the first equality of the filter, so that the reads following a
+        write parse the file once.
+        """
+        query_filter = query_filter or QueryFilter()
+        table = self.load_table(table_name)
+        rows = table.rows
+        if query_filter.equals:
+            name, value = next(iter(query_filter.equals.items()))
+            rows = table.index(f"column:{name}", column_key(name)).get(value, [])
+
+        matching = (row for row in rows if query_filter.matches(row))
+        return islice(matching, query_filter.limit)
+
+    def write_rows(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        mode: str = "a",
+        fsync: bool = False,
+    ):
+        """
+        Write rows to a CSV file.
+        Mode "a" appends new rows, mode "w" replaces the content of the file,
+        which is always synced to disk.
+        """
+        if mode == "w":
+            with self._lock(table_name):
+                self._rewrite(table_name, rows)
+        elif rows:
+            self._append(table_name, rows, dead_count=0, fsync=fsync)
+
+    def upsert_rows(self, table_name: str, rows: List[Dict[str, Any]]):
+        """Write new versions of rows, matched on their id"""
+        if not rows:
+            return
+        if self.log_structured:
+            self._append(table_name, rows, dead_count=len(rows))
+            return
+
+        updates = {row["id"]: row for row in rows}
+        with self._lock(table_name):
+            current = self.load_table(table_name).rows
+            merged = [updates.pop(row.get("id"), row) for row in current]
+            self._rewrite(table_name, merged + list(updates.values()))
+
+    def delete_rows(self, table_name: str, ids: List[str]):
+        """Delete the rows with the given ids"""
+        if not ids:
+            return
+        if self.log_structured:
+            tombstones = [{"id": id_, OP_COLUMN: OP_DELETE} for id_ in ids]
+            # Both the deleted version and its tombstone are dead records
+            self._append(table_name, tombstones, dead_count=2 * len(ids))
+            return
+
+        deleted = set(ids)
+        with self._lock(table_name):
+            current = self.load_table(table_name).rows
+            self._rewrite(
+                table_name, [row for row in current if row.get("id") not in deleted]
+            )
+
+    def compact(self, table_name: str):
+        """Rewrite a table with its live rows only"""
+        with self._lock(table_name):
+            table = self.load_table(table_name)
+            if table.signature is None or not table.dead_count:
+                return
+            self._rewrite(table_name, table.rows)
+            logger.info(
+                "Compacted %s: dropped %d dead records", table_name, table.dead_count
+            )
+
+    def _fieldnames(
+        self, rows: List[Dict[str, Any]], current: Optional[List[str]] = None
+    ) -> List[str]:
+        """Header covering the current header and the keys of rows"""
+        fieldnames = [name for name in current or [] if name != OP_COLUMN]
+        for row in rows:
+            for name in row:
+                if name != OP_COLUMN and name not in fieldnames:
+                    fieldnames.append(name)
+        if self.log_structured:
+            fieldnames.append(OP_COLUMN)
+        return fieldnames
+
+    def _append(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        dead_count: int,
+        fsync: bool = False,
+    ):
+        """Append records to a table, creating the file if needed"""
         file_path = self.get_file_path(table_name)
-        if not os.path.exists(file_path):
-            return []
+        with self._lock(table_name):
+            fieldnames = self._read_header(file_path)
+            if fieldnames is not None and (
+                set(self._fieldnames(rows, fieldnames)) - set(fieldnames)
+            ):
+                # The header misses columns: rewrite the file with a wider one
+                self._rewrite(table_name, self.load_table(table_name).rows, rows)
+                fieldnames = self._read_header(file_path)
 
-        with open(file_path, "r", newline="") as csvfile:
-            reader = csv.DictReader(csvfile)
-            return list(reader)
+            buffer = io.StringIO(newline="")
+            if fieldnames is None:
+                fieldnames = self._fieldnames(rows)
+                writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+                writer.writeheader()
+            else:
+                writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+            writer.writerows(map(get_schema(table_name).encode_row, rows))
+            self._write_ahead(table_name, buffer.getvalue().encode("utf-8"), fsync)
 
-    def write_rows(self, table_name: str, rows: List[Dict[str, Any]], mode: str = "a"):
-        """Write rows to a CSV file"""
+            self._tables.invalidate(table_name)
+            if self.log_structured:
+                self._record_appends(table_name, len(rows), dead_count)
+
+    def _write_ahead(self, table_name: str, data: bytes, fsync: bool = False):
+        """
+        Append data to a table through its write-ahead file.
+        The data is first written to the write-ahead file along with the
+        committed size of the table, then appended to the table, and the
+        write-ahead file is removed. A crash in between leaves the write-ahead
+        file behind, and the append is replayed from it.
+        """
         file_path = self.get_file_path(table_name)
-        file_exists = os.path.exists(file_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        try:
+            offset = os.path.getsize(file_path)
+        except FileNotFoundError:
+            offset = 0
+        wal_path = file_path + WAL_SUFFIX
+        with open(wal_path, "wb") as wal_file:
+            header = {"offset": offset, "length": len(data)}
+            wal_file.write(json.dumps(header).encode("utf-8") + b"\n")
+            wal_file.write(data)
+            if fsync:
+                wal_file.flush()
+                os.fsync(wal_file.fileno())
+        self._apply(file_path, offset, data, fsync)
+        os.unlink(wal_path)
 
-        with open(file_path, mode, newline="") as csvfile:
-            if rows:
-                fieldnames = list(rows[0].keys())
+    @staticmethod
+    def _apply(file_path: str, offset: int, data: bytes, fsync: bool = False):
+        """Write data at offset of a file, dropping anything past it"""
+        with open(file_path, "ab") as csvfile:
+            csvfile.truncate(offset)
+            csvfile.write(data)
+            csvfile.flush()
+            if fsync:
+                os.fsync(csvfile.fileno())
+
+    def _replay(self, table_name: str):
+        """
+        Finish an append interrupted by a crash, the write lock being held.
+        A torn write-ahead file means the table was not written yet: the
+        append is dropped.
+        """
+        file_path = self.get_file_path(table_name)
+        wal_path = file_path + WAL_SUFFIX
+        try:
+            with open(wal_path, "rb") as wal_file:
+                header_line = wal_file.readline()
+                data = wal_file.read()
+        except FileNotFoundError:
+            return
+
+        try:
+            header = json.loads(header_line)
+        except ValueError:
+            header = None
+        if header is not None and len(data) == header["length"]:
+            logger.warning("Replaying an interrupted append to %s", table_name)
+            self._apply(file_path, header["offset"], data, fsync=True)
+        else:
+            logger.warning("Dropping a torn append to %s", table_name)
+            if header is not None and os.path.exists(file_path):
+                self._apply(file_path, header["offset"], b"", fsync=True)
+        os.unlink(wal_path)
+        self._tables.invalidate(table_name)
+        self._log_stats.pop(table_name, None)
+
+    def recover(self):
+        """Replay the appends interrupted by a crash, in every table"""
+        for directory, _, file_names in os.walk(self.base_dir):
+            for file_name in file_names:
+                if not file_name.endswith(".csv" + WAL_SUFFIX):
+                    continue
+                path = os.path.join(directory, file_name)
+                table_name = os.path.relpath(path, self.base_dir)[
+                    : -len(".csv" + WAL_SUFFIX)
+                ].replace(os.sep, "/")
+                with self._lock(table_name):
+                    pass  # Taking the write lock replays the write-ahead file
+
+    def _record_appends(self, table_name: str, record_count: int, dead_count: int):
+        """Track dead records of a table and compact it past the thresholds"""
+        stats = self._log_stats.get(table_name)
+        if stats is None:
+            table = self.load_table(table_name)
+            stats = self._log_stats[table_name] = [
+                table.record_count,
+                table.dead_count,
+            ]
+        else:
+            stats[0] += record_count
+            stats[1] += dead_count
+
+        records, dead = stats
+        if dead < self.compaction_min_dead or dead < self.compaction_ratio * records:
+            return
+        if not self.background_compaction:
+            self.compact(table_name)
+        elif table_name not in self._compacting:
+            self._compacting.add(table_name)
+            threading.Thread(
+                target=self._compact_in_background, args=(table_name,), daemon=True
+            ).start()
+
+    def _compact_in_background(self, table_name: str):
+        """Compaction thread body"""
+        try:
+            self.compact(table_name)
+        except OSError as error:
+            logger.error("Compaction of %s failed: %s", table_name, error)
+        finally:
+            self._compacting.discard(table_name)
+
+    def _rewrite(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        extra_rows: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """
+        Atomically replace the content of a table with rows.
+        The new file is written aside and renamed over the old one, so a
+        crash never leaves a torn table behind.
+        """
+        file_path = self.get_file_path(table_name)
+        fieldnames = self._fieldnames(
+            rows + (extra_rows or []), self._read_header(file_path)
+        )
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".csv.tmp")
+        try:
+            with os.fdopen(fd, "w", newline="") as csvfile:
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(map(get_schema(table_name).encode_row, rows))
+                csvfile.flush()
+                os.fsync(csvfile.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
 
-                if not file_exists or mode == "w":
-                    writer.writeheader()
+        self._tables.invalidate(table_name)
+        if self.log_structured:
+            self._log_stats[table_name] = [len(rows), 0]
 
-                writer.writerows(rows)
+    @staticmethod
+    def _read_header(file_path: str) -> Optional[List[str]]:
+        """Read the header of a CSV file, None if it does not exist or is empty"""
+        try:
+            with open(file_path, "r", newline="") as csvfile:
+                return next(csv.reader(csvfile), None)
+        except FileNotFoundError:
+            return None
+
+
+@dataclass
+class FlushStats:
+    """Counters of the rows flushed by a session in group-commit mode"""
+
+    rows: int = 0
+    flushes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Write throughput of the flushes"""
+        return self.rows / self.seconds if self.seconds else 0.0
 
 
 class CSVSession:
     """Session for CSV operations"""
 
-    def __init__(self, engine: CSVEngine, autocommit=False, autoflush=False):
+    def __init__(
+        self,
+        engine: CSVEngine,
+        autocommit=False,
+        autoflush=False,
+        group_commit=False,
+        group_commit_size=CSV_GROUP_COMMIT_SIZE,
+        group_commit_interval=CSV_GROUP_COMMIT_INTERVAL,
+        fsync=CSV_FSYNC,
+    ):
+        """
+        Parameters:
+        * engine: The CSV engine
+        * autocommit: Commit after every add
+        * autoflush: Flush committed rows before queries, so they are visible
+        * group_commit: Buffer committed rows and write them in batches of
+          group_commit_size rows, or once group_commit_interval seconds passed
+          since the oldest buffered commit. Buffered rows are flushed on close.
+        * fsync: Sync the files to disk after every write
+        """
         self.engine = engine
+        # Hooks called with the table name, the rows and the session once
+        # rows are written to a table
+        self._write_hooks: Dict[str, Callable[..., None]] = {}
         self._pending_writes: Dict[str, List[Dict[str, Any]]] = {}
         self._pending_deletes: Dict[str, List[int]] = {}
         self._autocommit = autocommit
+        self._autoflush = autoflush
+        self._group_commit = group_commit
+        self._group_commit_size = group_commit_size
+        self._group_commit_interval = group_commit_interval
+        self._fsync = fsync
+        self._committed_writes: Dict[str, List[Dict[str, Any]]] = {}
+        self._committed_count = 0
+        self._first_commit_time: Optional[float] = None
+        self.flush_stats = FlushStats()
 
-    def add(self, table_name: str, data: Dict[str, Any]):
-        """Add a row to be written during commit"""
+    def add(
+        self,
+        table_name: str,
+        data: Dict[str, Any],
+        on_written: Optional[Callable[..., None]] = None,
+    ):
+        """
+        Add a row to be written during commit. on_written is called with the
+        table name, the rows and the session once they are written.
+        """
+        if on_written is not None:
+            self._write_hooks[table_name] = on_written
         if table_name not in self._pending_writes:
             self._pending_writes[table_name] = []
 
@@ -69,16 +703,137 @@ class CSVSession:
         if self._autocommit:
             self.commit()
 
-    def query(self, table_name: str) -> List[Dict[str, Any]]:
-        """Query all rows from a table"""
-        return self.engine.read_all(table_name)
+    def add_all(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        on_written: Optional[Callable[..., None]] = None,
+    ):
+        """Add rows to be written during commit, as add does"""
+        if on_written is not None:
+            self._write_hooks[table_name] = on_written
+        self._pending_writes.setdefault(table_name, []).extend(rows)
+
+        if self._autocommit:
+            self.commit()
+
+    def query(
+        self, table_name: str, query_filter: Optional[QueryFilter] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily query the rows of a table, all of them or those matching a filter"""
+        if self._autoflush:
+            self.flush()
+        return self.engine.scan(table_name, query_filter)
+
+    def lookup(
+        self,
+        table_name: str,
+        index_name: str,
+        key: Callable[[Dict[str, Any]], Any],
+        value: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the rows of a table matching value on an indexed key, including
+        the rows of the session not written yet
+        """
+        if self._autoflush:
+            self.flush()
+        rows = self.engine.lookup(table_name, index_name, key, value)
+        buffered = [row for row in self._buffered(table_name) if key(row) == value]
+        return rows + buffered if buffered else rows
+
+    def upsert_rows(self, table_name: str, rows: List[Dict[str, Any]]):
+        """
+        Write new versions of rows, matched on their id. Rows of the session
+        not written yet are replaced in place, the others in the file.
+        """
+        stored = self._replace_buffered(table_name, {row["id"]: row for row in rows})
+        self.engine.upsert_rows(table_name, list(stored.values()))
+
+    def delete_rows(self, table_name: str, ids: List[str]):
+        """Delete the rows with the given ids, written or not"""
+        deleted = set(ids)
+        for buffer in (self._committed_writes, self._pending_writes):
+            if table_name in buffer:
+                buffer[table_name] = [
+                    row for row in buffer[table_name] if row.get("id") not in deleted
+                ]
+        self._committed_count = sum(map(len, self._committed_writes.values()))
+        self.engine.delete_rows(table_name, ids)
+
+    def _buffered(self, table_name: str) -> List[Dict[str, Any]]:
+        """Rows of a table added or committed by the session, not written yet"""
+        return self._committed_writes.get(table_name, []) + self._pending_writes.get(
+            table_name, []
+        )
+
+    def _replace_buffered(
+        self, table_name: str, rows: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Replace the buffered rows of the ids of rows, return the other rows"""
+        rows = dict(rows)
+        for buffer in (self._committed_writes, self._pending_writes):
+            buffer_rows = buffer.get(table_name, [])
+            for position, row in enumerate(buffer_rows):
+                if row.get("id") in rows:
+                    buffer_rows[position] = rows.pop(row["id"])
+        return rows
 
     def commit(self):
         """Commit pending changes to CSV files"""
+        if not self._group_commit:
+            pending_writes, self._pending_writes = self._pending_writes, {}
+            for table_name, rows in pending_writes.items():
+                if rows:
+                    self.engine.write_rows(table_name, rows, fsync=self._fsync)
+                    self._written(table_name, rows)
+            return
+
         for table_name, rows in self._pending_writes.items():
-            if rows:
-                self.engine.write_rows(table_name, rows)
+            self._committed_writes.setdefault(table_name, []).extend(rows)
+            self._committed_count += len(rows)
         self._pending_writes = {}
+        if self._first_commit_time is None:
+            self._first_commit_time = time.monotonic()
+
+        if (
+            self._committed_count >= self._group_commit_size
+            or time.monotonic() - self._first_commit_time >= self._group_commit_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write the rows buffered by group commits, one batch per table"""
+        if not self._committed_count:
+            return
+
+        start = time.perf_counter()
+        for table_name, rows in self._committed_writes.items():
+            if rows:
+                self.engine.write_rows(table_name, rows, fsync=self._fsync)
+        elapsed = time.perf_counter() - start
+
+        self.flush_stats.rows += self._committed_count
+        self.flush_stats.flushes += 1
+        self.flush_stats.seconds += elapsed
+        logger.info(
+            "Flushed %d rows in %.3fs (%.0f rows/s)",
+            self._committed_count,
+            elapsed,
+            self._committed_count / elapsed if elapsed else 0.0,
+        )
+        committed_writes, self._committed_writes = self._committed_writes, {}
+        self._committed_count = 0
+        self._first_commit_time = None
+        for table_name, rows in committed_writes.items():
+            if rows:
+                self._written(table_name, rows)
+
+    def _written(self, table_name: str, rows: List[Dict[str, Any]]):
+        """Call the hook of a table once rows were written to it"""
+        hook = self._write_hooks.get(table_name)
+        if hook is not None:
+            hook(table_name, rows, self)
 
     def rollback(self):
         """Discard pending changes"""
@@ -86,24 +841,31 @@ class CSVSession:
 
     def close(self):
         """Close the session"""
+        self.flush()
         self.rollback()
 
 
 # Create the engine
-engine = CSVEngine(CSV_BASE_DIR)
+engine = CSVEngine(CSV_BASE_DIR, log_structured=CSV_LOG_STRUCTURED)
 
 # Create a session factory similar to SQLAlchemy's sessionmaker
 class CSVSessionMaker:
-    def __init__(self, autocommit=False, autoflush=False, bind=None):
+    def __init__(self, autocommit=False, autoflush=False, bind=None, **options):
         self.autocommit = autocommit
         self.autoflush = autoflush
         self.bind = bind
+        self.options = options
 
     def __call__(self):
         return CSVSession(
-            self.bind, autocommit=self.autocommit, autoflush=self.autoflush
+            self.bind,
+            autocommit=self.autocommit,
+            autoflush=self.autoflush,
+            **self.options,
         )
 
 
 # Create SessionLocal similar to the PostgreSQL version
-SessionLocal = CSVSessionMaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = CSVSessionMaker(
+    autocommit=False, autoflush=False, bind=engine, group_commit=CSV_GROUP_COMMIT
+)
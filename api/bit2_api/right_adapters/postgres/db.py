@@ -1,10 +1,11 @@
 """
 Module used to get db session
 """
+from typing import Any, Dict
 
 from bit2_api.core.ports.database_client_repository import IDatabaseClientRepository
 
-from .session import SessionLocal
+from .session import SessionLocal, engine, pool_metrics
 
 
 class DatabaseClient(IDatabaseClientRepository):
@@ -14,9 +15,14 @@ class DatabaseClient(IDatabaseClientRepository):
 
     def get_db_session(self) -> SessionLocal:
         """
-        Main function
+        Main function.
+        The session checks a connection out of the pool when its first
+        statement runs, and holds it until it is closed.
         """
         db_session = SessionLocal()
         db_session.current_user_id = None
-        with db_session:
-            return db_session
+        return db_session
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get the metrics of the connection pool"""
+        return pool_metrics.to_dict(engine)
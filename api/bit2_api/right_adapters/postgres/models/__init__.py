@@ -1,2 +1,3 @@
 from .base_model import *
 from .game_result import *
+from .number_statistic import *
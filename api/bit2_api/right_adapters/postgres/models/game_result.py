@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, Integer, Text
+from sqlalchemy import Column, Date, Index, Integer, Text
 from sqlalchemy.dialects.postgresql import ARRAY
 
 from .base_model import BaseModel
@@ -14,4 +14,12 @@ class GameResult(BaseModel):
     numbers = Column(ARRAY(Integer), nullable=False)
     bonus = Column(Integer, nullable=True)
     type = Column(Text, nullable=False)
-    __table_args__ = ({"schema": "game"},)
+    __table_args__ = (
+        # A single result per game and draw date, also used by upserts
+        Index("ix_game_result_type_draw_date", "type", "draw_date", unique=True),
+        # Lookups by draw date and pages in (draw date, type) order
+        Index("ix_game_result_draw_date_type", "draw_date", "type"),
+        # Searches of results by their numbers
+        Index("ix_game_result_numbers", "numbers", postgresql_using="gin"),
+        {"schema": "game"},
+    )
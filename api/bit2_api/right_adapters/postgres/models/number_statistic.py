@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Date, Index, Integer, Text
+
+from .base_model import Base
+
+
+class NumberStatistic(Base):
+    """
+    Draw count and last draw date of a number, per game type.
+    Maintained by a trigger on the game results.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    __tablename__ = "number_statistic"
+    type = Column(Text, primary_key=True)
+    number = Column(Integer, primary_key=True)
+    draw_count = Column(Integer, nullable=False)
+    last_draw_date = Column(Date, nullable=False)
+    __table_args__ = ({"schema": "game"},)
+
+
+class NumberPairStatistic(Base):
+    """
+    Count of the draws of a game type containing two numbers, the first one
+    being the lowest. Maintained by a trigger on the game results.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    __tablename__ = "number_pair_statistic"
+    type = Column(Text, primary_key=True)
+    first_number = Column(Integer, primary_key=True)
+    second_number = Column(Integer, primary_key=True)
+    draw_count = Column(Integer, nullable=False)
+    __table_args__ = (
+        # Most frequent pairs of a game type
+        Index("ix_number_pair_statistic_type_draw_count", "type", "draw_count"),
+        {"schema": "game"},
+    )
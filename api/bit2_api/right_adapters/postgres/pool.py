@@ -0,0 +1,73 @@
+"""
+Metrics of the connection pool of an engine
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Type, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+# Key of the session info holding the time it started waiting for a connection
+WAIT_START = "pool_wait_start"
+
+
+@dataclass
+class PoolMetrics:
+    """Counters of the connections checked out of a pool"""
+
+    checkouts: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    # Time spent by sessions waiting for a connection
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def listen(
+        self, engine: Engine, session_factory: Union[sessionmaker, Type[Session]]
+    ):
+        """
+        Count the events of the pool of engine, and time the wait of the
+        sessions of session_factory, or of a session class, for a connection. Sessions only check a
+        connection out when their first statement runs.
+        """
+        event.listen(engine, "checkout", lambda *_: self._increment("checkouts"))
+        event.listen(engine, "connect", lambda *_: self._increment("connects"))
+        event.listen(engine, "invalidate", lambda *_: self._increment("invalidations"))
+        event.listen(session_factory, "after_transaction_create", self._wait_started)
+        event.listen(session_factory, "after_begin", self._wait_ended)
+
+    @staticmethod
+    def _wait_started(db_session: Session, transaction):
+        """Note when a transaction, which will need a connection, starts"""
+        if transaction.parent is None:
+            db_session.info[WAIT_START] = time.perf_counter()
+
+    def _wait_ended(self, db_session: Session, _transaction, _connection):
+        """Time the wait of a transaction for its connection"""
+        start = db_session.info.pop(WAIT_START, None)
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def to_dict(self, engine: Engine) -> Dict[str, Any]:
+        """The counters along with the state of the pool of engine"""
+        with self._lock:
+            metrics = asdict(self)
+        pool = engine.pool
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                metrics[name] = getattr(pool, name)()
+        return metrics
+
+    def _increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
@@ -0,0 +1,75 @@
+"""
+Check of the plans of the game result queries, which must use the indexes
+"""
+import json
+from datetime import date
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.right_adapters.postgres.repositories import STREAM_BATCH_SIZE
+from bit2_api.right_adapters.postgres.repositories.game_result_statements import (
+    select_all,
+    select_by_draw_date,
+    select_by_draw_date_and_type,
+    select_by_type,
+    select_containing,
+    select_latest,
+    select_page,
+    select_range,
+)
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Iterate over a plan node and all its children"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(statement: Select, db_session: Session) -> Dict[str, Any]:
+    """Get the plan of a statement, with sequential scans disabled"""
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    # Seq scans are only planned when no index can serve the query, whatever
+    # the size of the table
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    result = db_session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def repository_statements() -> Dict[str, Select]:
+    """The statements of the game result repositories, by name"""
+    draw_date = date(2025, 3, 1)
+    game_type = GameTypeEnum.STAR_11H
+    return {
+        "get_by_draw_date": select_by_draw_date(draw_date),
+        "iter_all": select_all(STREAM_BATCH_SIZE),
+        "get_by_type": select_by_type(game_type),
+        "delete": select_by_draw_date_and_type(draw_date, game_type),
+        "get_range": select_range(game_type, draw_date, date(2025, 3, 31)),
+        "get_latest": select_latest(game_type, 100),
+        "get_page": select_page((draw_date, game_type), 100),
+        "find_containing": select_containing([17, 42]),
+    }
+
+
+def sequential_scans(db_session: Session) -> Dict[str, List[str]]:
+    """Names of the repository statements reading a table sequentially"""
+    scans = {}
+    for name, statement in repository_statements().items():
+        tables = [
+            node["Relation Name"]
+            for node in plan_nodes(explain(statement, db_session))
+            if node["Node Type"] == "Seq Scan"
+        ]
+        if tables:
+            scans[name] = tables
+    db_session.rollback()
+    return scans
@@ -3,7 +3,7 @@ Generic abstract CRUD
 """
 
 from abc import ABC
-from typing import Generic, Type, TypeVar
+from typing import Generic, Iterator, Type, TypeVar
 from uuid import UUID, uuid4
 
 from sqlalchemy.orm import Session
@@ -13,6 +13,9 @@ from bit2_api.right_adapters.postgres.models.base_model import BaseModel
 # pylint: disable=invalid-name
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# Rows fetched at once from the server-side cursor of streamed queries
+STREAM_BATCH_SIZE = 1000
+
 
 class BaseRepository(Generic[ModelType], ABC):
     """
@@ -38,6 +41,16 @@ class BaseRepository(Generic[ModelType], ABC):
         """
         return [self.to_model(item) for item in db_session.query(self.model).all()]
 
+    def iter_all(self, db_session: Session, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Get all method, streamed.
+        Rows are fetched batch_size at a time from a server-side cursor and
+        converted as they are iterated, so only a batch is held in memory.
+        """
+        query = db_session.query(self.model).execution_options(yield_per=batch_size)
+        for item in query:
+            yield self.to_model(item)
+
     def get_by_id(self, item_id: UUID, db_session: Session):
         """
         Get by ID method
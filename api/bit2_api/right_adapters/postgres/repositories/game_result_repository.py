@@ -1,15 +1,82 @@
 # pylint: disable=arguments-renamed
+import logging
 from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
 from bit2_api.core.domains.commands import ExtractGameResultCommand
 from bit2_api.core.domains.models import GameResult as GameResultModel
-from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.domains.utils.enums import GameTypeEnum, normalize_type
 from bit2_api.core.ports import IGameResultRepository
 from bit2_api.core.ports.session import ISession
 from bit2_api.right_adapters.postgres.models import GameResult
 
-from .base_repository import BaseRepository
+from .base_repository import STREAM_BATCH_SIZE, BaseRepository
+from .game_result_statements import (
+    select_all,
+    select_by_draw_date,
+    select_by_draw_date_and_type,
+    select_by_type,
+    select_containing,
+    select_latest,
+    select_page,
+    select_range,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement, within the limit of parameters of a query
+UPSERT_BATCH_SIZE = 5000
+
+
+def upsert_rows(commands: List[ExtractGameResultCommand]) -> List[Dict[str, Any]]:
+    """
+    Rows of the game results of commands, a single one per game and draw
+    date. Results of unknown game types are skipped.
+    """
+    values = {}
+    for command in commands:
+        game_type = normalize_type(command.type)
+        if game_type is None:
+            logger.warning("Skipping a result of unknown game type %s", command.type)
+            continue
+        game_type = game_type.value
+        draw_date = command.draw_date
+        if isinstance(draw_date, datetime):
+            draw_date = draw_date.date()
+        # A statement may not update a row twice: the last result wins
+        values[(game_type, draw_date)] = {
+            "id": uuid4(),
+            "draw_date": draw_date,
+            "numbers": command.numbers,
+            "bonus": command.bonus,
+            "type": game_type,
+        }
+    return list(values.values())
+
+
+def upsert_statement(values: List[Dict[str, Any]]):
+    """
+    Statement inserting game results, or updating the numbers and bonus of
+    the ones already stored for the same game and draw date. Rows whose
+    numbers and bonus did not change are left untouched.
+    """
+    statement = insert(GameResult).values(values)
+    return statement.on_conflict_do_update(
+        index_elements=[GameResult.type, GameResult.draw_date],
+        set_={
+            "numbers": statement.excluded.numbers,
+            "bonus": statement.excluded.bonus,
+            "updated_at": func.now(),
+        },
+        where=tuple_(GameResult.numbers, GameResult.bonus).is_distinct_from(
+            tuple_(statement.excluded.numbers, statement.excluded.bonus)
+        ),
+    )
 
 
 class GameResultRepository(BaseRepository[GameResult], IGameResultRepository):
@@ -20,22 +87,14 @@ class GameResultRepository(BaseRepository[GameResult], IGameResultRepository):
 
     def get_by_draw_date(self, draw_date: datetime, db_session: ISession):
         """Get a game result by its draw date"""
-        result = (
-            db_session.query(GameResult)
-            .filter(GameResult.draw_date == draw_date)
-            .first()
-        )
+        result = db_session.scalars(select_by_draw_date(draw_date).limit(1)).first()
         if result:
             return self.to_model(result)
         return None
 
     def get_by_type(self, game_type: GameTypeEnum, db_session: ISession):
         """Get game results by game type"""
-        results = (
-            db_session.query(GameResult)
-            .filter(GameResult.type == game_type.value)
-            .all()
-        )
+        results = db_session.scalars(select_by_type(game_type)).all()
         return [self.to_model(result) for result in results]
 
     def get_all(self, db_session: ISession):
@@ -43,6 +102,80 @@ class GameResultRepository(BaseRepository[GameResult], IGameResultRepository):
         results = db_session.query(GameResult).all()
         return [self.to_model(result) for result in results]
 
+    def iter_all(self, db_session: ISession, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Iterate over all game results in (draw date, type) order, holding a
+        single batch of rows in memory
+        """
+        for result in db_session.scalars(select_all(batch_size)):
+            yield self.to_model(result)
+
+    @staticmethod
+    def iter_column_batches(
+        db_session: ISession, batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[Dict[str, List[Any]]]:
+        """
+        Iterate over all game results in (draw date, type) order, as batches of
+        columns. The rows are read without building ORM objects.
+        """
+        statement = (
+            select(
+                GameResult.draw_date,
+                GameResult.numbers,
+                GameResult.bonus,
+                GameResult.type,
+            )
+            .order_by(GameResult.draw_date, GameResult.type)
+            .execution_options(stream_results=True, max_row_buffer=batch_size)
+        )
+        for rows in db_session.execute(statement).partitions(batch_size):
+            draw_dates, numbers, bonuses, types = zip(*rows)
+            yield {
+                "draw_date": list(draw_dates),
+                "numbers": list(numbers),
+                "bonus": list(bonuses),
+                "type": list(types),
+            }
+
+    def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: ISession,
+    ):
+        """Get the game results of a game type drawn between start and end"""
+        results = db_session.scalars(select_range(game_type, start, end)).all()
+        return [self.to_model(result) for result in results]
+
+    def get_latest(self, game_type: GameTypeEnum, count: int, db_session: ISession):
+        """Get the last count game results of a game type, latest first"""
+        results = db_session.scalars(select_latest(game_type, count)).all()
+        return [self.to_model(result) for result in results]
+
+    def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: ISession,
+    ):
+        """Get the game results following after in (draw date, type) order"""
+        results = db_session.scalars(select_page(after, limit)).all()
+        return [self.to_model(result) for result in results]
+
+    def find_containing(
+        self,
+        numbers: List[int],
+        db_session: ISession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ):
+        """Get the game results whose draw contained all the numbers"""
+        results = db_session.scalars(
+            select_containing(numbers, game_type, date_range)
+        ).all()
+        return [self.to_model(result) for result in results]
+
     def create(self, command: ExtractGameResultCommand, db_session: ISession):
         """Create a game result"""
         game_result = GameResult(
@@ -56,17 +189,36 @@ class GameResultRepository(BaseRepository[GameResult], IGameResultRepository):
         db_session.flush()
         return self.to_model(game_result)
 
+    def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: ISession
+    ):
+        """
+        Create game results, or update the ones already stored for the same
+        draw date and game type, with one INSERT ... ON CONFLICT statement
+        per batch of rows
+        """
+        rows = upsert_rows(commands)
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            db_session.execute(
+                upsert_statement(rows[start : start + UPSERT_BATCH_SIZE])
+            )
+        return [
+            GameResultModel(
+                draw_date=row["draw_date"],
+                numbers=row["numbers"],
+                bonus=row["bonus"],
+                type=GameTypeEnum(row["type"]),
+            )
+            for row in rows
+        ]
+
     def delete(
         self, draw_date: datetime, game_type: GameTypeEnum, db_session: ISession
     ):
         """Delete a game result"""
-        game_result = (
-            db_session.query(GameResult)
-            .filter(
-                GameResult.draw_date == draw_date, GameResult.type == game_type.value
-            )
-            .first()
-        )
+        game_result = db_session.scalars(
+            select_by_draw_date_and_type(draw_date, game_type)
+        ).first()
         if game_result:
             db_session.delete(game_result)
             db_session.flush()
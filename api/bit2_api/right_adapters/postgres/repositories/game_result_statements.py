@@ -0,0 +1,98 @@
+"""
+Statements selecting the game results, run by the synchronous and the
+asynchronous repositories and checked against the indexes by query_plans
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, Select, select, tuple_
+from sqlalchemy.dialects.postgresql import array
+
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.right_adapters.postgres.models import GameResult
+
+
+def select_by_draw_date(draw_date: datetime) -> Select:
+    """Statement selecting the game results of a draw date"""
+    return select(GameResult).where(GameResult.draw_date == draw_date)
+
+
+def select_all(batch_size: int) -> Select:
+    """
+    Statement selecting all the game results in (draw date, type) order,
+    streamed batch_size rows at a time from a server-side cursor
+    """
+    return (
+        select(GameResult)
+        .order_by(GameResult.draw_date, GameResult.type)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def select_by_type(game_type: GameTypeEnum) -> Select:
+    """Statement selecting the game results of a game type"""
+    return select(GameResult).where(GameResult.type == game_type.value)
+
+
+def select_by_draw_date_and_type(
+    draw_date: datetime, game_type: GameTypeEnum
+) -> Select:
+    """Statement selecting the game result of a draw date and game type"""
+    return select(GameResult).where(
+        GameResult.draw_date == draw_date, GameResult.type == game_type.value
+    )
+
+
+def select_range(game_type: GameTypeEnum, start: datetime, end: datetime) -> Select:
+    """Statement selecting the game results of a game type between start and end"""
+    return (
+        select(GameResult)
+        .where(
+            GameResult.type == game_type.value,
+            GameResult.draw_date.between(start, end),
+        )
+        .order_by(GameResult.draw_date)
+    )
+
+
+def select_latest(game_type: GameTypeEnum, count: int) -> Select:
+    """Statement selecting the last count game results of a game type"""
+    return (
+        select(GameResult)
+        .where(GameResult.type == game_type.value)
+        .order_by(GameResult.draw_date.desc())
+        .limit(count)
+    )
+
+
+def select_page(after: Optional[Tuple[datetime, GameTypeEnum]], limit: int) -> Select:
+    """Statement selecting the game results following after"""
+    statement = select(GameResult)
+    if after is not None:
+        draw_date, game_type = after
+        statement = statement.where(
+            tuple_(GameResult.draw_date, GameResult.type)
+            > tuple_(draw_date, GameTypeEnum(game_type).value)
+        )
+    return statement.order_by(GameResult.draw_date, GameResult.type).limit(limit)
+
+
+def select_containing(
+    numbers: List[int],
+    game_type: Optional[GameTypeEnum] = None,
+    date_range: Optional[Tuple[datetime, datetime]] = None,
+) -> Select:
+    """
+    Statement selecting the game results whose draw contained all the
+    numbers. The containment is looked up in the GIN index of the numbers.
+    """
+    statement = select(GameResult).where(
+        GameResult.numbers.contains(
+            array([int(number) for number in numbers], type_=Integer)
+        )
+    )
+    if game_type is not None:
+        statement = statement.where(GameResult.type == GameTypeEnum(game_type).value)
+    if date_range is not None:
+        statement = statement.where(GameResult.draw_date.between(*date_range))
+    return statement.order_by(GameResult.draw_date, GameResult.type)
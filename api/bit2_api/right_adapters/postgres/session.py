@@ -6,7 +6,30 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from bit2_api.core.domains.utils import get_env_variable
+from bit2_api.right_adapters.postgres.pool import PoolMetrics
 
 SQLALCHEMY_DATABASE_URL = get_env_variable("DATABASE_URL")
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Connections kept open, and opened on top of them under load
+POSTGRES_POOL_SIZE = int(get_env_variable("POSTGRES_POOL_SIZE", default="5"))
+POSTGRES_MAX_OVERFLOW = int(get_env_variable("POSTGRES_MAX_OVERFLOW", default="10"))
+# Seconds to wait for a connection before failing
+POSTGRES_POOL_TIMEOUT = float(get_env_variable("POSTGRES_POOL_TIMEOUT", default="30"))
+# Seconds after which a connection is replaced
+POSTGRES_POOL_RECYCLE = int(get_env_variable("POSTGRES_POOL_RECYCLE", default="1800"))
+# Test connections before using them, to replace the ones dropped by the server
+POSTGRES_POOL_PRE_PING = (
+    get_env_variable("POSTGRES_POOL_PRE_PING", default="true") == "true"
+)
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_size=POSTGRES_POOL_SIZE,
+    max_overflow=POSTGRES_MAX_OVERFLOW,
+    pool_timeout=POSTGRES_POOL_TIMEOUT,
+    pool_recycle=POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=POSTGRES_POOL_PRE_PING,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+pool_metrics = PoolMetrics()
+pool_metrics.listen(engine, SessionLocal)
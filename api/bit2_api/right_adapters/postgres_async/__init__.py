@@ -0,0 +1 @@
+from .repositories import *
@@ -0,0 +1,35 @@
+"""
+Module used to get asynchronous db session
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bit2_api.core.ports.database_client_repository import (
+    IAsyncDatabaseClientRepository,
+)
+
+from .session import get_engine, get_session_factory, pool_metrics
+
+
+class AsyncDatabaseClient(IAsyncDatabaseClientRepository):
+    """
+    Class used to get asynchronous db session.
+    The engine is created with the first client.
+    """
+
+    def __init__(self):
+        self.engine = get_engine()
+        self.session_factory = get_session_factory()
+
+    def get_db_session(self) -> AsyncSession:
+        """
+        Main function.
+        The session checks a connection of the pool out on its first query.
+        """
+        return self.session_factory()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get the metrics of the connection pool"""
+        return pool_metrics.to_dict(self.engine.sync_engine)
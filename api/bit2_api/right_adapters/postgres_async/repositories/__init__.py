@@ -0,0 +1,6 @@
+"""
+Module for asynchronous db cruds
+"""
+
+from .game_result_repository import *
+from .game_statistics_repository import *
@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Select, select
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.ports import IAsyncGameResultRepository
+from bit2_api.core.ports.session import IAsyncSession
+from bit2_api.right_adapters.postgres.models import GameResult
+from bit2_api.right_adapters.postgres.repositories.game_result_repository import (
+    UPSERT_BATCH_SIZE,
+    GameResultRepository,
+    upsert_rows,
+    upsert_statement,
+)
+from bit2_api.right_adapters.postgres.repositories.game_result_statements import (
+    select_by_draw_date,
+    select_by_draw_date_and_type,
+    select_by_type,
+    select_containing,
+    select_latest,
+    select_page,
+    select_range,
+)
+
+
+class AsyncGameResultRepository(IAsyncGameResultRepository):
+    """
+    Repository for game results in PostgreSQL, on an asynchronous session.
+    It runs the statements of GameResultRepository, which serve the same indexes.
+    """
+
+    async def get_by_draw_date(self, draw_date: datetime, db_session: IAsyncSession):
+        """Get a game result by its draw date"""
+        results = await db_session.scalars(select_by_draw_date(draw_date).limit(1))
+        result = results.first()
+        if result:
+            return self.to_model(result)
+        return None
+
+    async def get_by_type(self, game_type: GameTypeEnum, db_session: IAsyncSession):
+        """Get game results by game type"""
+        return await self._get_models(select_by_type(game_type), db_session)
+
+    async def get_all(self, db_session: IAsyncSession):
+        """Get all game results"""
+        return await self._get_models(select(GameResult), db_session)
+
+    async def get_range(
+        self,
+        game_type: GameTypeEnum,
+        start: datetime,
+        end: datetime,
+        db_session: IAsyncSession,
+    ):
+        """Get the game results of a game type drawn between start and end"""
+        return await self._get_models(select_range(game_type, start, end), db_session)
+
+    async def get_latest(
+        self, game_type: GameTypeEnum, count: int, db_session: IAsyncSession
+    ):
+        """Get the last count game results of a game type, latest first"""
+        return await self._get_models(select_latest(game_type, count), db_session)
+
+    async def get_page(
+        self,
+        after: Optional[Tuple[datetime, GameTypeEnum]],
+        limit: int,
+        db_session: IAsyncSession,
+    ):
+        """Get the game results following after in (draw date, type) order"""
+        return await self._get_models(select_page(after, limit), db_session)
+
+    async def find_containing(
+        self,
+        numbers: List[int],
+        db_session: IAsyncSession,
+        game_type: Optional[GameTypeEnum] = None,
+        date_range: Optional[Tuple[datetime, datetime]] = None,
+    ):
+        """Get the game results whose draw contained all the numbers"""
+        return await self._get_models(
+            select_containing(numbers, game_type, date_range), db_session
+        )
+
+    async def create(
+        self, command: ExtractGameResultCommand, db_session: IAsyncSession
+    ):
+        """Create a game result"""
+        rows = upsert_rows([command])
+        if not rows:
+            raise ValueError(f"Unknown game type: {command.type}")
+        game_result = GameResult(**rows[0])
+        db_session.add(game_result)
+        await db_session.flush()
+        return self.to_model(game_result)
+
+    async def upsert_many(
+        self, commands: List[ExtractGameResultCommand], db_session: IAsyncSession
+    ):
+        """
+        Create game results, or update the ones already stored for the same
+        draw date and game type, with one INSERT ... ON CONFLICT statement
+        per batch of rows
+        """
+        rows = upsert_rows(commands)
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            await db_session.execute(
+                upsert_statement(rows[start : start + UPSERT_BATCH_SIZE])
+            )
+        return [self.to_model(GameResult(**row)) for row in rows]
+
+    async def delete(
+        self, draw_date: datetime, game_type: GameTypeEnum, db_session: IAsyncSession
+    ):
+        """Delete a game result"""
+        results = await db_session.scalars(
+            select_by_draw_date_and_type(draw_date, game_type)
+        )
+        game_result = results.first()
+        if game_result:
+            await db_session.delete(game_result)
+            await db_session.flush()
+
+    async def _get_models(self, statement: Select, db_session: IAsyncSession):
+        results = await db_session.scalars(statement)
+        return [self.to_model(result) for result in results.all()]
+
+    @staticmethod
+    def to_model(db_model):
+        """Convert database model to domain model"""
+        return GameResultRepository.to_model(db_model)
@@ -0,0 +1,75 @@
+from sqlalchemy import Select, select, text
+
+from bit2_api.core.domains.models import NumberPairStatistic as NumberPairStatisticModel
+from bit2_api.core.domains.models import NumberStatistic as NumberStatisticModel
+from bit2_api.core.domains.utils.enums import GameTypeEnum
+from bit2_api.core.ports import IAsyncGameStatisticsRepository
+from bit2_api.core.ports.session import IAsyncSession
+from bit2_api.right_adapters.postgres.models import NumberPairStatistic, NumberStatistic
+
+
+class AsyncGameStatisticsRepository(IAsyncGameStatisticsRepository):
+    """
+    Repository for the statistics of the drawn numbers in PostgreSQL, on an
+    asynchronous session. The statistics tables are maintained by a trigger on
+    the game results, so reads only go through a few pre-aggregated rows.
+    """
+
+    @staticmethod
+    def select_number_statistics(game_type: GameTypeEnum) -> Select:
+        """Statement selecting the statistics of the numbers of a game type"""
+        return (
+            select(NumberStatistic)
+            .where(NumberStatistic.type == game_type.value)
+            .order_by(NumberStatistic.number)
+        )
+
+    @staticmethod
+    def select_pair_statistics(game_type: GameTypeEnum, limit: int) -> Select:
+        """Statement selecting the pairs of a game type most often drawn together"""
+        return (
+            select(NumberPairStatistic)
+            .where(NumberPairStatistic.type == game_type.value)
+            .order_by(
+                NumberPairStatistic.draw_count.desc(),
+                NumberPairStatistic.first_number,
+                NumberPairStatistic.second_number,
+            )
+            .limit(limit)
+        )
+
+    async def get_number_statistics(
+        self, game_type: GameTypeEnum, db_session: IAsyncSession
+    ):
+        """Get the draw count and last draw date of the numbers of a game type"""
+        results = await db_session.scalars(self.select_number_statistics(game_type))
+        return [
+            NumberStatisticModel(
+                type=GameTypeEnum(result.type),
+                number=result.number,
+                draw_count=result.draw_count,
+                last_draw_date=result.last_draw_date,
+            )
+            for result in results.all()
+        ]
+
+    async def get_pair_statistics(
+        self, game_type: GameTypeEnum, limit: int, db_session: IAsyncSession
+    ):
+        """Get the limit pairs of numbers most often drawn together"""
+        results = await db_session.scalars(
+            self.select_pair_statistics(game_type, limit)
+        )
+        return [
+            NumberPairStatisticModel(
+                type=GameTypeEnum(result.type),
+                first_number=result.first_number,
+                second_number=result.second_number,
+                draw_count=result.draw_count,
+            )
+            for result in results.all()
+        ]
+
+    async def refresh(self, db_session: IAsyncSession):
+        """Compute the statistics again from all the game results"""
+        await db_session.execute(text("SELECT game.refresh_number_statistics()"))
@@ -0,0 +1,90 @@
+"""
+Asynchronous engine and session db module, on the asyncpg driver.
+The engine is created on first use, so the module is imported without a
+database url by the applications storing their results elsewhere.
+"""
+
+import os
+import threading
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from bit2_api.core.domains.utils import get_env_variable
+from bit2_api.right_adapters.postgres.pool import PoolMetrics
+
+
+def to_async_url(url: str) -> str:
+    """The url of a Postgres database, with the asyncpg driver"""
+    return (
+        make_url(url)
+        .set(drivername="postgresql+asyncpg")
+        .render_as_string(hide_password=False)
+    )
+
+
+# Pool of the asynchronous engine, on top of the one of the synchronous engine
+POSTGRES_ASYNC_POOL_SIZE = int(
+    get_env_variable("POSTGRES_ASYNC_POOL_SIZE", default="10")
+)
+POSTGRES_ASYNC_MAX_OVERFLOW = int(
+    get_env_variable("POSTGRES_ASYNC_MAX_OVERFLOW", default="10")
+)
+POSTGRES_ASYNC_POOL_TIMEOUT = float(
+    get_env_variable("POSTGRES_ASYNC_POOL_TIMEOUT", default="30")
+)
+POSTGRES_POOL_RECYCLE = int(get_env_variable("POSTGRES_POOL_RECYCLE", default="1800"))
+POSTGRES_POOL_PRE_PING = (
+    get_env_variable("POSTGRES_POOL_PRE_PING", default="true") == "true"
+)
+
+pool_metrics = PoolMetrics()
+
+
+class PooledSession(Session):  # pylint: disable=too-few-public-methods
+    """Session run by the asynchronous sessions, whose connection waits are timed"""
+
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+_engine_lock = threading.Lock()
+
+
+def database_url() -> str:
+    """The url of the database, defaulting to the one of the synchronous adapter"""
+    return to_async_url(
+        get_env_variable("ASYNC_DATABASE_URL", default=os.getenv("DATABASE_URL"))
+    )
+
+
+def get_engine() -> AsyncEngine:
+    """The engine of the process, created on the first call"""
+    global _engine, _session_factory  # pylint: disable=global-statement
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_async_engine(
+                database_url(),
+                pool_size=POSTGRES_ASYNC_POOL_SIZE,
+                max_overflow=POSTGRES_ASYNC_MAX_OVERFLOW,
+                pool_timeout=POSTGRES_ASYNC_POOL_TIMEOUT,
+                pool_recycle=POSTGRES_POOL_RECYCLE,
+                pool_pre_ping=POSTGRES_POOL_PRE_PING,
+            )
+            # Loaded objects stay readable after a commit, without an
+            # implicit refresh
+            _session_factory = async_sessionmaker(
+                bind=_engine,
+                autoflush=False,
+                expire_on_commit=False,
+                sync_session_class=PooledSession,
+            )
+            pool_metrics.listen(_engine.sync_engine, PooledSession)
+        return _engine
+
+
+def get_session_factory() -> async_sessionmaker:
+    """The session factory bound to the engine of the process"""
+    get_engine()
+    return _session_factory
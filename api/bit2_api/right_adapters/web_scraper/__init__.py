@@ -1 +1,4 @@
+from .driver_pool import *
+from .fingerprints import *
+from .next_data_scraper_repository import *
 from .selenium_scraper_repository_v3 import *
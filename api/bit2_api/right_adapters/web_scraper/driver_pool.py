@@ -0,0 +1,211 @@
+"""
+Pool of the WebDriver sessions of the scrapers, shared by the API and the
+scheduler of a process
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+from bit2_api.core.domains.errors import ScraperUnavailableError
+from bit2_api.core.domains.utils.env import get_env_variable
+
+logger = logging.getLogger(__name__)
+
+# Browser sessions open at once, each scrape using one of them
+WEBDRIVER_POOL_SIZE = int(get_env_variable("WEBDRIVER_POOL_SIZE", default="2"))
+# Scrapes after which a session is replaced, as Chrome grows over time
+WEBDRIVER_MAX_USES = int(get_env_variable("WEBDRIVER_MAX_USES", default="20"))
+# Seconds to wait for a session before failing
+WEBDRIVER_CHECKOUT_TIMEOUT = float(
+    get_env_variable("WEBDRIVER_CHECKOUT_TIMEOUT", default="60")
+)
+
+
+def new_remote_driver() -> webdriver.Remote:
+    """Open a headless Chrome session on the Selenium server"""
+    selenium_url = get_env_variable("BASE_SELENIUM_URL", "http://localhost:4444/wd/hub")
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--remote-debugging-port=9222")
+    driver = webdriver.Remote(command_executor=selenium_url, options=options)
+    logger.info("Selenium driver initialized.")
+    return driver
+
+
+def quit_driver(driver):
+    """Close a session, which may already be gone"""
+    try:
+        driver.quit()
+    except WebDriverException as error:
+        logger.warning("Failed to quit a Selenium driver: %s", error.msg)
+
+
+@dataclass
+class PooledDriver:
+    """A session of the pool and the scrapes it served"""
+
+    driver: Any
+    uses: int = 0
+
+
+class WebDriverPool:
+    """
+    Bounded pool of WebDriver sessions.
+    Sessions are checked before being handed out, replaced after max_uses
+    scrapes, and closed when a scrape fails with them.
+    """
+
+    def __init__(
+        self,
+        driver_factory: Callable[[], Any] = new_remote_driver,
+        size: int = WEBDRIVER_POOL_SIZE,
+        max_uses: int = WEBDRIVER_MAX_USES,
+        checkout_timeout: float = WEBDRIVER_CHECKOUT_TIMEOUT,
+    ):
+        """
+        Parameters:
+        * driver_factory: Opens a new session
+        * size: The number of sessions open at once
+        * max_uses: The number of scrapes a session serves
+        * checkout_timeout: The seconds to wait for a session
+        """
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+        self._idle: List[PooledDriver] = []
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._metrics = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "timeouts": 0,
+        }
+
+    def _count(self, metric: str):
+        with self._condition:
+            self._metrics[metric] += 1
+
+    @staticmethod
+    def is_healthy(pooled: PooledDriver) -> bool:
+        """Whether the session still answers the Selenium server"""
+        try:
+            _ = pooled.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _acquire(self) -> Optional[PooledDriver]:
+        """
+        Take an idle session, or reserve the opening of a new one by
+        returning None. Waits checkout_timeout for either.
+        """
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._condition:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    raise ScraperUnavailableError
+                self._condition.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+            return None
+
+    def _release(self, pooled: Optional[PooledDriver], keep: bool):
+        """Give a session back, closing it when it is not to be kept"""
+        with self._condition:
+            if pooled is not None and keep and not self._closed:
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+        if pooled is not None:
+            quit_driver(pooled.driver)
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def _checkout(self) -> PooledDriver:
+        """A healthy session, opened when no idle one is left"""
+        while True:
+            pooled = self._acquire()
+            if pooled is None:
+                try:
+                    pooled = PooledDriver(self.driver_factory())
+                except Exception:
+                    self._release(None, keep=False)
+                    raise
+                self._count("created")
+                return pooled
+            if self.is_healthy(pooled):
+                self._count("reused")
+                return pooled
+            logger.warning("Discarding an unresponsive Selenium driver")
+            self._count("discarded")
+            self._release(pooled, keep=False)
+
+    @contextmanager
+    def checkout(self):
+        """
+        Context manager lending a driver for a scrape.
+        Raises ScraperUnavailableError when none is free in time.
+        """
+        pooled = self._checkout()
+        keep = False
+        try:
+            yield pooled.driver
+            pooled.uses += 1
+            keep = pooled.uses < self.max_uses
+            if not keep:
+                self._count("recycled")
+        except Exception:
+            # The page may be left in any state
+            self._count("discarded")
+            raise
+        finally:
+            self._release(pooled, keep)
+
+    def close(self):
+        """Close the idle sessions, the ones in use being closed on release"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for pooled in idle:
+            quit_driver(pooled.driver)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Counters of the sessions of the pool"""
+        with self._condition:
+            return {
+                **self._metrics,
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+            }
+
+
+_driver_pool: Optional[WebDriverPool] = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> WebDriverPool:
+    """The pool shared by the scrapers of the process, created on first use"""
+    global _driver_pool  # pylint: disable=global-statement
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = WebDriverPool()
+        return _driver_pool
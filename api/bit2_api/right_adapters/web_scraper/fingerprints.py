@@ -0,0 +1,133 @@
+"""
+Fingerprints of the scraped months, which tell the scrapers whether a month
+changed since it was last scraped by the process
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from bit2_api.core.domains.models import GameResult
+
+
+def content_hash(content: str) -> str:
+    """Hash of raw scraped content"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def draw_key(result: GameResult) -> Tuple[str, str]:
+    """Key of the draw of a result"""
+    return str(result.type), str(result.draw_date)
+
+
+def results_hash(results: List[GameResult]) -> str:
+    """Hash of parsed results, independent of their order"""
+    return content_hash(
+        json.dumps(
+            sorted(json.dumps(result.to_dict(), default=str) for result in results)
+        )
+    )
+
+
+@dataclass
+class MonthFingerprint:
+    """Hashes and results of the last scrape of a month"""
+
+    raw_hash: str
+    results_hash: str
+    results: List[GameResult]
+    draws: Dict[Tuple[str, str], GameResult] = field(default_factory=dict)
+
+
+@dataclass
+class MonthChanges:
+    """Outcome of a scrape compared with the previous one of its month"""
+
+    # All the results of the month
+    results: List[GameResult]
+    # Results of draws which were not scraped before, or whose numbers changed
+    new: List[GameResult]
+    raw_changed: bool
+    results_changed: bool
+    # Month the results were scraped for, and its new fingerprint, which is
+    # only kept once committed
+    key: Optional[Hashable] = None
+    fingerprint: Optional[MonthFingerprint] = field(default=None, repr=False)
+
+    @property
+    def changed(self) -> bool:
+        """Whether the results differ from the ones of the previous scrape"""
+        return self.results_changed
+
+
+class MonthFingerprints:
+    """
+    Fingerprints of the months scraped by a process. A month whose raw
+    content hashes as before is not parsed again, and one whose results hash
+    as before is reported unchanged. The fingerprint of a scrape is only kept
+    once committed, after its results were saved, so that a month whose save
+    failed is reported changed again on its next scrape.
+    """
+
+    def __init__(self):
+        self._fingerprints: Dict[Hashable, MonthFingerprint] = {}
+        self._lock = threading.Lock()
+
+    def compare(
+        self,
+        key: Hashable,
+        raw: str,
+        parse: Callable[[str], List[GameResult]],
+    ) -> MonthChanges:
+        """
+        Compare the raw content scraped for key, a month and its draw filter,
+        with the previous one committed, parsing it only when it changed
+        """
+        raw_hash = content_hash(raw)
+        with self._lock:
+            previous = self._fingerprints.get(key)
+        if previous is not None and previous.raw_hash == raw_hash:
+            return MonthChanges(list(previous.results), [], False, False, key)
+
+        results = parse(raw)
+        fingerprint = MonthFingerprint(
+            raw_hash,
+            results_hash(results),
+            results,
+            {draw_key(result): result for result in results},
+        )
+        if previous is not None and previous.results_hash == fingerprint.results_hash:
+            return MonthChanges(list(results), [], True, False, key, fingerprint)
+
+        previous_draws = previous.draws if previous is not None else {}
+        new = [
+            result
+            for result in results
+            if previous_draws.get(draw_key(result)) is None
+            or previous_draws[draw_key(result)].numbers != result.numbers
+        ]
+        return MonthChanges(list(results), new, True, True, key, fingerprint)
+
+    def commit(self, changes: MonthChanges):
+        """Keep the fingerprint of a scrape, once its results were saved"""
+        if changes.fingerprint is None:
+            return
+        with self._lock:
+            self._fingerprints[changes.key] = changes.fingerprint
+
+    def forget(self, key: Optional[Hashable] = None):
+        """Drop the fingerprint of key, or of every month"""
+        with self._lock:
+            if key is None:
+                self._fingerprints.clear()
+            else:
+                self._fingerprints.pop(key, None)
+
+
+_month_fingerprints = MonthFingerprints()
+
+
+def get_month_fingerprints() -> MonthFingerprints:
+    """The fingerprints shared by the scrapers of the process"""
+    return _month_fingerprints
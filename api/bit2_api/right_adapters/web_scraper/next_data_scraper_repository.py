@@ -0,0 +1,266 @@
+"""
+Scraper reading the results from the data that the Next.js results page
+embeds, over plain HTTP, with the Selenium scraper as a fallback
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from bs4 import BeautifulSoup
+
+from bit2_api.core.domains.models import GameResult
+from bit2_api.core.domains.utils.env import get_env_variable
+from bit2_api.core.ports import IScraperRepository
+
+from .driver_pool import get_driver_pool
+from .fingerprints import MonthChanges, MonthFingerprints, get_month_fingerprints
+from .selenium_scraper_repository_v3 import (
+    PerThread,
+    ScraperRepository,
+    month_date_suffix,
+    save_to_path,
+    snapshot_path,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Seconds to wait for a response of the results site
+SCRAPER_HTTP_TIMEOUT = float(get_env_variable("SCRAPER_HTTP_TIMEOUT", default="10"))
+# Query parameter of the month on the data route of the results page
+SCRAPER_MONTH_QUERY = get_env_variable("SCRAPER_MONTH_QUERY", default="month")
+# Results page of the site
+BASE_SCRAPING_URL = get_env_variable(
+    "BASE_SCRAPING_URL", default="https://www.lnbloto.bj/resultats"
+)
+
+
+class NextDataError(Exception):
+    """Error raised when the page data cannot be read"""
+
+
+def parse_next_data(html: str) -> Dict[str, Any]:
+    """The JSON of the <script id="__NEXT_DATA__"> element of a page"""
+    script = BeautifulSoup(html, "html.parser").find("script", id="__NEXT_DATA__")
+    if script is None or not script.string:
+        raise NextDataError("No __NEXT_DATA__ element in the page")
+    try:
+        return json.loads(script.string)
+    except ValueError as error:
+        raise NextDataError(f"Invalid __NEXT_DATA__ JSON: {error}") from error
+
+
+def page_props(data: Dict[str, Any]) -> Dict[str, Any]:
+    """The props of a page, from its __NEXT_DATA__ or its data route"""
+    return data.get("props", data).get("pageProps", {})
+
+
+def weekly_draws(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The weeks of results of the page data"""
+    results_data = page_props(data).get("resultsData") or {}
+    return results_data.get("drawsResultsWeekly") or []
+
+
+def covers_month(data: Dict[str, Any], month: str) -> bool:
+    """Whether the weeks of the page data are the ones of month"""
+    suffix = month_date_suffix(month)
+    return any(
+        suffix in f"{week.get('startDate', '')} {week.get('endDate', '')}"
+        for week in weekly_draws(data)
+    )
+
+
+def results_from_next_data(data: Dict[str, Any]) -> List[GameResult]:
+    """The game results of the page data, named as the Selenium scraper does"""
+    results = []
+    for week in weekly_draws(data):
+        try:
+            year = datetime.strptime(week.get("startDate", ""), "%d/%m/%Y").year
+        except ValueError:
+            logger.error("Error parsing week start date: %s", week.get("startDate"))
+            continue
+        for day in week.get("drawResultsDaily") or []:
+            # e.g. "dimanche 30/03"
+            date_numeric = str(day.get("date", "")).split()[-1:] or [""]
+            try:
+                draw_date = datetime.strptime(
+                    f"{date_numeric[0]}/{year}", "%d/%m/%Y"
+                ).date()
+            except ValueError:
+                logger.error("Error parsing day date: %s", day.get("date"))
+                continue
+            draw_results = day.get("drawResults") or {}
+            for category in ["standardDraws", "nightDraws"]:
+                for draw in draw_results.get(category) or []:
+                    numbers = [
+                        int(number.strip())
+                        for number in str(draw.get("winningNumbers", "")).split("-")
+                        if number.strip().isdigit()
+                    ]
+                    if numbers:
+                        results.append(
+                            GameResult(
+                                draw_date=draw_date,
+                                numbers=numbers,
+                                type=str(draw.get("drawName", ""))
+                                .strip()
+                                .upper()
+                                .replace(" ", "_"),
+                                bonus=None,
+                            )
+                        )
+    return results
+
+
+class NextDataScraperRepository(IScraperRepository):
+    """
+    Scraper fetching the results page, or its Next.js data route for
+    another month, and decoding the JSON it embeds. Months the data cannot
+    be read for are scraped by the fallback, the Selenium scraper by default.
+    A scraper is meant to be kept and shared by the scrapes of a process, which
+    reuse its connections and the build of the site it read.
+    """
+
+    base_url = BASE_SCRAPING_URL
+    # Whether the last scrape of the thread was served over HTTP or by the
+    # fallback
+    last_source: Optional[str] = PerThread()
+    # Results of the last scrape of the thread compared with the previous ones
+    last_changes: Optional[MonthChanges] = PerThread()
+
+    def __init__(
+        self,
+        fallback: Optional[IScraperRepository] = None,
+        http_client: Optional[httpx.Client] = None,
+        fingerprints: Optional[MonthFingerprints] = None,
+        commit_fingerprints: bool = True,
+    ):
+        """
+        Parameters:
+        * fallback: The scraper used when the page data cannot be read
+        * http_client: The client of the results site
+        * fingerprints: The fingerprints of the months already scraped
+        * commit_fingerprints: Commit the fingerprint of a month once its
+          snapshot is saved. Callers saving the results elsewhere commit
+          last_changes themselves once saved.
+        """
+        self._fallback = fallback
+        self.http_client = http_client or httpx.Client(
+            timeout=SCRAPER_HTTP_TIMEOUT, follow_redirects=True
+        )
+        # Build of the site, which names its data routes, read again when
+        # they are not found
+        self.build_id: Optional[str] = None
+        self.fingerprints = fingerprints or get_month_fingerprints()
+        self.commit_fingerprints = commit_fingerprints
+
+    @property
+    def fallback(self) -> IScraperRepository:
+        """The fallback scraper, whose browser sessions are only borrowed when used"""
+        if self._fallback is None:
+            self._fallback = ScraperRepository(
+                get_driver_pool(), self.fingerprints, self.commit_fingerprints
+            )
+        return self._fallback
+
+    def fetch_results(
+        self, month: str, draw: str = "", wait_time: int = 1
+    ) -> List[GameResult]:
+        logger.info("Fetching results for month: %s, draw: %s", month, draw)
+        self.last_changes = None
+        try:
+            changes = self.fetch_next_data_changes(month, draw)
+        except (httpx.HTTPError, NextDataError) as error:
+            logger.warning("Page data of %s unavailable: %s", month, error)
+            changes = None
+        if changes is not None and changes.results:
+            self.last_source = "http"
+            self.last_changes = changes
+            if changes.changed:
+                save_to_path(snapshot_path(month), changes.results)
+            if self.commit_fingerprints:
+                self.fingerprints.commit(changes)
+            logger.info(
+                "Fetched %d results of %s over HTTP, %d new",
+                len(changes.results),
+                month,
+                len(changes.new),
+            )
+            return changes.results
+
+        logger.info("Falling back to the browser for %s", month)
+        self.last_source = "browser"
+        results = self.fallback.fetch_results(month, draw=draw, wait_time=wait_time)
+        self.last_changes = getattr(self.fallback, "last_changes", None)
+        return results
+
+    def fetch_next_data_changes(
+        self, month: str, draw: str = ""
+    ) -> Optional[MonthChanges]:
+        """
+        The results of month read from the page data, compared with the
+        previous ones. None when the data of the month was not found.
+        """
+        data = self.fetch_month_data(month)
+        if data is None:
+            return None
+
+        def parse(_raw: str) -> List[GameResult]:
+            results = results_from_next_data(data)
+            if draw:
+                prefix = draw.strip().upper().replace(" ", "_")
+                results = [r for r in results if r.type.startswith(prefix)]
+            return results
+
+        raw = json.dumps(weekly_draws(data), sort_keys=True)
+        return self.fingerprints.compare((month, draw), raw, parse)
+
+    def fetch_month_data(self, month: str) -> Optional[Dict[str, Any]]:
+        """
+        The page data of month. The page shows the current month; other
+        months are read from the data route of the build of the page.
+        """
+        page_read = self.build_id is None
+        if page_read:
+            data = self.fetch_page_data()
+            if covers_month(data, month):
+                return data
+        data = self.fetch_data_route(month)
+        if data is None and not page_read:
+            # The site was deployed again since its build was read
+            self.fetch_page_data()
+            data = self.fetch_data_route(month)
+        if data is not None and covers_month(data, month):
+            return data
+        return None
+
+    def fetch_page_data(self) -> Dict[str, Any]:
+        """The __NEXT_DATA__ of the results page, keeping its build"""
+        response = self.http_client.get(self.base_url)
+        response.raise_for_status()
+        data = parse_next_data(response.text)
+        self.build_id = data.get("buildId")
+        return data
+
+    def fetch_data_route(self, month: str) -> Optional[Dict[str, Any]]:
+        """The JSON of the data route of the results page for month"""
+        if not self.build_id:
+            return None
+        url = urlsplit(self.base_url)
+        path = url.path.rstrip("/") or "/index"
+        data_url = f"{url.scheme}://{url.netloc}/_next/data/{self.build_id}{path}.json"
+        response = self.http_client.get(data_url, params={SCRAPER_MONTH_QUERY: month})
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError as error:
+            raise NextDataError(f"Invalid data route JSON: {error}") from error
+
+    def close(self):
+        """Close the HTTP client"""
+        self.http_client.close()
@@ -1,18 +1,19 @@
 import logging
 import os
 import pickle
+import re
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List
+from typing import Any, Callable, Dict, List, Optional
 
 from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
     TimeoutException,
 )
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
@@ -21,59 +22,133 @@ from bit2_api.core.domains.models import GameResult
 from bit2_api.core.domains.utils.env import get_env_variable
 from bit2_api.core.ports import IScraperRepository
 
+from .driver_pool import WebDriverPool, get_driver_pool
+from .fingerprints import MonthChanges, MonthFingerprints, get_month_fingerprints
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+FRENCH_MONTHS = [
+    "janvier",
+    "février",
+    "mars",
+    "avril",
+    "mai",
+    "juin",
+    "juillet",
+    "août",
+    "septembre",
+    "octobre",
+    "novembre",
+    "décembre",
+]
+# Directory of the snapshots of the scraped months
+SCRAPER_DATA_DIR = get_env_variable("SCRAPER_DATA_DIR", default="./data")
+CONTAINER_SELECTOR = "#__next > main > div > div > div > div > div"
+# Seconds to wait for the results of a month to render
+SCRAPER_RENDER_TIMEOUT = float(get_env_variable("SCRAPER_RENDER_TIMEOUT", default="30"))
+# Seconds between two reads of the results, which are settled once equal
+SCRAPER_SETTLE_INTERVAL = float(
+    get_env_variable("SCRAPER_SETTLE_INTERVAL", default="0.5")
+)
+# Week headers of the results container, read without parsing the html
+WEEK_HEADER_PATTERN = re.compile(r"<h4\b[^>]*>(.*?)</h4>", re.IGNORECASE | re.DOTALL)
+
+
+class PerThread:
+    """
+    Attribute of a scraper holding a value per thread, so that the scrapes
+    sharing a scraper each read the outcome of their own
+    """
+
+    def __init__(self, default: Callable[[], Any] = lambda: None):
+        self.default = default
+        self.name = ""
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    @staticmethod
+    def _values(instance) -> threading.local:
+        # setdefault is atomic, the threads share the first local created
+        return instance.__dict__.setdefault("_per_thread", threading.local())
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        values = self._values(instance)
+        if not hasattr(values, self.name):
+            setattr(values, self.name, self.default())
+        return getattr(values, self.name)
+
+    def __set__(self, instance, value):
+        setattr(self._values(instance), self.name, value)
+
 
 class ScraperRepository(IScraperRepository):
-    def __init__(self):
+    # Seconds spent in each phase of the last scrape of the thread
+    last_timings: Dict[str, float] = PerThread(dict)
+    # Results of the last scrape of the thread compared with the previous ones
+    last_changes: Optional[MonthChanges] = PerThread()
+
+    def __init__(
+        self,
+        driver_pool: Optional[WebDriverPool] = None,
+        fingerprints: Optional[MonthFingerprints] = None,
+        commit_fingerprints: bool = True,
+    ):
         self.base_url = get_env_variable(
             "BASE_SCRAPING_URL", "https://www.lnbloto.bj/resultats"
         )
-        self.selenium_url = get_env_variable(
-            "BASE_SELENIUM_URL", "http://localhost:4444/wd/hub"
-        )
         logger.info("Using base URL: %s", self.base_url)
 
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--remote-debugging-port=9222")
-
-        self.driver = webdriver.Remote(
-            command_executor=self.selenium_url, options=options
-        )
-        # self.driver = webdriver.Chrome(options=options)
-        logger.info("Selenium driver initialized.")
+        # Browser sessions are borrowed for each scrape, instead of being
+        # launched by each instance
+        self.driver_pool = driver_pool or get_driver_pool()
+        # Months whose page did not change are neither parsed nor saved again
+        self.fingerprints = fingerprints or get_month_fingerprints()
+        # Commit the fingerprint of a month once its snapshot is saved, unless
+        # the caller commits it after saving the results elsewhere
+        self.commit_fingerprints = commit_fingerprints
 
     def fetch_results(
         self, month: str, draw: str, wait_time: int = 1
     ) -> List[GameResult]:
         logger.info("Fetching results for month: %s, draw: %s", month, draw)
+        self.last_changes = None
         try:
-            self.driver.get(self.base_url)
-            wait = WebDriverWait(self.driver, 30)
+            # The errors reach the pool first, which discards the session
+            # whose page they left in an unknown state
+            with self.driver_pool.checkout() as driver:
+                return self._fetch_results(driver, month, draw)
+        except (
+            TimeoutException,
+            NoSuchElementException,
+            StaleElementReferenceException,
+        ) as e:
+            logger.error("Error during Selenium scraping: %s", e.msg)
+            return []
+
+    def _fetch_results(self, driver, month: str, draw: str) -> List[GameResult]:
+        timer = PhaseTimer()
+        self.last_timings = timer.timings
+        with timer.phase("page_load"):
+            driver.get(self.base_url)
+            wait = WebDriverWait(driver, 30)
             # Wait until the page is fully loaded and React has finished processing.
             wait.until(
                 lambda d: d.execute_script(
                     'return document.readyState === "complete" && !document.querySelector(".loading-indicator")'
                 )
             )
-            print("Page loaded and React processed the change.")
 
+        with timer.phase("select"):
             # Use a stable element finder to get the month select element.
-            month_select_element = get_stable_element(self.driver, By.ID, "month")
+            month_select_element = get_stable_element(driver, By.ID, "month")
             wait.until(EC.element_to_be_clickable((By.ID, "month")))
-            print("Month select element found.")
-
             month_select = Select(month_select_element)
-
-            print("Selecting month...")
             month_select.select_by_visible_text(month)
 
-            print("Month selected.")
-
             if draw:
                 draw_select = Select(
                     wait.until(EC.element_to_be_clickable((By.ID, "draw")))
@@ -81,49 +156,122 @@ class ScraperRepository(IScraperRepository):
                 draw_select.select_by_visible_text(draw)
                 logger.info("Selected draw type: %s", draw)
 
-            # Wait for new container to load
-            dynamic_container = wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "#__next > main > div > div > div > div > div")
-                )
-            )
+        with timer.phase("render_settle"):
+            # Scroll to the bottom of the page so that all the weeks render
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            updated_html = wait_for_container(driver, month)
 
-            # Wait for the page to load
-            time.sleep(10)
+        with timer.phase("parse"):
+            changes = self.fingerprints.compare(
+                (month, draw), updated_html, parse_results_from_container
+            )
+            self.last_changes = changes
+            results = changes.results
+
+        with timer.phase("save"):
+            if changes.changed:
+                save_to_path(snapshot_path(month), results)
+            if self.commit_fingerprints:
+                self.fingerprints.commit(changes)
+
+        logger.info(
+            "Results of %s fetched in %.2fs, %d new (%s)",
+            month,
+            sum(timer.timings.values()),
+            len(changes.new),
+            ", ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in timer.timings.items()
+            ),
+        )
+        return results
 
-            updated_html = dynamic_container.get_attribute("innerHTML")
+    def close(self):
+        """Nothing to close, the sessions belong to the pool"""
 
-            # Wait for the page to load completely
-            time.sleep(10)
 
-            print("Waiting for the page to load completely...")
-            # Scroll to the bottom of the page to ensure all elements are loaded
-            self.driver.execute_script(
-                "window.scrollTo(0, document.body.scrollHeight);"
-            )
-            time.sleep(5)
+class PhaseTimer:
+    """Seconds spent in the phases of a scrape, in their order"""
 
-            results = parse_results_from_container(updated_html)
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
 
-            path_file = f"./data/{month}/{datetime.now().isoformat()}.pkl"
+    @contextmanager
+    def phase(self, name: str):
+        """Time the block as the phase name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+
+def month_date_suffix(month: str) -> str:
+    """
+    The end of the dates of a month as written in the week headers,
+    "/03/2025" for "mars 2025"
+    """
+    name, year = month.lower().split()
+    return f"/{FRENCH_MONTHS.index(name) + 1:02d}/{year}"
+
+
+def shows_month(html: str, month: str) -> bool:
+    """
+    Whether the week headers of the container html are the ones of month.
+    The headers are matched in the raw html, which is only parsed once the
+    container settled.
+    """
+    suffix = month_date_suffix(month)
+    return any(
+        suffix in header.group(1) for header in WEEK_HEADER_PATTERN.finditer(html)
+    )
 
-            save_to_path(path_file, results)
 
-            logger.info("Results fetched and saved successfully.")
-            return results
+class ContainerSettled:
+    """
+    Condition of WebDriverWait met once the results container shows the
+    weeks of month and its html stayed the same over a poll
+    """
 
-        except (
-            TimeoutException,
-            NoSuchElementException,
-            StaleElementReferenceException,
-        ) as e:
-            logger.error("Error during Selenium scraping: %s", e.msg)
-            return []
-        finally:
-            self.driver.quit()
+    def __init__(self, month: str):
+        self.month = month
+        self.html: Optional[str] = None
+        self.month_shown = False
 
-    def close(self):
-        self.driver.quit()
+    def __call__(self, driver):
+        html = driver.find_element(By.CSS_SELECTOR, CONTAINER_SELECTOR).get_attribute(
+            "innerHTML"
+        )
+        if html == self.html:
+            return html if self.month_shown else False
+        self.html = html
+        self.month_shown = shows_month(html, self.month)
+        return False
+
+
+def wait_for_container(
+    driver,
+    month: str,
+    timeout: float = SCRAPER_RENDER_TIMEOUT,
+    poll_interval: float = SCRAPER_SETTLE_INTERVAL,
+) -> str:
+    """
+    The html of the results container once it rendered the weeks of month.
+    Past timeout, the last html is used if it showed the month, as a page
+    still updating some text would never settle.
+    """
+    condition = ContainerSettled(month)
+    try:
+        return WebDriverWait(
+            driver,
+            timeout,
+            poll_frequency=poll_interval,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+        ).until(condition)
+    except TimeoutException:
+        if not condition.month_shown:
+            raise
+        logger.warning("Results of %s did not settle in %ss", month, timeout)
+        return condition.html
 
 
 def parse_results_from_container(html: str) -> List[GameResult]:
@@ -235,6 +383,11 @@ def get_stable_element(driver, by, locator, retries=5, delay=1):
     )
 
 
+def snapshot_path(month: str) -> str:
+    """Path of a new snapshot of the results of month"""
+    return os.path.join(SCRAPER_DATA_DIR, month, f"{datetime.now().isoformat()}.pkl")
+
+
 def save_to_path(path: str, results: List[GameResult]):
     """Save results to a file using pickle."""
 
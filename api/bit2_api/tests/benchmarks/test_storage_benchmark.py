@@ -0,0 +1,46 @@
+"""Tests for the storage benchmark."""
+import json
+
+from bit2_api.benchmarks.storage import (
+    Backend,
+    create_many,
+    main,
+    run,
+    synthetic_history,
+)
+
+
+def test_benchmark_times_every_operation():
+    """Each backend is timed on every repository operation."""
+    report = run([40], ["csv", "csv-log", "columnar", "postgres"], sample=5)
+
+    operations = {(r["backend"], r["operation"]) for r in report["results"]}
+    assert len(operations) == 18
+    assert report["skipped"] == {"postgres": "no database url"}
+    get_all = next(r for r in report["results"] if r["operation"] == "get_all")
+    assert get_all["size"] == 40 and get_all["count"] == 1
+
+
+def test_benchmark_writes_json_report(tmp_path):
+    """The report is written as JSON."""
+    output = tmp_path / "benchmark.json"
+    main(["--sizes", "20", "--backends", "columnar", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert {r["operation"] for r in report["results"]} >= {"create", "delete"}
+
+
+def test_bulk_create_of_the_backend_is_preferred():
+    """Backends without a create_many in their repository insert in bulk."""
+    batches = []
+    backend = Backend(
+        "recording",
+        object(),
+        lambda: None,
+        lambda session: None,
+        bulk_create=lambda commands, session: batches.append(commands),
+    )
+
+    create_many(backend, synthetic_history(10), None)
+
+    assert [len(batch) for batch in batches] == [10]
@@ -0,0 +1,107 @@
+"""Tests for the asynchronous game result use cases."""
+
+import asyncio
+from datetime import date
+
+from bit2_api.core.domains.models import GameResult
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.core.ports import (
+    IAsyncDatabaseClientRepository,
+    IAsyncGameResultRepository,
+    IAsyncSession,
+)
+from bit2_api.core.use_cases import AsyncGetGameResults
+
+
+class TrackedAsyncSession(IAsyncSession):
+    """Asynchronous session recording whether it was closed."""
+
+    closed = False
+
+    async def commit(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class TrackingAsyncDatabaseClient(IAsyncDatabaseClientRepository):
+    """Asynchronous database client recording the sessions it opened."""
+
+    def __init__(self):
+        self.sessions = []
+
+    def get_db_session(self) -> IAsyncSession:
+        session = TrackedAsyncSession()
+        self.sessions.append(session)
+        return session
+
+
+class InMemoryAsyncGameResultRepository(IAsyncGameResultRepository):
+    """Asynchronous repository of a list of game results."""
+
+    def __init__(self, results):
+        self.results = results
+
+    async def get_by_draw_date(self, draw_date, db_session):
+        return next(r for r in self.results if r.draw_date == draw_date)
+
+    async def get_by_type(self, game_type, db_session):
+        return [r for r in self.results if r.type == game_type]
+
+    async def get_all(self, db_session):
+        return list(self.results)
+
+    async def get_range(self, game_type, start, end, db_session):
+        results = await self.get_by_type(game_type, db_session)
+        return [r for r in results if start <= r.draw_date <= end]
+
+    async def get_latest(self, game_type, count, db_session):
+        results = await self.get_by_type(game_type, db_session)
+        return sorted(results, key=lambda r: r.draw_date, reverse=True)[:count]
+
+    async def get_page(self, after, limit, db_session):
+        await asyncio.sleep(0)
+        raise ValueError("no pages")
+
+    async def find_containing(
+        self, numbers, db_session, game_type=None, date_range=None
+    ):
+        return [r for r in self.results if set(numbers) <= set(r.numbers)]
+
+    async def create(self, command, db_session):
+        raise NotImplementedError
+
+    async def upsert_many(self, commands, db_session):
+        raise NotImplementedError
+
+    async def delete(self, draw_date, game_type, db_session):
+        raise NotImplementedError
+
+
+def test_concurrent_reads_use_their_own_session():
+    """Concurrent executions open a session each and close it, even on failure."""
+    results = [
+        GameResult(date(2025, 3, day), [day, 2, 3, 4, 5], None, GameTypeEnum.STAR_11H)
+        for day in range(1, 11)
+    ]
+    client = TrackingAsyncDatabaseClient()
+    use_case = AsyncGetGameResults(InMemoryAsyncGameResultRepository(results), client)
+
+    async def run():
+        return await asyncio.gather(
+            use_case.get_latest(GameTypeEnum.STAR_11H, 3),
+            use_case.get_range(
+                GameTypeEnum.STAR_11H, date(2025, 3, 2), date(2025, 3, 4)
+            ),
+            use_case.get_page(None, 10),
+            return_exceptions=True,
+        )
+
+    latest, in_range, page = asyncio.run(run())
+
+    assert [r.draw_date.day for r in latest] == [10, 9, 8]
+    assert [r.draw_date.day for r in in_range] == [2, 3, 4]
+    assert isinstance(page, ValueError)
+    assert len(client.sessions) == 3
+    assert all(session.closed for session in client.sessions)
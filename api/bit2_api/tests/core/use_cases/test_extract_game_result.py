@@ -0,0 +1,63 @@
+"""Tests for the extract game result use case."""
+from datetime import datetime
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.core.ports import IDatabaseClientRepository, ISession
+from bit2_api.core.use_cases import ExtractGameResult
+from bit2_api.right_adapters.columnar import (
+    ColumnarEngine,
+    ColumnarSession,
+    GameResultRepository,
+)
+
+
+class TrackedSession(ColumnarSession):
+    """Session recording whether it was committed and closed."""
+
+    committed = False
+    closed = False
+
+    def commit(self) -> None:
+        self.committed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TrackingDatabaseClient(IDatabaseClientRepository):
+    """Database client recording the sessions it opened."""
+
+    def __init__(self, base_dir: str):
+        self.engine = ColumnarEngine(base_dir)
+        self.sessions = []
+
+    def get_db_session(self) -> ISession:
+        session = TrackedSession(self.engine)
+        self.sessions.append(session)
+        return session
+
+
+def test_each_execution_uses_its_own_session(tmp_path):
+    """Executions open a new session and close it, even after a failure."""
+    client = TrackingDatabaseClient(str(tmp_path))
+    use_case = ExtractGameResult(GameResultRepository(), client)
+    command = ExtractGameResultCommand(
+        draw_date=datetime(2025, 3, 1),
+        numbers=[1, 2, 3, 4, 5],
+        bonus=None,
+        type=GameTypeEnum.STAR_11H,
+    )
+
+    use_case.execute(command)
+    use_case.execute_many([command])
+    try:
+        use_case.execute_many([None])
+    except AttributeError:
+        pass
+
+    assert len(client.sessions) == 3
+    assert all(session.closed for session in client.sessions)
+    # Only the executions which succeeded are committed
+    assert [session.committed for session in client.sessions] == [True, True, False]
+    assert len(use_case.game_repository.get_all(client.sessions[0])) == 1
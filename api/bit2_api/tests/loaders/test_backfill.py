@@ -0,0 +1,98 @@
+"""Tests for the parallel backfill of the scraped months."""
+import threading
+import time
+
+from bit2_api.loaders.backfill import (
+    BackfillOptions,
+    backfill_month,
+    month_range,
+    pending_months,
+    run,
+)
+
+
+class FakeScraper:
+    """Scraper failing its first calls, tracking the concurrent scrapes"""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+        self.last_source = "http"
+
+    def fetch_results(self, month, draw="", wait_time=1):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("session lost")
+        with FakeScraper.lock:
+            FakeScraper.active += 1
+            FakeScraper.peak = max(FakeScraper.peak, FakeScraper.active)
+        time.sleep(0.02)
+        with FakeScraper.lock:
+            FakeScraper.active -= 1
+        return [month]
+
+    def close(self):
+        pass
+
+
+def test_month_range_across_years():
+    """Months are named as on the site, the latest first."""
+    assert month_range("novembre 2024", "février 2025") == [
+        "février 2025",
+        "janvier 2025",
+        "décembre 2024",
+        "novembre 2024",
+    ]
+
+
+def test_months_with_a_complete_snapshot_are_skipped(tmp_path):
+    """Snapshots taken after the end of their month are not scraped again."""
+    for month, name in [
+        ("janvier 2025", "2025-02-01T08:00:00.000001.pkl"),
+        ("février 2025", "2025-02-20T08:00:00.000001.pkl"),
+    ]:
+        (tmp_path / month).mkdir()
+        (tmp_path / month / name).write_bytes(b"")
+
+    months = ["mars 2025", "février 2025", "janvier 2025"]
+    assert pending_months(months, str(tmp_path)) == ["mars 2025", "février 2025"]
+
+    # Loading into Postgres, complete months are only skipped once loaded
+    assert pending_months(months, str(tmp_path), loading=True) == months
+    (tmp_path / "janvier 2025" / "2025-02-01T08:00:00.000001.pkl.loaded").touch()
+    assert pending_months(months, str(tmp_path), loading=True) == months[:2]
+
+
+def test_backfill_month_records_load_failures():
+    """A month whose results fail to load is reported, not raised."""
+
+    def fail_to_load(backfill):
+        raise KeyError(backfill.month)
+
+    backfill = backfill_month(FakeScraper(), "mars 2025", 1, 0, fail_to_load)
+    assert (backfill.results, backfill.error) == (1, "'mars 2025'")
+
+
+def test_backfill_month_retries_failures():
+    """Failed scrapes are retried until one succeeds."""
+    backfill = backfill_month(FakeScraper(failures=2), "mars 2025", 3, 0)
+    assert (backfill.results, backfill.attempts, backfill.error) == (1, 3, None)
+
+    backfill = backfill_month(FakeScraper(failures=3), "mars 2025", 2, 0)
+    assert (backfill.results, backfill.error) == (0, "session lost")
+
+
+def test_run_scrapes_months_in_parallel():
+    """Months are spread over the workers and reported in order."""
+    FakeScraper.peak = 0
+    months = month_range("janvier 2024", "décembre 2024")
+    report = run(months, BackfillOptions(workers=4, retry_delay=0), FakeScraper)
+
+    assert FakeScraper.peak == 4
+    assert report["results"] == 12
+    assert report["failed"] == []
+    assert [backfill["month"] for backfill in report["backfills"]] == months
@@ -0,0 +1,87 @@
+"""Tests for the bulk load of the scraped snapshots."""
+import pickle
+from datetime import date
+
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.loaders.snapshots import (
+    copy_buffer,
+    latest_snapshots,
+    normalize_type,
+    read_snapshot,
+)
+
+
+def write_snapshot(path, results):
+    """Pickle results as the scraper does."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as snapshot_file:
+        pickle.dump(results, snapshot_file)
+
+
+def test_latest_snapshot_of_each_month(tmp_path):
+    """Only the latest snapshot of a month is loaded, outputs are ignored."""
+    write_snapshot(tmp_path / "mars 2025" / "2025-03-31T20:12:07.197136.pkl", [])
+    write_snapshot(tmp_path / "mars 2025" / "2025-04-03T09:15:11.387104.pkl", [])
+    write_snapshot(tmp_path / "avril 2025" / "2025-04-03T09:13:11.093670.pkl", [])
+    write_snapshot(tmp_path / "outputs" / "2025-04-03 10:05:04.106069.pkl", [])
+
+    snapshots = latest_snapshots(str(tmp_path))
+
+    assert sorted(snapshots) == ["avril 2025", "mars 2025"]
+    assert snapshots["mars 2025"].endswith("2025-04-03T09:15:11.387104.pkl")
+
+
+def test_scraped_types_are_normalized():
+    """Draw names repeating their hour are mapped to their game type."""
+    assert normalize_type("FORTUNE_18H_18H") == GameTypeEnum.FORTUNE_18H
+    assert normalize_type("fortune 14h_13h") == GameTypeEnum.FORTUNE_14H
+    assert normalize_type("DIGITAL_00H") == GameTypeEnum.DIGITAL_00H
+    assert normalize_type("LOTO") is None
+
+
+def test_snapshot_rows_are_deduplicated(tmp_path):
+    """Invalid results are rejected and the last result of a draw wins."""
+    path = tmp_path / "mars 2025" / "2025-03-31T20:12:07.197136.pkl"
+    write_snapshot(
+        path,
+        [
+            {"draw_date": "2025-03-01", "numbers": [1, 2], "type": "STAR_11H"},
+            {"draw_date": "2025-03-01", "numbers": [3, 4], "type": "STAR_11H_11H"},
+            {"draw_date": "2025-03-02", "numbers": [], "type": "STAR_11H"},
+            {"draw_date": "mars", "numbers": [5], "type": "STAR_11H"},
+            {"draw_date": "2025-03-02", "numbers": [5, 6], "type": "STAR_14H"},
+        ],
+    )
+
+    rows, counts = read_snapshot(str(path))
+
+    assert (counts.read, counts.rejected, counts.duplicates) == (5, 2, 1)
+    assert rows == [
+        {
+            "draw_date": date(2025, 3, 1),
+            "numbers": [3, 4],
+            "bonus": None,
+            "type": "STAR_11H",
+        },
+        {
+            "draw_date": date(2025, 3, 2),
+            "numbers": [5, 6],
+            "bonus": None,
+            "type": "STAR_14H",
+        },
+    ]
+
+
+def test_copy_buffer_uses_the_copy_text_format():
+    """Arrays are written as literals and missing bonuses as nulls."""
+    rows = [
+        {"draw_date": date(2025, 3, 1), "numbers": [1, 2], "bonus": None, "type": "X"},
+        {"draw_date": date(2025, 3, 2), "numbers": [3], "bonus": 7, "type": "Y"},
+    ]
+
+    lines = copy_buffer(rows).read().splitlines()
+
+    assert [line.split("\t")[1:] for line in lines] == [
+        ["2025-03-01", "{1,2}", r"\N", "X"],
+        ["2025-03-02", "{3}", "7", "Y"],
+    ]
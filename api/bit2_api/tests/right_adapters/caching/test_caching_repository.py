@@ -0,0 +1,193 @@
+"""Tests for the cache of the game result reads."""
+import asyncio
+from datetime import datetime
+
+import inject
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.core.use_cases import ExtractGameResult
+from bit2_api.right_adapters.caching import (
+    MISSING,
+    AsyncCachingGameResultRepository,
+    CachingGameResultRepository,
+    ResultCache,
+)
+from bit2_api.right_adapters.columnar import (
+    ColumnarEngine,
+    ColumnarSession,
+    GameResultRepository,
+)
+from bit2_api.utils_main.get_dep_inject_config import get_dependencies_injection_config
+
+
+class FakeClock:
+    """Clock moved forward by the tests"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingGameResultRepository(GameResultRepository):
+    """Columnar repository counting the ranges it reads"""
+
+    def __init__(self):
+        super().__init__()
+        self.range_reads = 0
+
+    def get_range(self, game_type, start, end, db_session):
+        self.range_reads += 1
+        return super().get_range(game_type, start, end, db_session)
+
+
+class AsyncWrapper:
+    """Asynchronous facade of a synchronous repository"""
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    def __getattr__(self, name):
+        method = getattr(self.repository, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+def make_command(day: int, game_type: GameTypeEnum = GameTypeEnum.STAR_11H):
+    """Build a command for a draw of march 2025."""
+    return ExtractGameResultCommand(
+        draw_date=datetime(2025, 3, day),
+        numbers=[day, 20, 30, 40, 90],
+        bonus=None,
+        type=game_type,
+    )
+
+
+MARCH = (GameTypeEnum.STAR_11H, datetime(2025, 3, 1), datetime(2025, 3, 31))
+
+
+def test_result_cache_evicts_least_recently_used():
+    """Past its bound, the cache drops the entries read least recently."""
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (3, 1, 1, 2)
+    assert stats.hit_ratio == 0.75
+
+
+def test_result_cache_expires_entries():
+    """Entries are not served past their time to live."""
+    clock = FakeClock()
+    cache = ResultCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put("a", None)
+    clock.now = 9
+    assert cache.get("a") is None
+    clock.now = 10
+    assert cache.get("a") is MISSING
+    assert cache.stats.expirations == 1
+    assert cache.stats.entries == 0
+
+
+def test_caching_repository_serves_reads_until_writes(tmp_path):
+    """Reads are cached until a write goes through the repository."""
+    session = ColumnarSession(ColumnarEngine(str(tmp_path)))
+    inner = CountingGameResultRepository()
+    cache = ResultCache(max_entries=8, ttl_seconds=60)
+    repository = CachingGameResultRepository(inner, cache)
+    repository.create(make_command(1), session)
+
+    first = repository.get_range(*MARCH, session)
+    first.clear()
+    assert len(repository.get_range(*MARCH, session)) == 1
+    assert inner.range_reads == 1
+
+    repository.create(make_command(2), session)
+    assert len(repository.get_range(*MARCH, session)) == 2
+    repository.delete(datetime(2025, 3, 1), GameTypeEnum.STAR_11H, session)
+    assert len(repository.get_range(*MARCH, session)) == 1
+    assert inner.range_reads == 3
+    assert cache.stats.invalidations == 3
+
+    assert repository.find_containing([2, 90], session)[0].numbers[0] == 2
+    assert repository.find_containing([2, 90], session)[0].numbers[0] == 2
+    assert cache.stats.hits == 2
+
+
+def test_caching_repositories_of_backends_do_not_share_results(tmp_path):
+    """Repositories sharing a cache read their results under their namespace."""
+    cache = ResultCache(max_entries=8, ttl_seconds=60)
+    stored = CachingGameResultRepository(CountingGameResultRepository(), cache)
+    empty = CachingGameResultRepository(
+        CountingGameResultRepository(), cache, namespace="empty"
+    )
+    stored.create(make_command(1), ColumnarSession(ColumnarEngine(str(tmp_path / "a"))))
+
+    session = ColumnarSession(ColumnarEngine(str(tmp_path / "a")))
+    assert len(stored.get_range(*MARCH, session)) == 1
+    session = ColumnarSession(ColumnarEngine(str(tmp_path / "b")))
+    assert empty.get_range(*MARCH, session) == []
+
+
+def test_caching_repository_drops_reads_racing_writes(tmp_path):
+    """A result read before a write ends is not stored after the write."""
+    session = ColumnarSession(ColumnarEngine(str(tmp_path)))
+    cache = ResultCache(max_entries=8, ttl_seconds=60)
+    inner = CountingGameResultRepository()
+    repository = CachingGameResultRepository(inner, cache)
+    repository.create(make_command(1), session)
+
+    def read_during_write(*args):
+        results = GameResultRepository.get_range(inner, *args)
+        repository.create(make_command(2), session)
+        return results
+
+    inner.get_range = read_during_write
+    assert len(repository.get_range(*MARCH, session)) == 1
+    del inner.get_range
+    assert len(repository.get_range(*MARCH, session)) == 2
+
+
+def test_async_caching_repository_shares_the_cache(tmp_path):
+    """The asynchronous repository caches into the same cache."""
+    session = ColumnarSession(ColumnarEngine(str(tmp_path)))
+    inner = CountingGameResultRepository()
+    cache = ResultCache(max_entries=8, ttl_seconds=60)
+    repository = AsyncCachingGameResultRepository(AsyncWrapper(inner), cache)
+
+    async def scenario():
+        await repository.create(make_command(1), session)
+        await repository.get_range(*MARCH, session)
+        return await repository.get_range(*MARCH, session)
+
+    assert len(asyncio.run(scenario())) == 1
+    assert inner.range_reads == 1
+    assert cache.stats.hits == 1
+
+
+def test_dependencies_injection_wraps_repositories():
+    """Given a cache, the use cases get caching repositories."""
+    cache = ResultCache()
+    inject.clear_and_configure(
+        get_dependencies_injection_config(
+            object(), GameResultRepository(), GameResultCache=cache, for_testing=True
+        )
+    )
+    try:
+        assert inject.instance(ResultCache) is cache
+        repository = inject.instance(ExtractGameResult).game_repository
+        assert isinstance(repository, CachingGameResultRepository)
+        assert repository.cache is cache
+    finally:
+        inject.clear()
@@ -0,0 +1,141 @@
+"""Tests for the memory-mapped columnar game result storage."""
+from datetime import datetime
+
+import numpy as np
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.right_adapters.columnar import (
+    ColumnarEngine,
+    ColumnarSession,
+    GameResultRepository,
+)
+
+
+def make_command(day: int, game_type: GameTypeEnum, bonus=None):
+    """Build a command for a draw of march 2025."""
+    return ExtractGameResultCommand(
+        draw_date=datetime(2025, 3, day),
+        numbers=[day, 20, 30, 40, 90],
+        bonus=bonus,
+        type=game_type,
+    )
+
+
+def test_columnar_repository_round_trip(tmp_path):
+    """Game results are stored in columns and read back as domain models."""
+    session = ColumnarSession(ColumnarEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    repository.create(make_command(1, GameTypeEnum.STAR_11H, bonus=7), session)
+    repository.create_many(
+        [
+            make_command(2, GameTypeEnum.STAR_11H),
+            make_command(2, GameTypeEnum.DIGITAL_21H),
+        ],
+        session,
+    )
+
+    result = repository.get_by_draw_date(datetime(2025, 3, 1), session)
+    assert result.numbers == [1, 20, 30, 40, 90]
+    assert result.bonus == 7
+    assert result.type == GameTypeEnum.STAR_11H
+    assert len(repository.get_by_type(GameTypeEnum.STAR_11H, session)) == 2
+
+    repository.delete(datetime(2025, 3, 2), GameTypeEnum.STAR_11H, session)
+    assert len(repository.get_all(session)) == 2
+
+    # A new engine maps the same files
+    columns = GameResultRepository().arrays(
+        ColumnarSession(ColumnarEngine(str(tmp_path)))
+    )
+    assert columns.numbers.shape == (3, 5)
+    assert columns.draw_dates[0] == np.datetime64("2025-03-01")
+    assert columns.live.tolist() == [True, False, True]
+
+
+def test_columnar_upsert_replaces_existing_results(tmp_path):
+    """Upserting a result of the same draw date and game type replaces it."""
+    session = ColumnarSession(ColumnarEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    repository.create(make_command(1, GameTypeEnum.STAR_11H), session)
+
+    repository.upsert_many(
+        [
+            make_command(1, GameTypeEnum.STAR_11H, bonus=3),
+            make_command(1, GameTypeEnum.STAR_11H, bonus=4),
+            make_command(1, GameTypeEnum.FORTUNE_14H),
+        ],
+        session,
+    )
+
+    results = repository.get_all(session)
+    assert len(results) == 2
+    star = repository.get_by_type(GameTypeEnum.STAR_11H, session)
+    assert [result.bonus for result in star] == [4]
+
+
+def test_columnar_range_latest_and_pages(tmp_path):
+    """Ordered reads return the draws in (draw date, type) order."""
+    session = ColumnarSession(ColumnarEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    repository.create_many(
+        [
+            make_command(day, game_type)
+            for day in (9, 3, 6)
+            for game_type in (GameTypeEnum.STAR_11H, GameTypeEnum.FORTUNE_14H)
+        ],
+        session,
+    )
+
+    in_range = repository.get_range(
+        GameTypeEnum.STAR_11H, datetime(2025, 3, 4), datetime(2025, 3, 9), session
+    )
+    assert [result.draw_date.day for result in in_range] == [6, 9]
+    latest = repository.get_latest(GameTypeEnum.FORTUNE_14H, 2, session)
+    assert [result.draw_date.day for result in latest] == [9, 6]
+
+    page = repository.get_page(
+        (datetime(2025, 3, 3), GameTypeEnum.FORTUNE_14H), 3, session
+    )
+    assert [(r.draw_date.day, r.type) for r in page] == [
+        (3, GameTypeEnum.STAR_11H),
+        (6, GameTypeEnum.FORTUNE_14H),
+        (6, GameTypeEnum.STAR_11H),
+    ]
+
+
+def test_columnar_find_containing_compares_bitmasks(tmp_path):
+    """Draws are selected by the bitmasks of their numbers, above 64 included."""
+    session = ColumnarSession(ColumnarEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    repository.create_many(
+        [
+            make_command(2, GameTypeEnum.STAR_11H),
+            make_command(1, GameTypeEnum.STAR_11H),
+            make_command(1, GameTypeEnum.DIGITAL_21H),
+            make_command(3, GameTypeEnum.STAR_11H),
+        ],
+        session,
+    )
+    repository.delete(datetime(2025, 3, 3), GameTypeEnum.STAR_11H, session)
+
+    def found(numbers, **filters):
+        results = repository.find_containing(numbers, session, **filters)
+        return [(r.draw_date.day, r.type) for r in results]
+
+    assert found([20, 90]) == [
+        (1, GameTypeEnum.DIGITAL_21H),
+        (1, GameTypeEnum.STAR_11H),
+        (2, GameTypeEnum.STAR_11H),
+    ]
+    assert found([1, 90]) == [
+        (1, GameTypeEnum.DIGITAL_21H),
+        (1, GameTypeEnum.STAR_11H),
+    ]
+    assert found([2, 20], game_type=GameTypeEnum.STAR_11H) == [
+        (2, GameTypeEnum.STAR_11H)
+    ]
+    assert found([20], date_range=(datetime(2025, 3, 2), datetime(2025, 3, 31))) == [
+        (2, GameTypeEnum.STAR_11H)
+    ]
+    assert found([3, 20]) == []
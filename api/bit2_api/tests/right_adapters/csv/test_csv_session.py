@@ -0,0 +1,472 @@
+"""Tests for the CSV engine and session."""
+import json
+import multiprocessing
+import os
+from datetime import datetime
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.right_adapters.csv.repositories import GameResultRepository
+from bit2_api.right_adapters.csv.session import CSVEngine, CSVSession, QueryFilter
+
+
+def make_command(day: int, game_type: GameTypeEnum) -> ExtractGameResultCommand:
+    """Build a command for a draw of march 2025."""
+    return ExtractGameResultCommand(
+        draw_date=datetime(2025, 3, day),
+        numbers=[day, 20, 30, 40, 50],
+        bonus=None,
+        type=game_type,
+    )
+
+
+def test_engine_reuses_parsed_table_until_file_changes(tmp_path):
+    """The engine only parses a file again when it changed on disk."""
+    engine = CSVEngine(str(tmp_path))
+    engine.write_rows("items", [{"id": "1", "name": "a"}])
+
+    table = engine.load_table("items")
+    assert engine.load_table("items") is table
+
+    engine.write_rows("items", [{"id": "2", "name": "b"}])
+    reloaded = engine.load_table("items")
+    assert reloaded is not table
+    assert [row["id"] for row in reloaded.rows] == ["1", "2"]
+
+
+def test_engine_lookup_uses_index(tmp_path):
+    """Lookups return the rows matching the indexed key."""
+    engine = CSVEngine(str(tmp_path))
+    engine.write_rows(
+        "items",
+        [{"id": "1", "kind": "x"}, {"id": "2", "kind": "y"}, {"id": "3", "kind": "x"}],
+    )
+
+    def kind_key(row):
+        return row["kind"]
+
+    rows = engine.lookup("items", "kind", kind_key, "x")
+    assert [row["id"] for row in rows] == ["1", "3"]
+    assert engine.lookup("items", "kind", kind_key, "z") == []
+    assert engine.lookup("missing", "kind", kind_key, "x") == []
+
+
+def test_game_result_repository_indexed_queries(tmp_path):
+    """Game result queries go through the engine indexes."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    repository.create(make_command(1, GameTypeEnum.STAR_11H), session)
+    repository.create(make_command(1, GameTypeEnum.FORTUNE_14H), session)
+    repository.create(make_command(2, GameTypeEnum.STAR_11H), session)
+
+    assert repository.get_by_draw_date(datetime(2025, 3, 2), session).numbers
+    assert len(repository.get_by_type(GameTypeEnum.STAR_11H, session)) == 2
+
+    repository.delete(datetime(2025, 3, 1), GameTypeEnum.STAR_11H, session)
+    remaining = repository.get_by_type(GameTypeEnum.STAR_11H, session)
+    assert [result.draw_date.day for result in remaining] == [2]
+    assert len(repository.get_all(session)) == 2
+
+
+def count_lines(engine: CSVEngine, table_name: str) -> int:
+    """Count the records of a table file, header excluded."""
+    with open(engine.get_file_path(table_name), "r", newline="") as csvfile:
+        return len(csvfile.readlines()) - 1
+
+
+def test_log_structured_engine_appends_updates_and_deletes(tmp_path):
+    """Updates and deletes are appended and resolved on read."""
+    engine = CSVEngine(str(tmp_path), log_structured=True, compaction_min_dead=100)
+    engine.write_rows("items", [{"id": "1", "name": "a"}, {"id": "2", "name": "b"}])
+
+    engine.upsert_rows("items", [{"id": "1", "name": "c"}])
+    engine.delete_rows("items", ["2"])
+
+    assert engine.read_all("items") == [{"id": "1", "name": "c"}]
+    assert count_lines(engine, "items") == 4
+    assert engine.load_table("items").dead_count == 3
+
+
+def test_log_structured_engine_compacts_past_threshold(tmp_path):
+    """Dead records are dropped once they pass the compaction thresholds."""
+    engine = CSVEngine(
+        str(tmp_path),
+        log_structured=True,
+        compaction_ratio=0.5,
+        compaction_min_dead=2,
+        background_compaction=False,
+    )
+    engine.write_rows("items", [{"id": str(i), "name": "a"} for i in range(4)])
+    engine.upsert_rows("items", [{"id": "0", "name": "b"}])
+    assert count_lines(engine, "items") == 5
+
+    engine.delete_rows("items", ["1", "2"])
+
+    assert count_lines(engine, "items") == 2
+    assert engine.read_all("items") == [
+        {"id": "0", "name": "b"},
+        {"id": "3", "name": "a"},
+    ]
+
+
+def test_group_commit_buffers_rows_until_size_threshold(tmp_path):
+    """Group commits are written in one batch once the size threshold is met."""
+    engine = CSVEngine(str(tmp_path))
+    session = CSVSession(
+        engine, group_commit=True, group_commit_size=3, group_commit_interval=60
+    )
+    for index in range(2):
+        session.add("items", {"id": str(index)})
+        session.commit()
+    assert engine.read_all("items") == []
+
+    session.add("items", {"id": "2"})
+    session.commit()
+    assert len(engine.read_all("items")) == 3
+    assert session.flush_stats.rows == 3
+    assert session.flush_stats.flushes == 1
+
+    session.add("items", {"id": "3"})
+    session.commit()
+    session.close()
+    assert len(engine.read_all("items")) == 4
+
+
+def test_game_result_repository_create_many(tmp_path):
+    """create_many writes all the game results with one commit."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+
+    created = repository.create_many(
+        [make_command(day, GameTypeEnum.STAR_18H) for day in range(1, 11)], session
+    )
+
+    assert len(created) == 10
+    assert len(repository.get_by_type(GameTypeEnum.STAR_18H, session)) == 10
+
+
+def test_game_results_are_partitioned_by_month(tmp_path):
+    """Each month goes to its own file, listed in the partition manifest."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    repository.create(make_command(1, GameTypeEnum.STAR_11H), session)
+    repository.create(
+        ExtractGameResultCommand(
+            draw_date=datetime(2025, 4, 2),
+            numbers=[1, 2, 3, 4, 5],
+            bonus=None,
+            type=GameTypeEnum.FORTUNE_18H,
+        ),
+        session,
+    )
+
+    assert (tmp_path / "game_results" / "2025-03.csv").exists()
+    assert (tmp_path / "game_results" / "2025-04.csv").exists()
+    assert repository.tables(session, game_type=GameTypeEnum.FORTUNE_18H) == [
+        "game_results/2025-04"
+    ]
+    assert repository.tables(session, end=datetime(2025, 3, 31)) == [
+        "game_results/2025-03"
+    ]
+
+    # A new process finds the results written by the previous one
+    restarted_session = CSVSession(CSVEngine(str(tmp_path)))
+    assert len(GameResultRepository().get_all(restarted_session)) == 2
+    stats = restarted_session.engine.manifest("game_results").partitions()
+    assert stats["game_results/2025-03"].row_count == 1
+    assert stats["game_results/2025-04"].max_draw_date == "2025-04-02"
+
+
+def test_game_results_round_trip_with_compact_encoding(tmp_path):
+    """Game results are written compactly and read back typed."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    command = make_command(1, GameTypeEnum.STAR_11H)
+    repository.create(command, session)
+
+    content = (tmp_path / "game_results" / "2025-03.csv").read_text()
+    assert ",20148,1-20-30-40-50,," in content
+
+    result = repository.get_by_draw_date(datetime(2025, 3, 1), session)
+    assert result.draw_date == command.draw_date
+    assert result.numbers == command.numbers
+    assert result.bonus is None
+    columns = session.engine.read_columns("game_results/2025-03")
+    assert columns["numbers"] == [[1, 20, 30, 40, 50]]
+
+
+def test_game_results_decode_legacy_encoding(tmp_path):
+    """Files written with ISO dates and list literals are still readable."""
+    (tmp_path / "game_results").mkdir()
+    (tmp_path / "game_results" / "2025-03.csv").write_text(
+        "id,draw_date,numbers,bonus,type\n" '1,2025-03-01,"[1, 2, 3, 4, 5]",,STAR_11H\n'
+    )
+    session = CSVSession(CSVEngine(str(tmp_path)))
+
+    result = GameResultRepository().get_by_draw_date(datetime(2025, 3, 1), session)
+
+    assert result.numbers == [1, 2, 3, 4, 5]
+    assert result.bonus is None
+
+
+def test_query_filter_is_lazy_and_served_from_the_cache(tmp_path):
+    """Filtered queries stop at their limit and parse the file once."""
+    engine = CSVEngine(str(tmp_path))
+    engine.write_rows("items", [{"id": str(i), "kind": "xy"[i % 2]} for i in range(10)])
+    session = CSVSession(engine)
+
+    rows = session.query("items", QueryFilter(equals={"kind": "x"}, limit=2))
+    assert [row["id"] for row in rows] == ["0", "2"]
+    rows = session.query(
+        "items",
+        QueryFilter(between={"id": ("3", "6")}, predicate=lambda r: r["kind"] == "y"),
+    )
+    assert [row["id"] for row in rows] == ["3", "5"]
+    assert (engine.cache_stats.hits, engine.cache_stats.misses) == (1, 1)
+
+
+def append_items(base_dir: str, worker: int):
+    """Append items from another process."""
+    engine = CSVEngine(base_dir)
+    for i in range(20):
+        engine.write_rows("items", [{"id": f"{worker}-{i}", "name": "x" * 200}])
+
+
+def test_concurrent_processes_append_whole_rows(tmp_path):
+    """Appends from several processes are serialized by the file lock."""
+    processes = [
+        multiprocessing.Process(target=append_items, args=(str(tmp_path), worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    rows = CSVEngine(str(tmp_path)).read_all("items")
+    assert len(rows) == 80
+    assert all(row["name"] == "x" * 200 for row in rows)
+
+
+def test_engine_replays_interrupted_append(tmp_path):
+    """An append cut by a crash is finished from its write-ahead file."""
+    engine = CSVEngine(str(tmp_path))
+    engine.write_rows("items", [{"id": "1", "name": "a"}])
+    file_path = tmp_path / "items.csv"
+    offset = file_path.stat().st_size
+    data = b"2,b\r\n3,c\r\n"
+    # The process died after writing the write-ahead file and half the rows
+    (tmp_path / "items.csv.wal").write_bytes(
+        json.dumps({"offset": offset, "length": len(data)}).encode() + b"\n" + data
+    )
+    with open(file_path, "ab") as csvfile:
+        csvfile.write(data[:5])
+
+    rows = CSVEngine(str(tmp_path)).read_all("items")
+
+    assert [row["id"] for row in rows] == ["1", "2", "3"]
+    assert not (tmp_path / "items.csv.wal").exists()
+
+
+def test_engine_drops_torn_write_ahead_file(tmp_path):
+    """An append whose write-ahead file is incomplete never happened."""
+    engine = CSVEngine(str(tmp_path))
+    engine.write_rows("items", [{"id": "1", "name": "a"}])
+    offset = (tmp_path / "items.csv").stat().st_size
+    (tmp_path / "items.csv.wal").write_bytes(
+        json.dumps({"offset": offset, "length": 100}).encode() + b"\n2,b"
+    )
+
+    # Readers of a running engine replay it as well
+    assert [row["id"] for row in engine.read_all("items")] == ["1"]
+    assert not (tmp_path / "items.csv.wal").exists()
+
+
+def test_engine_cache_counts_hits_and_evicts_least_recently_used(tmp_path):
+    """The cache of parsed tables is bounded by its number of records."""
+    engine = CSVEngine(str(tmp_path), cache_max_rows=3)
+    engine.write_rows("a", [{"id": "1"}, {"id": "2"}])
+    engine.write_rows("b", [{"id": "1"}])
+
+    table = engine.load_table("a")
+    engine.load_table("b")
+    assert engine.load_table("a") is table
+    assert engine.cache_stats.hits == 1
+    assert engine.cache_stats.rows == 3
+
+    engine.write_rows("c", [{"id": "1"}])
+    engine.load_table("c")
+    stats = engine.cache_stats
+    assert stats.evictions == 1
+    # b was the least recently used table
+    assert engine.load_table("a") is table
+    assert engine.cache_stats.hits == 2
+
+
+def test_engine_cache_detects_replaced_file(tmp_path):
+    """A file renamed over the cached one is read again."""
+    engine = CSVEngine(str(tmp_path))
+    engine.write_rows("items", [{"id": "1", "name": "x"}])
+    engine.load_table("items")
+    file_path = tmp_path / "items.csv"
+    stat = file_path.stat()
+
+    replacement = tmp_path / "replacement.csv"
+    replacement.write_bytes(file_path.read_bytes().replace(b"x", b"y"))
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, file_path)
+
+    assert engine.read_all("items")[0]["name"] == "y"
+
+
+def test_game_result_upsert_is_idempotent(tmp_path):
+    """Upserting the same results again updates them in place."""
+    session = CSVSession(CSVEngine(str(tmp_path), log_structured=True))
+    repository = GameResultRepository()
+    commands = [make_command(day, GameTypeEnum.STAR_11H) for day in (1, 2)]
+    repository.upsert_many(commands, session)
+
+    commands[0].bonus = 9
+    repository.upsert_many(commands + [make_command(3, GameTypeEnum.STAR_11H)], session)
+
+    results = repository.get_all(session)
+    assert len(results) == 3
+    assert repository.get_by_draw_date(datetime(2025, 3, 1), session).bonus == 9
+    partitions = session.engine.manifest("game_results").partitions()
+    assert partitions["game_results/2025-03"].row_count == 3
+
+
+def test_upserts_normalize_scraped_game_types(tmp_path):
+    """A month with unknown draw names still stores its other results."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    commands = [
+        make_command(1, "FORTUNE_14H_13H"),
+        make_command(2, "LOTO"),
+        make_command(3, GameTypeEnum.STAR_11H),
+    ]
+
+    stored = repository.upsert_many(commands, session)
+
+    assert [result.type for result in stored] == [
+        GameTypeEnum.FORTUNE_14H,
+        GameTypeEnum.STAR_11H,
+    ]
+    assert len(repository.get_all(session)) == 2
+
+
+def test_grouped_upserts_update_buffered_results(tmp_path):
+    """Upserts in one group commit window update the rows not yet written."""
+    session = CSVSession(
+        CSVEngine(str(tmp_path)),
+        group_commit=True,
+        group_commit_size=100,
+        group_commit_interval=60,
+    )
+    repository = GameResultRepository()
+    commands = [make_command(day, GameTypeEnum.STAR_11H) for day in (1, 2)]
+    repository.upsert_many(commands, session)
+    manifest = session.engine.manifest("game_results")
+    assert "game_results/2025-03" not in manifest.partitions()
+
+    commands[0].bonus = 9
+    repository.upsert_many(commands, session)
+    session.close()
+
+    results = repository.get_all(session)
+    assert len(results) == 2
+    assert repository.get_by_draw_date(datetime(2025, 3, 1), session).bonus == 9
+    assert manifest.partitions()["game_results/2025-03"].row_count == 2
+
+
+def test_game_result_range_latest_and_pages(tmp_path):
+    """Ordered reads only need the partitions of the requested draws."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    commands = [
+        ExtractGameResultCommand(
+            draw_date=datetime(2025, month, day),
+            numbers=[day, 20, 30, 40, 50],
+            bonus=None,
+            type=game_type,
+        )
+        for month in (3, 1, 2)
+        for day in (20, 5)
+        for game_type in (GameTypeEnum.STAR_11H, GameTypeEnum.FORTUNE_14H)
+    ]
+    repository.create_many(commands, session)
+
+    in_range = repository.get_range(
+        GameTypeEnum.STAR_11H, datetime(2025, 1, 10), datetime(2025, 2, 28), session
+    )
+    assert [r.draw_date.strftime("%m-%d") for r in in_range] == [
+        "01-20",
+        "02-05",
+        "02-20",
+    ]
+
+    latest = repository.get_latest(GameTypeEnum.FORTUNE_14H, 3, session)
+    assert [r.draw_date.strftime("%m-%d") for r in latest] == [
+        "03-20",
+        "03-05",
+        "02-20",
+    ]
+
+    pages, after = [], None
+    while True:
+        page = repository.get_page(after, 5, session)
+        if not page:
+            break
+        pages.append(page)
+        after = (page[-1].draw_date, page[-1].type)
+    assert [len(page) for page in pages] == [5, 5, 2]
+    keys = [(r.draw_date, r.type.value) for page in pages for r in page]
+    assert keys == sorted(keys) and len(set(keys)) == 12
+
+
+def test_game_results_are_iterated_lazily(tmp_path):
+    """Iterating over all results reads the month partitions one at a time."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    repository.create(make_command(1, GameTypeEnum.STAR_11H), session)
+    repository.create(
+        ExtractGameResultCommand(
+            draw_date=datetime(2025, 4, 1),
+            numbers=[1, 2, 3, 4, 5],
+            bonus=None,
+            type=GameTypeEnum.STAR_11H,
+        ),
+        session,
+    )
+
+    results = repository.iter_all(session)
+
+    assert not isinstance(results, list)
+    assert sorted(result.draw_date for result in results) == [
+        datetime(2025, 3, 1),
+        datetime(2025, 4, 1),
+    ]
+
+
+def test_game_results_containing_numbers(tmp_path):
+    """Draws holding all the numbers are found in the selected partitions."""
+    session = CSVSession(CSVEngine(str(tmp_path)))
+    repository = GameResultRepository()
+    for day in (2, 1):
+        repository.create(make_command(day, GameTypeEnum.STAR_11H), session)
+    repository.create(make_command(1, GameTypeEnum.FORTUNE_14H), session)
+
+    def found(numbers, **filters):
+        results = repository.find_containing(numbers, session, **filters)
+        return [(r.draw_date.day, r.type) for r in results]
+
+    assert found([20, 50]) == [
+        (1, GameTypeEnum.FORTUNE_14H),
+        (1, GameTypeEnum.STAR_11H),
+        (2, GameTypeEnum.STAR_11H),
+    ]
+    assert found([2, 30]) == [(2, GameTypeEnum.STAR_11H)]
+    assert found([1, 20], game_type=GameTypeEnum.STAR_11H) == [
+        (1, GameTypeEnum.STAR_11H)
+    ]
+    assert found([20], date_range=(datetime(2025, 4, 1), datetime(2025, 4, 30))) == []
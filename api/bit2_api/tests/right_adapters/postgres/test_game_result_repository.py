@@ -0,0 +1,99 @@
+"""Tests for the PostgreSQL game result repository."""
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from bit2_api.core.domains.commands import ExtractGameResultCommand
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.right_adapters.postgres.repositories.game_result_repository import (
+    upsert_rows,
+    upsert_statement,
+)
+from bit2_api.right_adapters.postgres.repositories.game_result_statements import (
+    select_all,
+    select_containing,
+    select_page,
+)
+
+
+def test_upsert_statement_updates_on_conflict():
+    """Rows are inserted in one statement, updating the existing results."""
+    values = [
+        {
+            "id": uuid4(),
+            "draw_date": date(2025, 3, day),
+            "numbers": [day, 2, 3, 4, 5],
+            "bonus": None,
+            "type": "STAR_11H",
+        }
+        for day in (1, 2)
+    ]
+
+    sql = str(upsert_statement(values).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("INSERT INTO game.game_result")
+    assert "ON CONFLICT (type, draw_date) DO UPDATE SET" in sql
+    assert "numbers = excluded.numbers" in sql
+    # Unchanged results are not rewritten
+    assert (
+        "WHERE (game.game_result.numbers, game.game_result.bonus) "
+        "IS DISTINCT FROM (excluded.numbers, excluded.bonus)" in sql
+    )
+
+
+def test_upsert_rows_normalize_scraped_game_types():
+    """Draw names repeating their hour are stored, unknown ones are skipped."""
+    commands = [
+        ExtractGameResultCommand(datetime(2025, 3, 1), [1, 2, 3, 4, 5], None, name)
+        for name in ("FORTUNE_18H_18H", "STAR_14H_14H", "LOTO", "STAR_11H")
+    ]
+
+    rows = upsert_rows(commands)
+
+    assert [row["type"] for row in rows] == ["FORTUNE_18H", "STAR_14H", "STAR_11H"]
+
+
+def test_page_statement_uses_keyset():
+    """Pages start after the (draw date, type) of the previous page."""
+    statement = select_page((date(2025, 3, 1), GameTypeEnum.STAR_11H), 50)
+
+    sql = str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    assert (
+        "WHERE (game.game_result.draw_date, game.game_result.type) > "
+        "('2025-03-01', 'STAR_11H')" in sql
+    )
+    assert " ".join(sql.split()).endswith(
+        "ORDER BY game.game_result.draw_date, game.game_result.type LIMIT 50"
+    )
+
+
+def test_full_history_statement_is_streamed():
+    """All results are read in batches from a server-side cursor, in order."""
+    statement = select_all(batch_size=200)
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert statement.get_execution_options()["yield_per"] == 200
+    assert " ".join(sql.split()).endswith(
+        "ORDER BY game.game_result.draw_date, game.game_result.type"
+    )
+
+
+def test_containing_statement_uses_array_containment():
+    """Draws are searched with @>, which the GIN index of the numbers serves."""
+    statement = select_containing([17, 42], game_type=GameTypeEnum.STAR_11H)
+
+    sql = str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    assert "game.game_result.numbers @> ARRAY[17, 42]" in sql
+    assert "game.game_result.type = 'STAR_11H'" in sql
@@ -0,0 +1,26 @@
+"""Tests for the connection pool metrics."""
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from bit2_api.right_adapters.postgres.pool import PoolMetrics
+
+
+def test_pool_metrics_count_checkouts(tmp_path):
+    """Checkouts, connections and waits are counted."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", pool_size=2)
+    metrics = PoolMetrics()
+    make_session = sessionmaker(bind=engine)
+    metrics.listen(engine, make_session)
+
+    for _ in range(3):
+        db_session = make_session()
+        db_session.execute(text("SELECT 1"))
+        db_session.close()
+    # Sessions running no statement do not check a connection out
+    make_session().close()
+
+    counters = metrics.to_dict(engine)
+    assert counters["checkouts"] == 3
+    assert counters["connects"] == 1
+    assert counters["checkedout"] == 0
+    assert counters["wait_seconds"] >= counters["max_wait_seconds"] > 0
@@ -0,0 +1,31 @@
+"""Checks of the plans of the game result queries, on the migrated database."""
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from bit2_api.right_adapters.postgres.query_plans import plan_nodes, sequential_scans
+
+
+def test_plan_nodes_walks_children():
+    """Every node of a plan is visited."""
+    plan = {
+        "Node Type": "Limit",
+        "Plans": [{"Node Type": "Index Scan", "Plans": [{"Node Type": "Sort"}]}],
+    }
+    assert [node["Node Type"] for node in plan_nodes(plan)] == [
+        "Limit",
+        "Index Scan",
+        "Sort",
+    ]
+
+
+@pytest.mark.skipif(
+    "DATABASE_URL" not in os.environ, reason="needs the Postgres database"
+)
+def test_repository_queries_use_indexes():
+    """No repository query reads the game results sequentially."""
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with sessionmaker(bind=engine)() as db_session:
+        assert sequential_scans(db_session) == {}
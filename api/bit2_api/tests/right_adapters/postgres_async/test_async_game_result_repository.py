@@ -0,0 +1,69 @@
+"""Tests for the asynchronous PostgreSQL game result repository."""
+
+import asyncio
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from bit2_api.core.domains.utils import GameTypeEnum
+from bit2_api.right_adapters.postgres.repositories.game_result_statements import (
+    select_page,
+)
+from bit2_api.right_adapters.postgres_async import (
+    AsyncGameResultRepository,
+    AsyncGameStatisticsRepository,
+)
+
+
+def compile_sql(statement) -> str:
+    """SQL of a statement, with its parameters"""
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+class RecordingSession:
+    """Asynchronous session recording the statements it runs"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def scalars(self, statement):
+        """Record the statement, which selects nothing"""
+        self.statements.append(statement)
+        return self
+
+    def all(self):
+        """The rows of the last statement"""
+        return []
+
+
+def test_reads_run_the_shared_statements():
+    """The asynchronous reads run the statements checked against the indexes."""
+    after = (date(2025, 3, 1), GameTypeEnum.STAR_11H)
+    session = RecordingSession()
+
+    asyncio.run(AsyncGameResultRepository().get_page(after, 50, session))
+
+    assert [compile_sql(statement) for statement in session.statements] == [
+        compile_sql(select_page(after, 50))
+    ]
+
+
+def test_pair_statistics_are_read_from_the_aggregates():
+    """The most frequent pairs are read from the pre-aggregated table."""
+    statement = AsyncGameStatisticsRepository.select_pair_statistics(
+        GameTypeEnum.STAR_11H, 20
+    )
+
+    sql = " ".join(compile_sql(statement).split())
+
+    assert "FROM game.number_pair_statistic" in sql
+    assert "game_result" not in sql
+    assert sql.endswith(
+        "ORDER BY game.number_pair_statistic.draw_count DESC, "
+        "game.number_pair_statistic.first_number, "
+        "game.number_pair_statistic.second_number LIMIT 20"
+    )
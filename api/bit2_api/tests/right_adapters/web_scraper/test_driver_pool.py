@@ -0,0 +1,124 @@
+"""Tests for the pool of WebDriver sessions."""
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from bit2_api.core.domains.errors import ScraperUnavailableError
+from bit2_api.right_adapters.web_scraper import (
+    MonthFingerprints,
+    ScraperRepository,
+    WebDriverPool,
+)
+
+
+class FakeDriver:
+    """Driver answering until it is broken"""
+
+    def __init__(self):
+        self.broken = False
+        # Whether its pages fail to load, while it still answers
+        self.timing_out = False
+        self.quit_count = 0
+
+    @property
+    def current_url(self):
+        if self.broken:
+            raise WebDriverException("session deleted")
+        return "about:blank"
+
+    def get(self, url):
+        if self.timing_out:
+            raise TimeoutException("page did not load")
+
+    def quit(self):
+        self.quit_count += 1
+
+
+class FakeDriverFactory:
+    """Factory keeping the drivers it opened"""
+
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        self.drivers.append(FakeDriver())
+        return self.drivers[-1]
+
+
+def test_pool_reuses_and_recycles_sessions():
+    """Sessions are reused until they served max_uses scrapes."""
+    factory = FakeDriverFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=2, checkout_timeout=0)
+
+    for _ in range(3):
+        with pool.checkout():
+            pass
+
+    assert len(factory.drivers) == 2
+    assert factory.drivers[0].quit_count == 1
+    metrics = pool.get_metrics()
+    assert (metrics["created"], metrics["reused"], metrics["recycled"]) == (2, 1, 1)
+    assert (metrics["open"], metrics["idle"]) == (1, 1)
+
+
+def test_pool_replaces_unhealthy_and_failed_sessions():
+    """Unresponsive sessions and the ones a scrape failed with are closed."""
+    factory = FakeDriverFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=10, checkout_timeout=0)
+    with pool.checkout():
+        pass
+    factory.drivers[0].broken = True
+
+    with pytest.raises(RuntimeError):
+        with pool.checkout() as driver:
+            assert driver is factory.drivers[1]
+            raise RuntimeError("page crashed")
+
+    assert [driver.quit_count for driver in factory.drivers] == [1, 1]
+    assert pool.get_metrics()["discarded"] == 2
+    assert pool.get_metrics()["open"] == 0
+
+
+def test_scraper_errors_discard_the_session():
+    """A session a scrape failed with is not handed out again."""
+    factory = FakeDriverFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=10, checkout_timeout=0)
+    scraper = ScraperRepository(pool, MonthFingerprints())
+    with pool.checkout() as driver:
+        driver.timing_out = True
+
+    assert scraper.fetch_results("mars 2025", draw="") == []
+    assert factory.drivers[0].quit_count == 1
+    assert pool.get_metrics()["discarded"] == 1
+    assert pool.get_metrics()["open"] == 0
+
+
+def test_pool_checkout_times_out_when_exhausted():
+    """A checkout waits for a session and fails past its timeout."""
+    factory = FakeDriverFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=10, checkout_timeout=0.05)
+    with pool.checkout():
+        with pytest.raises(ScraperUnavailableError):
+            with pool.checkout():
+                pass
+    assert pool.get_metrics()["timeouts"] == 1
+
+    # A waiting checkout gets the session once it is released
+    released = threading.Event()
+    pool.checkout_timeout = 5
+    with pool.checkout() as first:
+
+        def borrow():
+            with pool.checkout() as second:
+                assert second is first
+            released.set()
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+    thread.join()
+    assert released.is_set()
+    assert len(factory.drivers) == 1
+
+    pool.close()
+    assert factory.drivers[0].quit_count == 1
@@ -0,0 +1,71 @@
+"""Tests for the fingerprints of the scraped months."""
+from datetime import date
+
+from bit2_api.core.domains.models import GameResult
+from bit2_api.right_adapters.web_scraper import MonthFingerprints
+
+
+def make_result(day: int, numbers):
+    return GameResult(
+        draw_date=date(2025, 3, day), numbers=numbers, bonus=None, type="STAR_11H"
+    )
+
+
+class CountingParser:
+    """Parser of "day:numbers" lines, counting its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, raw):
+        self.calls += 1
+        return [
+            make_result(int(day), [int(n) for n in numbers.split(",")])
+            for day, numbers in (line.split(":") for line in raw.split())
+        ]
+
+
+def test_unchanged_content_is_not_parsed_again():
+    """The same raw content is compared by its hash only."""
+    fingerprints = MonthFingerprints()
+    parse = CountingParser()
+
+    first = fingerprints.compare(("mars 2025", ""), "1:1,2", parse)
+    fingerprints.commit(first)
+    again = fingerprints.compare(("mars 2025", ""), "1:1,2", parse)
+
+    assert first.changed and len(first.new) == 1
+    assert not again.changed and not again.raw_changed
+    assert again.results == first.results
+    assert parse.calls == 1
+
+
+def test_only_new_and_corrected_draws_are_new():
+    """Draws added or whose numbers changed make the delta."""
+    fingerprints = MonthFingerprints()
+    parse = CountingParser()
+    fingerprints.commit(fingerprints.compare("mars 2025", "1:1,2 2:3,4", parse))
+
+    # Markup changes which leave the results as they were
+    reordered = fingerprints.compare("mars 2025", "2:3,4   1:1,2", parse)
+    assert reordered.raw_changed and not reordered.changed
+
+    changes = fingerprints.compare("mars 2025", "1:1,2 2:3,5 3:6,7", parse)
+    assert changes.changed
+    assert [result.draw_date.day for result in changes.new] == [2, 3]
+
+    fingerprints.forget("mars 2025")
+    assert len(fingerprints.compare("mars 2025", "1:1,2", parse).new) == 1
+
+
+def test_uncommitted_changes_are_reported_again():
+    """A scrape whose results were not saved leaves the month changed."""
+    fingerprints = MonthFingerprints()
+    parse = CountingParser()
+    fingerprints.commit(fingerprints.compare("mars 2025", "1:1,2", parse))
+
+    unsaved = fingerprints.compare("mars 2025", "1:1,2 2:3,4", parse)
+    again = fingerprints.compare("mars 2025", "1:1,2 2:3,4", parse)
+
+    assert unsaved.changed and again.changed
+    assert [result.draw_date.day for result in again.new] == [2]
@@ -0,0 +1,218 @@
+"""Tests for the scraper of the Next.js page data."""
+import json
+import threading
+from datetime import date
+
+import httpx
+
+from bit2_api.right_adapters.web_scraper import (
+    MonthFingerprints,
+    NextDataScraperRepository,
+    parse_next_data,
+    results_from_next_data,
+)
+
+BASE_URL = "https://www.lnbloto.bj/resultats"
+
+
+def week(start: str, end: str, day: str, draw_name: str, numbers: str):
+    """A week of the results data, with a single draw"""
+    return {
+        "startDate": start,
+        "endDate": end,
+        "drawResultsDaily": [
+            {
+                "date": day,
+                "drawResults": {
+                    "standardDraws": [
+                        {"drawName": draw_name, "winningNumbers": numbers}
+                    ],
+                    "nightDraws": [{"drawName": "Digital 00H", "winningNumbers": "ND"}],
+                },
+            }
+        ],
+    }
+
+
+def page_data(*weeks, build_id="build-1"):
+    """The __NEXT_DATA__ of a results page"""
+    return {
+        "buildId": build_id,
+        "props": {"pageProps": {"resultsData": {"drawsResultsWeekly": list(weeks)}}},
+    }
+
+
+def page_html(data) -> str:
+    """A results page embedding data"""
+    return (
+        "<html><body><div id='__next'></div>"
+        f"<script id='__NEXT_DATA__' type='application/json'>{json.dumps(data)}"
+        "</script></body></html>"
+    )
+
+
+MARCH = week("03/03/2025", "09/03/2025", "lundi 03/03", "Fortune 14H", "1-2-3-4-5")
+FEBRUARY = week(
+    "03/02/2025", "09/02/2025", "mardi 04/02", "Star 11H", "10 - 20-30-40-90"
+)
+
+
+class FakeFallback:
+    """Scraper standing for the browser"""
+
+    def __init__(self):
+        self.months = []
+
+    def fetch_results(self, month, draw="", wait_time=1):
+        self.months.append(month)
+        return []
+
+
+def make_scraper(handler, fallback=None):
+    """Scraper whose requests are answered by handler"""
+    return NextDataScraperRepository(
+        fallback=fallback or FakeFallback(),
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        fingerprints=MonthFingerprints(),
+    )
+
+
+def test_results_from_next_data():
+    """Draws are read with the names of the Selenium scraper."""
+    data = parse_next_data(page_html(page_data(MARCH, FEBRUARY)))
+    results = results_from_next_data(data)
+    assert [(r.draw_date, r.type, r.numbers) for r in results] == [
+        (date(2025, 3, 3), "FORTUNE_14H", [1, 2, 3, 4, 5]),
+        (date(2025, 2, 4), "STAR_11H", [10, 20, 30, 40, 90]),
+    ]
+
+
+def test_current_month_is_read_from_the_page(tmp_path, monkeypatch):
+    """The month shown by the page costs a single request."""
+    monkeypatch.chdir(tmp_path)
+    requests = []
+
+    def handler(request):
+        requests.append(request.url)
+        return httpx.Response(200, text=page_html(page_data(MARCH)))
+
+    scraper = make_scraper(handler)
+    results = scraper.fetch_results("mars 2025", draw="")
+
+    assert len(results) == 1 and scraper.last_source == "http"
+    assert len(requests) == 1
+    assert list((tmp_path / "data" / "mars 2025").iterdir())
+
+
+def test_other_months_are_read_from_the_data_route(tmp_path, monkeypatch):
+    """Other months are read from the data route of the page build."""
+    monkeypatch.chdir(tmp_path)
+    requests = []
+
+    def handler(request):
+        requests.append(request.url)
+        if request.url.path == "/_next/data/build-1/resultats.json":
+            return httpx.Response(
+                200, json={"pageProps": page_data(FEBRUARY)["props"]["pageProps"]}
+            )
+        return httpx.Response(200, text=page_html(page_data(MARCH)))
+
+    scraper = make_scraper(handler)
+    results = scraper.fetch_results("février 2025", draw="star")
+
+    assert [result.type for result in results] == ["STAR_11H"]
+    assert requests[1].params["month"] == "février 2025"
+
+
+def test_shared_scraper_reuses_the_build_of_the_site(tmp_path, monkeypatch):
+    """Scrapes sharing a scraper read the page once, each their own outcome."""
+    monkeypatch.chdir(tmp_path)
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if request.url.path == "/_next/data/build-1/resultats.json":
+            return httpx.Response(200, json=page_data(FEBRUARY)["props"])
+        return httpx.Response(200, text=page_html(page_data(MARCH)))
+
+    scraper = make_scraper(handler)
+    scraper.fetch_results("février 2025", draw="")
+    scraper.fetch_results("février 2025", draw="")
+    assert requests == ["/resultats"] + ["/_next/data/build-1/resultats.json"] * 2
+
+    thread = threading.Thread(target=scraper.fetch_results, args=("janvier 2025",))
+    thread.start()
+    thread.join()
+    assert scraper.last_source == "http"
+
+
+def test_falls_back_to_the_browser(tmp_path, monkeypatch):
+    """Months the page data does not hold are scraped by the fallback."""
+    monkeypatch.chdir(tmp_path)
+
+    def handler(request):
+        if request.url.path.startswith("/_next/data/"):
+            return httpx.Response(404)
+        return httpx.Response(200, text=page_html(page_data(MARCH)))
+
+    fallback = FakeFallback()
+    scraper = make_scraper(handler, fallback)
+    assert scraper.fetch_results("janvier 2025", draw="") == []
+    assert scraper.last_source == "browser"
+
+    broken = make_scraper(lambda request: httpx.Response(503), fallback)
+    broken.fetch_results("mars 2025", draw="")
+    assert fallback.months == ["janvier 2025", "mars 2025"]
+
+
+def test_unchanged_months_are_not_saved_again(tmp_path, monkeypatch):
+    """Only the draws added since the last scrape are reported as new."""
+    monkeypatch.chdir(tmp_path)
+    weeks = [MARCH]
+
+    def handler(request):
+        data = page_data(*weeks)
+        if request.url.path.startswith("/_next/data/"):
+            return httpx.Response(200, json=data["props"])
+        return httpx.Response(200, text=page_html(data))
+
+    scraper = make_scraper(handler)
+    scraper.fetch_results("mars 2025", draw="")
+    assert len(scraper.last_changes.new) == 1
+    scraper.fetch_results("mars 2025", draw="")
+    assert scraper.last_changes.new == [] and not scraper.last_changes.changed
+
+    weeks.append(
+        week("10/03/2025", "16/03/2025", "lundi 10/03", "Star 11H", "7-8-9-10-11")
+    )
+    results = scraper.fetch_results("mars 2025", draw="")
+    assert len(results) == 2
+    assert [result.type for result in scraper.last_changes.new] == ["STAR_11H"]
+    assert len(list((tmp_path / "data" / "mars 2025").iterdir())) == 2
+
+
+def test_changes_are_reset_and_committed_by_the_caller(tmp_path, monkeypatch):
+    """A scrape not committing its fingerprints reports its month changed again."""
+    monkeypatch.chdir(tmp_path)
+
+    def handler(request):
+        data = page_data(MARCH)
+        if request.url.path.startswith("/_next/data/"):
+            return httpx.Response(200, json=data["props"])
+        return httpx.Response(200, text=page_html(data))
+
+    scraper = make_scraper(handler)
+    scraper.commit_fingerprints = False
+    scraper.fetch_results("mars 2025", draw="")
+    scraper.fetch_results("mars 2025", draw="")
+    assert scraper.last_changes.changed
+
+    scraper.fingerprints.commit(scraper.last_changes)
+    scraper.fetch_results("mars 2025", draw="")
+    assert not scraper.last_changes.changed
+
+    scraper.http_client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(503))
+    )
+    scraper.fetch_results("mars 2025", draw="")
+    assert scraper.last_changes is None
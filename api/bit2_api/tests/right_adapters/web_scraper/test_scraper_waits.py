@@ -0,0 +1,78 @@
+"""Tests for the waits of the scraper on the rendering of the results."""
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from bit2_api.right_adapters.web_scraper import (
+    PhaseTimer,
+    shows_month,
+    wait_for_container,
+)
+
+FEBRUARY = "<div><h4>Semaine du 24/02/2025 au 02/03/2025</h4></div>"
+MARCH = "<div><h4>Semaine du 03/03/2025 au 09/03/2025</h4></div>"
+JANUARY = "<div><h4>Semaine du 06/01/2025 au 12/01/2025</h4></div>"
+
+
+class FakeElement:
+    def __init__(self, html):
+        self.html = html
+
+    def get_attribute(self, name):
+        assert name == "innerHTML"
+        return self.html
+
+
+class FakeDriver:
+    """Driver whose results container goes through the given renders"""
+
+    def __init__(self, renders):
+        self.renders = list(renders)
+        self.reads = 0
+
+    def find_element(self, by, value):
+        html = self.renders[min(self.reads, len(self.renders) - 1)]
+        self.reads += 1
+        return FakeElement(html)
+
+
+def test_shows_month_matches_week_header_dates():
+    """A week overlapping the month shows it."""
+    assert shows_month(FEBRUARY, "mars 2025")
+    assert shows_month(MARCH, "Mars 2025")
+    assert not shows_month(JANUARY, "mars 2025")
+    assert shows_month('<div><h4 class="week">du 03/03/2025</h4></div>', "mars 2025")
+    assert not shows_month("<p>03/03/2025</p>", "mars 2025")
+
+
+def test_wait_for_container_returns_once_settled():
+    """The html is returned once the month shows and it stops changing."""
+    driver = FakeDriver([JANUARY, MARCH, MARCH + "<p>1</p>", MARCH + "<p>1</p>"])
+    html = wait_for_container(driver, "mars 2025", timeout=5, poll_interval=0.001)
+    assert html == MARCH + "<p>1</p>"
+    assert driver.reads == 4
+
+
+def test_wait_for_container_ceiling():
+    """Past the ceiling, a page showing the month is used as it is."""
+    counter = iter(range(10**6))
+    driver = FakeDriver([])
+    driver.find_element = lambda by, value: FakeElement(f"{MARCH}{next(counter)}")
+    html = wait_for_container(driver, "mars 2025", timeout=0.05, poll_interval=0.01)
+    assert html.startswith(MARCH)
+
+    with pytest.raises(TimeoutException):
+        wait_for_container(
+            FakeDriver([JANUARY]), "mars 2025", timeout=0.05, poll_interval=0.01
+        )
+
+
+def test_phase_timer_keeps_phase_order():
+    """Phases are timed in the order they ran, even when failing."""
+    timer = PhaseTimer()
+    with timer.phase("page_load"):
+        pass
+    with pytest.raises(ValueError):
+        with timer.phase("select"):
+            raise ValueError
+    assert list(timer.timings) == ["page_load", "select"]
+    assert all(seconds >= 0 for seconds in timer.timings.values())
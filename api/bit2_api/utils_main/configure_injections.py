@@ -1,11 +1,19 @@
 """
 This module configures the dependency injection for the application.
 """
+
 import inject
 
-from bit2_api.right_adapters.csv.db import DatabaseClient
-from bit2_api.right_adapters.csv.repositories import GameResultRepository
-from bit2_api.utils_main.get_dep_inject_config import get_dependencies_injection_config
+from bit2_api.core.domains.utils import get_env_variable
+from bit2_api.right_adapters.caching import ResultCache
+from bit2_api.utils_main.get_dep_inject_config import (
+    AsyncAdapters,
+    get_dependencies_injection_config,
+)
+
+# Storage of the game results, "csv" files or a "postgres" database.
+# The read endpoints and the statistics are served by Postgres only.
+STORAGE_BACKEND = get_env_variable("STORAGE_BACKEND", default="csv")
 
 
 def configure_injections() -> None:
@@ -13,10 +21,45 @@ def configure_injections() -> None:
     Configure the injections for the application.
     This function sets up the dependency injection for the application
     using the inject library.
+    The adapters of the storage backend are imported here, so that the
+    application is imported without a database url in CSV mode.
     """
-    inject.configure(
-        get_dependencies_injection_config(
-            DatabaseClient,
-            GameResultRepository,
+    # pylint: disable=import-outside-toplevel
+    if STORAGE_BACKEND == "postgres":
+        from bit2_api.right_adapters.postgres.db import DatabaseClient
+        from bit2_api.right_adapters.postgres.repositories import GameResultRepository
+        from bit2_api.right_adapters.postgres_async import (
+            AsyncGameResultRepository,
+            AsyncGameStatisticsRepository,
+        )
+        from bit2_api.right_adapters.postgres_async.db import AsyncDatabaseClient
+
+        inject.configure(
+            get_dependencies_injection_config(
+                # The scraped results are written to the database the read
+                # endpoints and the statistics triggers are served from
+                DatabaseClient,
+                GameResultRepository,
+                # Read endpoints await Postgres without holding threads
+                AsyncAdapters(
+                    AsyncDatabaseClient,
+                    AsyncGameResultRepository,
+                    AsyncGameStatisticsRepository,
+                ),
+                # Reads are served from memory between the draws
+                ResultCache(),
+            )
+        )
+    elif STORAGE_BACKEND == "csv":
+        from bit2_api.right_adapters.csv.db import DatabaseClient
+        from bit2_api.right_adapters.csv.repositories import GameResultRepository
+
+        inject.configure(
+            get_dependencies_injection_config(
+                DatabaseClient,
+                GameResultRepository,
+                GameResultCache=ResultCache(),
+            )
         )
-    )
+    else:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
@@ -4,7 +4,13 @@
 from fastapi import FastAPI
 from fastapi_versioning import VersionedFastAPI
 
-from bit2_api.left_adapters.api.routes import scraper_router
+from bit2_api.left_adapters.api.routes import (
+    database_router,
+    game_result_router,
+    game_statistics_router,
+    scraper_router,
+)
+from bit2_api.utils_main.configure_injections import STORAGE_BACKEND
 
 
 def create_app() -> VersionedFastAPI:
@@ -18,6 +24,23 @@ def create_app() -> VersionedFastAPI:
         prefix="/api",
         tags=["Game Results"],
     )
+    if STORAGE_BACKEND == "postgres":
+        # The read endpoints and the statistics are served by Postgres
+        fast_api_app.include_router(
+            game_result_router.router,
+            prefix="/api",
+            tags=["Game Results"],
+        )
+        fast_api_app.include_router(
+            game_statistics_router.router,
+            prefix="/api",
+            tags=["Game Statistics"],
+        )
+    fast_api_app.include_router(
+        database_router.router,
+        prefix="/api",
+        tags=["Database"],
+    )
 
     fast_api_versioned_app = VersionedFastAPI(
         fast_api_app,
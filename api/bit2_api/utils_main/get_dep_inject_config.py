@@ -1,23 +1,100 @@
 """This file contains the function that will be used by the dependency"""
-from bit2_api.core.use_cases import ExtractGameResult
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from bit2_api.core.ports import (
+    IAsyncDatabaseClientRepository,
+    IDatabaseClientRepository,
+)
+from bit2_api.core.use_cases import (
+    AsyncExtractGameResult,
+    AsyncGetGameResults,
+    AsyncGetGameStatistics,
+    ExtractGameResult,
+)
+from bit2_api.right_adapters.caching import (
+    AsyncCachingGameResultRepository,
+    CachingGameResultRepository,
+    ResultCache,
+)
 
 
 # pylint: disable=invalid-name
+@dataclass
+class AsyncAdapters:
+    """
+    The adapters of the asynchronous use cases, classes or, when testing,
+    instances. The statistics use case is bound when its repository is given.
+    """
+
+    DatabaseClient: Any
+    GameResultRepository: Any
+    GameStatisticsRepository: Optional[Any] = None
+
+
+def cached_provider(CachingRepository, Repository, cache, for_testing: bool):
+    """
+    The provider of a caching repository wrapping Repository, an instance
+    when testing, a factory otherwise
+    """
+    if for_testing:
+        return CachingRepository(Repository, cache)
+    return lambda: CachingRepository(Repository(), cache)
+
+
 def get_dependencies_injection_config(
     DatabaseClient,
     GameResultRepository,
+    async_adapters: Optional[AsyncAdapters] = None,
+    GameResultCache=None,
     for_testing: bool = False,
 ):
     """
     This function returns a function that will be used by the dependency
     injection library to configure the dependencies injection.
+    The asynchronous use cases are bound when their adapters are given.
+    Given a result cache, the game result repositories are wrapped by caching
+    repositories sharing it, each keying its results by its repository class.
     """
 
+    AsyncDatabaseClient = AsyncGameResultRepository = None
+    AsyncGameStatisticsRepository = None
+    if async_adapters is not None:
+        AsyncDatabaseClient = async_adapters.DatabaseClient
+        AsyncGameResultRepository = async_adapters.GameResultRepository
+        AsyncGameStatisticsRepository = async_adapters.GameStatisticsRepository
+
+    if GameResultCache is not None:
+        GameResultRepository = cached_provider(
+            CachingGameResultRepository,
+            GameResultRepository,
+            GameResultCache,
+            for_testing,
+        )
+        if AsyncGameResultRepository is not None:
+            AsyncGameResultRepository = cached_provider(
+                AsyncCachingGameResultRepository,
+                AsyncGameResultRepository,
+                GameResultCache,
+                for_testing,
+            )
+
     def configure_dependencies_injection(binder):
         """
         Configure dependencies injections
         """
 
+        # Use cases open their sessions from the database client on each
+        # execution, the client is also used for its metrics
+        binder.bind(
+            IDatabaseClientRepository,
+            DatabaseClient if for_testing else DatabaseClient(),
+        )
+        if GameResultCache is not None:
+            # The cache is also used for its metrics
+            binder.bind(ResultCache, GameResultCache)
+
         use_case_bindings = [
             # Game result use cases
             {
@@ -29,6 +106,34 @@ def get_dependencies_injection_config(
             },
         ]
 
+        if AsyncGameResultRepository is not None:
+            binder.bind(
+                IAsyncDatabaseClientRepository,
+                AsyncDatabaseClient if for_testing else AsyncDatabaseClient(),
+            )
+            use_case_bindings.append(
+                # Asynchronous game result use cases
+                {
+                    "use_cases": [AsyncExtractGameResult, AsyncGetGameResults],
+                    "providers": [
+                        AsyncGameResultRepository,
+                        AsyncDatabaseClient,
+                    ],
+                },
+            )
+
+        if AsyncGameStatisticsRepository is not None:
+            use_case_bindings.append(
+                # Statistics of the drawn numbers
+                {
+                    "use_cases": [AsyncGetGameStatistics],
+                    "providers": [
+                        AsyncGameStatisticsRepository,
+                        AsyncDatabaseClient,
+                    ],
+                },
+            )
+
         for use_case_binding in use_case_bindings:
             for use_case in use_case_binding["use_cases"]:
                 # If we are in testing mode, we don't want to instantiate the providers
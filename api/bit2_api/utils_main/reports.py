@@ -0,0 +1,20 @@
+"""
+Output of the reports of the command line tools
+"""
+import json
+from typing import Any, Dict, Optional
+
+
+def command_description(doc: str) -> str:
+    """The first paragraph of the docstring of a command line module"""
+    return doc.partition("\n\n")[0]
+
+
+def write_report(report: Dict[str, Any], output: Optional[str] = None):
+    """Write a report as JSON to the file output, or to the standard output"""
+    content = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as output_file:
+            output_file.write(content + "\n")
+    else:
+        print(content)
@@ -4,7 +4,8 @@ from datetime import date
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from bit2_api.right_adapters.web_scraper import ScraperRepository
+from bit2_api.core.domains.errors import ScraperUnavailableError
+from bit2_api.right_adapters.web_scraper import NextDataScraperRepository
 
 MONTH = [
     "janvier",
@@ -44,6 +45,9 @@ print(f"Current month in French: {current_month}")
 # current_month = "mars 2025"  # For testing, you can set a specific month and year
 current_draw = ""  # Optionally, set a draw filter like "Fortune" or "Star" if needed
 wait_time = 1  # Default wait time for Selenium operations
+# Kept across the jobs, which reuse its connections. Falls back to the
+# browser sessions shared with the API
+scraper = NextDataScraperRepository()
 
 
 # Configure logging
@@ -75,12 +79,22 @@ def scrape_job():
     """Job to scrape game results for the current month, then update to the previous month if new results exist."""
 
     global current_month, wait_time, current_draw
-    scraper = ScraperRepository()
     logger.info("Initiating scrape...")
-    results = scraper.fetch_results(
-        current_month, draw=current_draw, wait_time=wait_time
-    )
+    try:
+        results = scraper.fetch_results(
+            current_month, draw=current_draw, wait_time=wait_time
+        )
+    except ScraperUnavailableError:
+        # The month is scraped again on the next run
+        logger.warning("No browser session available, skipping %s", current_month)
+        return
     logger.info(f"Scraped {len(results)} results for month: {current_month}")
+    if scraper.last_changes is not None and not scraper.last_changes.changed:
+        logger.info("No new results for month: %s", current_month)
+    elif scraper.last_changes is not None:
+        logger.info(
+            "%d new results for month: %s", len(scraper.last_changes.new), current_month
+        )
     # Process the results as needed
 
     # Here, you can store the results or process them further.
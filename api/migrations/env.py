@@ -0,0 +1,46 @@
+"""
+Alembic environment, migrating the database of DATABASE_URL
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from bit2_api.core.domains.utils import get_env_variable
+from bit2_api.right_adapters.postgres.models import BaseModel
+
+if context.config.config_file_name is not None:
+    fileConfig(context.config.config_file_name)
+
+target_metadata = BaseModel.metadata
+
+
+def run_migrations_offline():
+    """Write the SQL of the migrations instead of running them"""
+    context.configure(
+        url=get_env_variable("DATABASE_URL"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_schemas=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Run the migrations on the database"""
+    connectable = create_engine(get_env_variable("DATABASE_URL"))
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_schemas=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
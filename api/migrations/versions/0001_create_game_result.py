@@ -0,0 +1,40 @@
+"""Create the game schema and the game_result table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE SCHEMA IF NOT EXISTS game")
+    op.create_table(
+        "game_result",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "created_at", sa.TIMESTAMP(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.TIMESTAMP(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("draw_date", sa.Date(), nullable=False),
+        sa.Column("numbers", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("bonus", sa.Integer(), nullable=True),
+        sa.Column("type", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        schema="game",
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table("game_result", schema="game")
+    op.execute("DROP SCHEMA IF EXISTS game")
@@ -0,0 +1,48 @@
+"""Index the game results on their game type, draw date and numbers
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Results stored more than once by earlier scrapes: keep the latest
+    op.execute(
+        """
+        DELETE FROM game.game_result AS result
+        USING game.game_result AS newer
+        WHERE result.type = newer.type
+          AND result.draw_date = newer.draw_date
+          AND (result.updated_at, result.id) < (newer.updated_at, newer.id)
+        """
+    )
+    op.create_index(
+        "ix_game_result_type_draw_date",
+        "game_result",
+        ["type", "draw_date"],
+        unique=True,
+        schema="game",
+    )
+    op.create_index(
+        "ix_game_result_draw_date", "game_result", ["draw_date"], schema="game"
+    )
+    op.create_index(
+        "ix_game_result_numbers",
+        "game_result",
+        ["numbers"],
+        postgresql_using="gin",
+        schema="game",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_game_result_numbers", "game_result", schema="game")
+    op.drop_index("ix_game_result_draw_date", "game_result", schema="game")
+    op.drop_index("ix_game_result_type_draw_date", "game_result", schema="game")
@@ -0,0 +1,29 @@
+"""Extend the draw date index with the game type, for paginated reads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_game_result_draw_date_type",
+        "game_result",
+        ["draw_date", "type"],
+        schema="game",
+    )
+    op.drop_index("ix_game_result_draw_date", "game_result", schema="game")
+
+
+def downgrade():
+    op.create_index(
+        "ix_game_result_draw_date", "game_result", ["draw_date"], schema="game"
+    )
+    op.drop_index("ix_game_result_draw_date_type", "game_result", schema="game")
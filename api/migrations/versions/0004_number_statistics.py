@@ -0,0 +1,166 @@
+"""Keep per number and per pair statistics of the game results up to date
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# Applies the changes of a game result row to the statistics of its numbers.
+# The counts of the old row are removed and the ones of the new row added, so
+# upserts that rewrite a result leave the statistics as they were.
+UPDATE_NUMBER_STATISTICS = """
+CREATE FUNCTION game.update_number_statistics() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE game.number_statistic AS statistic
+        SET draw_count = statistic.draw_count - 1
+        WHERE statistic.type = OLD.type
+          AND statistic.number IN (SELECT DISTINCT unnest(OLD.numbers));
+
+        UPDATE game.number_pair_statistic AS statistic
+        SET draw_count = statistic.draw_count - 1
+        FROM (
+            SELECT DISTINCT low.number AS first_number,
+                            high.number AS second_number
+            FROM unnest(OLD.numbers) AS low(number),
+                 unnest(OLD.numbers) AS high(number)
+            WHERE low.number < high.number
+        ) AS pair
+        WHERE statistic.type = OLD.type
+          AND statistic.first_number = pair.first_number
+          AND statistic.second_number = pair.second_number;
+
+        DELETE FROM game.number_statistic
+        WHERE type = OLD.type AND draw_count <= 0;
+        DELETE FROM game.number_pair_statistic
+        WHERE type = OLD.type AND draw_count <= 0;
+
+        -- The draw removed was the last one of some numbers
+        UPDATE game.number_statistic AS statistic
+        SET last_draw_date = (
+            SELECT max(result.draw_date)
+            FROM game.game_result AS result
+            WHERE result.type = statistic.type
+              AND result.numbers @> ARRAY[statistic.number]
+        )
+        WHERE statistic.type = OLD.type
+          AND statistic.number = ANY(OLD.numbers)
+          AND statistic.last_draw_date = OLD.draw_date;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO game.number_statistic AS statistic
+            (type, number, draw_count, last_draw_date)
+        SELECT DISTINCT NEW.type, number, 1, NEW.draw_date
+        FROM unnest(NEW.numbers) AS number
+        ON CONFLICT (type, number) DO UPDATE
+        SET draw_count = statistic.draw_count + 1,
+            last_draw_date = GREATEST(
+                statistic.last_draw_date, excluded.last_draw_date
+            );
+
+        INSERT INTO game.number_pair_statistic AS statistic
+            (type, first_number, second_number, draw_count)
+        SELECT DISTINCT NEW.type, low.number, high.number, 1
+        FROM unnest(NEW.numbers) AS low(number),
+             unnest(NEW.numbers) AS high(number)
+        WHERE low.number < high.number
+        ON CONFLICT (type, first_number, second_number) DO UPDATE
+        SET draw_count = statistic.draw_count + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Computes the statistics again from all the game results
+REFRESH_NUMBER_STATISTICS = """
+CREATE FUNCTION game.refresh_number_statistics() RETURNS void AS $$
+BEGIN
+    DELETE FROM game.number_statistic;
+    DELETE FROM game.number_pair_statistic;
+
+    INSERT INTO game.number_statistic (type, number, draw_count, last_draw_date)
+    SELECT draw.type, draw.number, count(*), max(draw.draw_date)
+    FROM (
+        SELECT DISTINCT result.id, result.type, result.draw_date, number
+        FROM game.game_result AS result, unnest(result.numbers) AS number
+    ) AS draw
+    GROUP BY draw.type, draw.number;
+
+    INSERT INTO game.number_pair_statistic
+        (type, first_number, second_number, draw_count)
+    SELECT pair.type, pair.first_number, pair.second_number, count(*)
+    FROM (
+        SELECT DISTINCT result.id, result.type,
+                        low.number AS first_number,
+                        high.number AS second_number
+        FROM game.game_result AS result,
+             unnest(result.numbers) AS low(number),
+             unnest(result.numbers) AS high(number)
+        WHERE low.number < high.number
+    ) AS pair
+    GROUP BY pair.type, pair.first_number, pair.second_number;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    op.create_table(
+        "number_statistic",
+        sa.Column("type", sa.Text(), nullable=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("draw_count", sa.Integer(), nullable=False),
+        sa.Column("last_draw_date", sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint("type", "number"),
+        schema="game",
+    )
+    op.create_table(
+        "number_pair_statistic",
+        sa.Column("type", sa.Text(), nullable=False),
+        sa.Column("first_number", sa.Integer(), nullable=False),
+        sa.Column("second_number", sa.Integer(), nullable=False),
+        sa.Column("draw_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("type", "first_number", "second_number"),
+        schema="game",
+    )
+    op.create_index(
+        "ix_number_pair_statistic_type_draw_count",
+        "number_pair_statistic",
+        ["type", "draw_count"],
+        schema="game",
+    )
+    op.execute(UPDATE_NUMBER_STATISTICS)
+    op.execute(REFRESH_NUMBER_STATISTICS)
+    op.execute(
+        """
+        CREATE TRIGGER game_result_number_statistics
+        AFTER INSERT OR DELETE OR UPDATE OF type, draw_date, numbers
+        ON game.game_result
+        FOR EACH ROW EXECUTE PROCEDURE game.update_number_statistics()
+        """
+    )
+    # Statistics of the results stored before the trigger
+    op.execute("SELECT game.refresh_number_statistics()")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER game_result_number_statistics ON game.game_result")
+    op.execute("DROP FUNCTION game.refresh_number_statistics()")
+    op.execute("DROP FUNCTION game.update_number_statistics()")
+    op.drop_index(
+        "ix_number_pair_statistic_type_draw_count",
+        "number_pair_statistic",
+        schema="game",
+    )
+    op.drop_table("number_pair_statistic", schema="game")
+    op.drop_table("number_statistic", schema="game")